@@ -6,32 +6,88 @@ Flask application factory
 InfluBerry v2 - シンプル構成版（Flask-Login認証）
 """
 
-from flask import Flask, jsonify
+import click
+from flask import Flask, jsonify, request, abort
 from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
 from flask_login import LoginManager
 from flask_cors import CORS
 from config import config
+from app.utils.startup_profiler import StartupProfiler
+from app.utils.db_routing import RoutingSession, replica_router
 
 
 # Extension instances
-db = SQLAlchemy()
-migrate = Migrate()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+migrate = None  # Flask-Migrate: init_migrate() で遅延初期化
 login_manager = LoginManager()
 
-def create_app(config_name='development'):
+def init_migrate(app):
+    """Flask-Migrate初期化（alembicのimportが重いため必要時のみ）"""
+    global migrate
+    from flask_migrate import Migrate
+    if migrate is None:
+        migrate = Migrate()
+    migrate.init_app(app, db)
+    return app.cli.commands['db']
+
+class LazyMigrateGroup(click.Group):
+    """`flask db` 実行時に初めてFlask-Migrateを初期化するCLIグループ"""
+    
+    def __init__(self, app):
+        super().__init__(name='db', help='Perform database migrations.')
+        self.app = app
+        self._group = None
+    
+    def _load(self):
+        if self._group is None:
+            self._group = init_migrate(self.app)
+        return self._group
+    
+    def list_commands(self, ctx):
+        return self._load().list_commands(ctx)
+    
+    def get_command(self, ctx, name):
+        return self._load().get_command(ctx, name)
+
+def create_app(config_name='development', profiler=None):
     """Flask application factory"""
     
+    # 起動フェーズ別計測（wsgi.pyからはimport時間込みのプロファイラーを受け取る）
+    profiler = profiler or StartupProfiler()
+    
     app = Flask(__name__)
     
     # Configuration
     app.config.from_object(config[config_name])
     
     # Initialize extensions
+    replica_router.configure(app)
     db.init_app(app)
-    migrate.init_app(app, db)
+    replica_router.init_app(app, db)
     login_manager.init_app(app)
     
+    # Web起動時はalembicをimportせず、`flask db` 実行時に初期化
+    if app.config['ENABLE_MIGRATE']:
+        init_migrate(app)
+    else:
+        app.cli.add_command(LazyMigrateGroup(app))
+    
+    # `flask search reindex`: 全文検索索引の再構築
+    from app.utils.search import search_cli
+    app.cli.add_command(search_cli)
+    
+    # `flask reminders send`: 締切リマインダー送信（定期実行）
+    from app.utils.deadline_reminders import reminders_cli
+    app.cli.add_command(reminders_cli)
+    
+    # `flask archive run / restore`: 案件・請求書のアーカイブ（定期実行）
+    from app.utils.archival import archive_cli
+    app.cli.add_command(archive_cli)
+    
+    # `flask partitions ensure`: 請求書の年パーティション作成（PostgreSQL・定期実行）
+    from app.utils.partitioning import partitions_cli
+    app.cli.add_command(partitions_cli)
+    
     # CORS Configuration
     CORS(app, origins=app.config['CORS_ORIGINS'], supports_credentials=True)
     
@@ -48,6 +104,52 @@ def create_app(config_name='development'):
     def load_user(user_id):
         return User.query.get(int(user_id))
     
+    # プラグイン使用イベントのバッファ書き込み
+    from app.utils.usage_tracker import usage_tracker
+    usage_tracker.init_app(app)
+    
+    # プラグイン設定キャッシュ
+    from app.utils.plugin_settings import plugin_settings_store
+    plugin_settings_store.init_app(app)
+    
+    # 取引先名補完の索引キャッシュ
+    from app.utils.client_autocomplete import client_autocomplete
+    client_autocomplete.init_app(app)
+    
+    # パスワードハッシュ専用スレッド
+    from app.utils.password_hashing import password_hasher
+    password_hasher.init_app(app)
+    
+    # ログイン失敗スロットリング
+    from app.utils.login_throttle import login_throttle
+    login_throttle.init_app(app)
+    
+    # 請求書PDF生成・キャッシュ
+    from app.utils.invoice_pdf import invoice_pdf_renderer
+    invoice_pdf_renderer.init_app(app)
+    
+    # 締切リマインダー（Flask-Mail）
+    from app.utils.deadline_reminders import deadline_reminder_job
+    deadline_reminder_job.init_app(app)
+    
+    # カレンダーフィードのキャッシュ
+    from app.utils.calendar_feed import calendar_feed
+    calendar_feed.init_app(app)
+    
+    # 売上予測キャッシュ
+    from app.utils.revenue_forecast import revenue_forecaster
+    revenue_forecaster.init_app(app)
+    
+    # 案件・請求書のアーカイブ
+    from app.utils.archival import archiver
+    archiver.init_app(app)
+    
+    # APIレスポンスの動的圧縮
+    from app.utils.response_compression import response_compressor
+    response_compressor.init_app(app)
+    
+    profiler.checkpoint('extensions')
+    
     # Register Blueprints
     from app.blueprints.auth import auth_bp
     from app.blueprints.projects import projects_bp
@@ -55,53 +157,80 @@ def create_app(config_name='development'):
     from app.blueprints.plugins import plugins_bp
     from app.blueprints.main import main_bp
     from app.blueprints.invoices import invoices_bp
-    from app.blueprints.domain_redirect import domain_redirect_bp
+    from app.blueprints.clients import clients_bp
+    from app.blueprints.calendar import calendar_bp
+    from app.blueprints.batch import batch_bp
     from app.plugins.manager import plugin_manager
+    profiler.checkpoint('import_blueprints')
     
     # Static file serving for Vue.js frontend
-    from flask import send_from_directory
+    # 起動時マニフェスト化・事前圧縮ファイル配信
+    from werkzeug.wrappers import Response
+    from app.utils.static_files import StaticManifest
+    from app.utils.front_middleware import FrontMiddleware
+    static_manifest = StaticManifest(app.static_folder).build()
+    app.extensions['static_manifest'] = static_manifest
+    
+    # クライアントIP（request.remote_addr）は信頼できるプロキシが付加した X-Forwarded-For から取得
+    if app.config['PROXY_FIX_X_FOR']:
+        from werkzeug.middleware.proxy_fix import ProxyFix
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['PROXY_FIX_X_FOR'])
+    
+    # 旧ドメインリダイレクト・ヘルスチェック・静的ファイルはFlask処理前に応答
+    app.wsgi_app = FrontMiddleware(
+        app.wsgi_app,
+        static_manifest=static_manifest,
+        legacy_redirects=app.config['LEGACY_DOMAIN_REDIRECTS']
+    )
+
+    def serve_index():
+        if static_manifest.index is None:
+            return jsonify({'error': 'フロントエンドがビルドされていません'}), 404
+        status, headers, body = static_manifest.build_response(
+            static_manifest.index, request.environ
+        )
+        return Response(body, status=status, headers=headers)
+
     @app.route('/')
     def serve_frontend():
-        return send_from_directory('static', 'index.html')
+        return serve_index()
     
     @app.route('/<path:filename>')
     def serve_static_files(filename):
-        # Root files (favicon.ico, robots.txt, etc.)
-        if '.' in filename and '/' not in filename:
-            try:
-                return send_from_directory('static', filename)
-            except FileNotFoundError:
-                pass
-        
-        # Assets directory (CSS, JS, images)
-        if filename.startswith('assets/'):
-            try:
-                return send_from_directory('static', filename)
-            except FileNotFoundError:
-                pass
+        # 静的ファイルはFrontMiddlewareで応答済み
+        # マニフェストにないルートファイル・アセットは404
+        if filename.startswith('assets/') or ('.' in filename and '/' not in filename):
+            abort(404)
         
         # Everything else -> SPA (Vue Router handles it)
-        return send_from_directory('static', 'index.html')
+        return serve_index()
+
+    profiler.checkpoint('static_manifest')
 
-    app.register_blueprint(domain_redirect_bp)
     app.register_blueprint(main_bp)
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
     app.register_blueprint(users_bp, url_prefix='/api/users')
     app.register_blueprint(plugins_bp, url_prefix='/api/plugins')
     app.register_blueprint(projects_bp, url_prefix='/api/projects')
     app.register_blueprint(invoices_bp, url_prefix='/api/invoices')
-    # Plugin System Integration
+    app.register_blueprint(clients_bp, url_prefix='/api/clients')
+    app.register_blueprint(calendar_bp, url_prefix='/api/calendar')
+    app.register_blueprint(batch_bp, url_prefix='/api/batch')
+    profiler.checkpoint('register_blueprints')
+    
+    # Plugin System Integration（プラグインのロード・Blueprint構築は初回利用時）
     try:
-        plugin_manager.initialize_plugins()
+        plugin_manager.initialize_plugins(
+            registry_path=app.config['PLUGIN_REGISTRY_PATH'],
+            entry_point_group=app.config['PLUGIN_ENTRY_POINT_GROUP']
+        )
         plugin_manager.register_blueprints(app)
     except Exception as e:
         print(f"Plugin system initialization error: {e}")
         # プラグインエラーでもアプリは起動継続
+    profiler.checkpoint('plugins')
     
-    # Health check endpoint
-    @app.route('/health')
-    def health_check():
-        return {'status': 'ok', 'message': 'InfluBerry v2 API is running'}, 200
+    # Health check endpoint: FrontMiddleware（/health）で応答
     # === エラーハンドリング・ログ設定追加 ===
     import logging
     from logging.handlers import RotatingFileHandler
@@ -111,7 +240,8 @@ def create_app(config_name='development'):
     if not app.debug:
         if not os.path.exists('logs'):
             os.mkdir('logs')
-        file_handler = RotatingFileHandler('logs/influberry.log', maxBytes=10240, backupCount=10)
+        # delay=True: 初回ログ出力時までファイルオープンを遅延
+        file_handler = RotatingFileHandler('logs/influberry.log', maxBytes=10240, backupCount=10, delay=True)
         file_handler.setFormatter(logging.Formatter(
             '%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]'
         ))
@@ -119,6 +249,7 @@ def create_app(config_name='development'):
         app.logger.addHandler(file_handler)
         app.logger.setLevel(logging.INFO)
         app.logger.info('InfluBerry startup')
+    profiler.checkpoint('logging')
     
     # 統一エラーハンドラー
     @app.errorhandler(400)
@@ -179,6 +310,14 @@ def create_app(config_name='development'):
             'message': 'Database operation failed',
             'status': 500
         }), 500
+    profiler.checkpoint('error_handlers')
+    
+    # 起動プロファイル出力
+    app.extensions['startup_profile'] = profiler
+    if app.config['STARTUP_PROFILE']:
+        profiler.report(app.logger)
+    if app.config['STARTUP_PROFILE_PATH']:
+        profiler.export(app.config['STARTUP_PROFILE_PATH'])
     return app
 # Database safety check
     import os
@@ -3,9 +3,13 @@ Authentication Blueprint - Flask-Login認証
 InfluBerry v2
 """
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from flask_login import login_user, logout_user, current_user, login_required
-from werkzeug.security import check_password_hash
+from sqlalchemy.exc import IntegrityError
+
+from app import db
+from app.utils.password_hashing import PasswordHashingBusy, hashing_busy_response
+from app.utils.login_throttle import login_throttle, get_client_ip
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -17,22 +21,42 @@ def login():
         if not data or not data.get('email') or not data.get('password'):
             return jsonify({'error': 'メールアドレスとパスワードが必要です'}), 400
         
+        # 失敗回数によるスロットリング（ユーザー検索・ハッシュ検証の前に判定）
+        client_ip = get_client_ip(request)
+        retry_after = login_throttle.check(data['email'], client_ip)
+        if retry_after:
+            response = jsonify({
+                'error': 'ログイン試行回数が多すぎます。しばらくしてから再度お試しください',
+                'retry_after': retry_after
+            })
+            response.status_code = 429
+            response.headers['Retry-After'] = str(retry_after)
+            return response
+        
         # User モデルをインポート
         from app.models.user import User
         
         # ユーザー認証処理
         user = User.query.filter_by(email=data['email']).first()
         
-        if user and user.is_active and user.check_password(data['password']):
+        if user and user.is_active and user.check_password_and_rehash(data['password']):
+            if db.session.is_modified(user):
+                # 旧形式ハッシュを現在の設定で再ハッシュ済み
+                db.session.commit()
+            login_throttle.record_success(data['email'], client_ip)
             login_user(user, remember=data.get('remember', False))
             return jsonify({
                 'message': 'ログイン成功',
                 'user': user.to_dict()
             }), 200
         
+        login_throttle.record_failure(data['email'], client_ip)
         return jsonify({'error': 'メールアドレスまたはパスワードが正しくありません'}), 401
         
+    except PasswordHashingBusy:
+        return hashing_busy_response()
     except Exception as e:
+        db.session.rollback()
         return jsonify({'error': 'ログイン処理エラー'}), 500
 
 @auth_bp.route('/logout', methods=['POST'])
@@ -68,35 +92,63 @@ def register():
         # User モデルをインポート
         from app.models.user import User
         
-        # 重複チェック（email）
-        existing_user_email = User.query.filter_by(email=data['email']).first()
-        if existing_user_email:
-            return jsonify({'error': 'このメールアドレスは既に登録されています'}), 409
-        
-        # 重複チェック（username）
-        existing_user_username = User.query.filter_by(username=data['username']).first()
-        if existing_user_username:
-            return jsonify({'error': 'このユーザー名は既に使用されています'}), 409
-        
-        # 新規ユーザー作成（User.create()クラスメソッド活用）
-        user = User.create(
+        # 新規ユーザー作成（重複チェックはDBの一意制約に任せ、INSERT 1回で判定）
+        user = User(
             username=data['username'],
             email=data['email'],
             password=data['password'],
             influencer_name=None
         )
+        db.session.add(user)
+        try:
+            db.session.flush()
+        except IntegrityError as e:
+            db.session.rollback()
+            return jsonify({'error': _duplicate_user_message(e, data)}), 409
+        
+        # レスポンスはcommit前に確定（commit後の全属性の再読み込みを避ける）
+        user_data = user.to_dict()
+        db.session.commit()
         
-        # 自動ログイン
+        # 自動ログインはcommit成功後（失敗時に存在しないユーザーのセッションCookieを発行しない）
         login_user(user, remember=False)
         
         return jsonify({
             'message': '新規登録が完了しました',
-            'user': user.to_dict()
+            'user': user_data
         }), 201
         
+    except PasswordHashingBusy:
+        return hashing_busy_response()
     except Exception as e:
+        db.session.rollback()
         return jsonify({'error': '新規登録処理エラー'}), 500
 
+def _duplicate_user_message(error, data):
+    """一意制約違反をエラーメッセージへ変換（従来通りemailの重複を優先）"""
+    from app.models.user import User
+    
+    detail = str(error.orig).lower()
+    # SQLite: "users.email" / PostgreSQL: 制約名 "ix_users_email"・"Key (email)=..."
+    if any(marker in detail for marker in ('users.email', 'ix_users_email', '(email)=')):
+        return 'このメールアドレスは既に登録されています'
+    
+    # username違反 or 判別不能の場合のみ、emailも重複しているか確認（エラー時のみのクエリ）
+    if User.query.filter_by(email=data['email']).first():
+        return 'このメールアドレスは既に登録されています'
+    return 'このユーザー名は既に使用されています'
+
+@auth_bp.route('/throttle-metrics', methods=['GET'])
+@login_required
+def get_throttle_metrics():
+    """ログインスロットリングのメトリクス（管理者のみ）"""
+    if (current_user.email or '').lower() not in current_app.config['ADMIN_EMAILS']:
+        return jsonify({'error': '管理者権限が必要です'}), 403
+    return jsonify({
+        'metrics': login_throttle.get_metrics(),
+        'storage': type(login_throttle.store).__name__
+    }), 200
+
 @auth_bp.route('/test', methods=['GET'])
 def auth_test():
     """認証システムテスト"""
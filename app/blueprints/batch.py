@@ -0,0 +1,141 @@
+"""
+Batch Blueprint - 複数GETリクエストの一括実行
+InfluBerry v2 - 回線遅延の大きいモバイル環境向けに、画面表示時の複数GETを1往復にまとめる
+"""
+
+import time
+
+from flask import Blueprint, current_app, jsonify, request
+from flask_login import login_required
+from werkzeug.exceptions import HTTPException
+from werkzeug.test import EnvironBuilder
+
+from app import db
+from app.utils.security_validators import SecurityDecorator
+
+batch_bp = Blueprint('batch', __name__)
+
+# サブリクエストへ引き継ぐヘッダー（セッションCookie・言語・条件付きGETは各サブリクエストで指定）
+# クライアントIPは X-Forwarded-For ではなく解決済みの REMOTE_ADDR で引き継ぐ
+FORWARDED_HEADERS = ('Cookie', 'Accept-Language', 'User-Agent', 'X-Forwarded-Proto')
+
+
+def _parse_requests(items):
+    """
+    バッチ内容の検証（文字列パス または {"path", "id", "headers"}）
+
+    Returns:
+        tuple[list[dict], str | None]: (サブリクエスト, エラーメッセージ)
+    """
+    if not isinstance(items, list):
+        return None, 'requestsは配列で指定してください'
+    max_requests = current_app.config['BATCH_MAX_REQUESTS']
+    if len(items) > max_requests:
+        return None, f'一度に実行できるリクエストは{max_requests}件までです'
+
+    parsed = []
+    for index, item in enumerate(items):
+        if isinstance(item, str):
+            item = {'path': item}
+        if not isinstance(item, dict) or not isinstance(item.get('path'), str):
+            return None, f'requests[{index}]: pathを指定してください'
+        path = item['path']
+        if not path.startswith('/api/') or path.split('?', 1)[0].rstrip('/') == '/api/batch':
+            return None, f'requests[{index}]: /api/ 以下のパスのみ指定できます'
+        headers = item.get('headers') or {}
+        if not isinstance(headers, dict):
+            return None, f'requests[{index}]: headersはオブジェクトで指定してください'
+        parsed.append({'id': item.get('id', index), 'path': path, 'headers': headers})
+    return parsed, None
+
+
+def _dispatch(app, sub_request):
+    """
+    サブリクエストをアプリ内で実行（HTTPを経由しない）
+
+    現在のアプリコンテキスト内で新しいリクエストコンテキストを積むため、
+    ログイン済みユーザー（g._login_user）とDBセッションはバッチ全体で共有される
+    """
+    headers = [(name, request.headers[name]) for name in FORWARDED_HEADERS if name in request.headers]
+    # サブレスポンスは本文をJSONとして埋め込むため圧縮させない（バッチ全体のレスポンスで圧縮）
+    headers += [
+        (str(name), str(value)) for name, value in sub_request['headers'].items()
+        if str(name).lower() != 'accept-encoding'
+    ]
+    builder = EnvironBuilder(
+        path=sub_request['path'],
+        base_url=request.host_url,
+        method='GET',
+        headers=headers,
+        environ_base={'REMOTE_ADDR': request.remote_addr}
+    )
+    environ = builder.get_environ()
+
+    # SPA配信用のキャッチオールに一致するパス（存在しないAPI）は404
+    try:
+        endpoint, _ = app.url_map.bind_to_environ(environ).match(method='GET')
+    except HTTPException as e:
+        return e.code, {'error': e.description}, {}
+    if endpoint == 'serve_static_files':
+        return 404, {'error': 'エンドポイントが見つかりません'}, {}
+
+    with app.request_context(environ):
+        try:
+            response = app.full_dispatch_request()
+        except Exception as e:
+            response = None
+            app.logger.warning(f'Batch sub-request failed: {sub_request["path"]} error={e}')
+        if response is None or response.status_code >= 500:
+            # 失敗したサブリクエストのトランザクションを後続へ持ち越さない
+            db.session.rollback()
+        if response is None:
+            return 500, {'error': 'サーバーエラー'}, {}
+
+        meta = {name: response.headers[name] for name in ('ETag', 'Last-Modified') if name in response.headers}
+        if response.is_json:
+            body = response.get_json()
+        else:
+            body = None
+            meta['Content-Type'] = response.content_type
+        return response.status_code, body, meta
+
+
+@batch_bp.route('', methods=['POST'])
+@batch_bp.route('/', methods=['POST'])
+@SecurityDecorator.validate_json_request(required_fields=['requests'])
+@login_required
+def run_batch():
+    """
+    複数のGET APIを1リクエストで実行
+
+    リクエスト: {"requests": ["/api/projects/stats", {"id": "inv", "path": "/api/invoices/?page=2"}]}
+    レスポンス: {"responses": [{"id", "path", "status", "body", "headers"}]}（指定順）
+
+    サブリクエストは順番に実行し、合計時間が BATCH_TIMEOUT_SECONDS を超えた時点で
+    残りは実行せず504を返す（実行中のサブリクエストは中断しない）
+    """
+    try:
+        sub_requests, error = _parse_requests(request.get_json()['requests'])
+        if error:
+            return jsonify({'error': error}), 400
+
+        app = current_app._get_current_object()
+        deadline = time.monotonic() + app.config['BATCH_TIMEOUT_SECONDS']
+        responses = []
+        for sub_request in sub_requests:
+            if time.monotonic() >= deadline:
+                status, body, meta = 504, {'error': 'バッチの実行時間上限を超えたため実行されませんでした'}, {}
+            else:
+                status, body, meta = _dispatch(app, sub_request)
+            responses.append({
+                'id': sub_request['id'],
+                'path': sub_request['path'],
+                'status': status,
+                'body': body,
+                'headers': meta
+            })
+
+        return jsonify({'responses': responses}), 200
+
+    except Exception as e:
+        return jsonify({'error': 'バッチ実行エラー'}), 500
@@ -0,0 +1,112 @@
+"""
+Calendar Blueprint - 案件締切・支払期限のiCalendarフィード
+InfluBerry v2 - スポンサー案件管理システム
+"""
+
+import secrets
+
+from flask import Blueprint, Response, current_app, jsonify, request, url_for
+from flask_login import login_required, current_user
+
+from app import db
+from app.models.user import User
+from app.utils.calendar_feed import calendar_feed
+from app.utils.db_routing import use_read_replica
+
+calendar_bp = Blueprint('calendar', __name__)
+
+
+def _feed_urls(token):
+    url = url_for('calendar.ics_feed', token=token, _external=True)
+    return {
+        'url': url,
+        'webcal_url': 'webcal://' + url.split('://', 1)[1]
+    }
+
+
+@calendar_bp.route('/feed', methods=['GET'])
+@login_required
+def get_feed_url():
+    """購読URL取得（未発行なら発行）"""
+    try:
+        if not current_user.calendar_token:
+            current_user.calendar_token = secrets.token_urlsafe(32)
+            db.session.commit()
+
+        return jsonify({'success': True, **_feed_urls(current_user.calendar_token)}), 200
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': 'カレンダーURL取得エラー'}), 500
+
+
+@calendar_bp.route('/feed/rotate', methods=['POST'])
+@login_required
+def rotate_feed_url():
+    """購読URL再発行（旧URLは無効）"""
+    try:
+        current_user.calendar_token = secrets.token_urlsafe(32)
+        db.session.commit()
+        calendar_feed.invalidate(current_user.id)
+
+        return jsonify({
+            'success': True,
+            'message': 'カレンダーURLを再発行しました',
+            **_feed_urls(current_user.calendar_token)
+        }), 200
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': 'カレンダーURL再発行エラー'}), 500
+
+
+@calendar_bp.route('/feed', methods=['DELETE'])
+@login_required
+def disable_feed():
+    """購読停止（URLを無効化）"""
+    try:
+        current_user.calendar_token = None
+        db.session.commit()
+        calendar_feed.invalidate(current_user.id)
+
+        return jsonify({'success': True, 'message': 'カレンダー購読を停止しました'}), 200
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': 'カレンダー購読停止エラー'}), 500
+
+
+@calendar_bp.route('/<token>.ics', methods=['GET'])
+@use_read_replica
+def ics_feed(token):
+    """iCalendarフィード（ログイン不要・URLのトークンで認証・変更なしなら304）"""
+    try:
+        user_id = db.session.query(User.id).filter(
+            User.calendar_token == token,
+            User.is_active.is_(True)
+        ).scalar()
+        if user_id is None:
+            return jsonify({'error': 'カレンダーが見つかりません'}), 404
+
+        etag, last_modified = calendar_feed.validators(user_id)
+        cache_control = f"private, max-age={current_app.config['CALENDAR_FEED_MAX_AGE']}"
+
+        not_modified = request.if_none_match.contains_weak(etag) if request.if_none_match else (
+            last_modified is not None
+            and request.if_modified_since is not None
+            and request.if_modified_since.replace(tzinfo=None) >= last_modified.replace(microsecond=0)
+        )
+        if not_modified:
+            response = Response(status=304)
+        else:
+            response = Response(calendar_feed.render(user_id, etag), mimetype='text/calendar')
+            response.headers['Content-Disposition'] = 'inline; filename="influberry.ics"'
+        # 内容の版から算出した検証子のため弱いETag（圧縮の有無に関わらず同じ値）
+        response.set_etag(etag, weak=True)
+        if last_modified is not None:
+            response.last_modified = last_modified
+        response.headers['Cache-Control'] = cache_control
+        return response
+
+    except Exception as e:
+        return jsonify({'error': 'カレンダー取得エラー'}), 500
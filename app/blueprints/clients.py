@@ -0,0 +1,94 @@
+"""
+Clients Blueprint - 取引先一覧・名前補完API
+InfluBerry v2 - スポンサー案件管理システム
+"""
+
+from flask import Blueprint, request, jsonify
+from flask_login import login_required, current_user
+from sqlalchemy import func
+
+from app import db
+from app.models.client import Client
+from app.utils.archival import archiver
+from app.utils.client_autocomplete import client_autocomplete
+from app.utils.db_routing import use_read_replica
+
+clients_bp = Blueprint('clients', __name__)
+
+AUTOCOMPLETE_MAX_LIMIT = 20
+
+
+@clients_bp.route('', methods=['GET'])
+@clients_bp.route('/', methods=['GET'])
+@login_required
+@use_read_replica
+def get_clients():
+    """取引先一覧取得（案件数・案件金額・請求額をアーカイブ済みを含めて集計）"""
+    try:
+        projects = archiver.project_source(current_user.id)
+        invoices = archiver.invoice_source(current_user.id)
+
+        project_totals = db.session.query(
+            projects.client_id,
+            func.count(projects.id).label('project_count'),
+            func.coalesce(func.sum(projects.amount), 0).label('total_amount')
+        ).filter(
+            projects.user_id == current_user.id,
+            projects.client_id.isnot(None)
+        ).group_by(projects.client_id).subquery()
+
+        invoice_totals = db.session.query(
+            invoices.client_id,
+            func.count(invoices.id).label('invoice_count'),
+            func.coalesce(func.sum(invoices.total_amount), 0).label('invoiced_amount')
+        ).filter(
+            invoices.user_id == current_user.id,
+            invoices.client_id.isnot(None)
+        ).group_by(invoices.client_id).subquery()
+
+        rows = db.session.query(
+            Client,
+            func.coalesce(project_totals.c.project_count, 0),
+            func.coalesce(project_totals.c.total_amount, 0),
+            func.coalesce(invoice_totals.c.invoice_count, 0),
+            func.coalesce(invoice_totals.c.invoiced_amount, 0)
+        ).outerjoin(
+            project_totals, project_totals.c.client_id == Client.id
+        ).outerjoin(
+            invoice_totals, invoice_totals.c.client_id == Client.id
+        ).filter(
+            Client.user_id == current_user.id
+        ).order_by(Client.normalized_name).all()
+
+        clients = []
+        for client, project_count, total_amount, invoice_count, invoiced_amount in rows:
+            data = client.to_dict()
+            data.update({
+                'project_count': project_count,
+                'total_amount': float(total_amount),
+                'invoice_count': invoice_count,
+                'invoiced_amount': float(invoiced_amount)
+            })
+            clients.append(data)
+
+        return jsonify({'success': True, 'clients': clients}), 200
+
+    except Exception as e:
+        return jsonify({'error': '取引先一覧取得エラー'}), 500
+
+
+@clients_bp.route('/autocomplete', methods=['GET'])
+@login_required
+def autocomplete_clients():
+    """取引先名の前方一致補完（?q=&limit=）"""
+    try:
+        query = request.args.get('q', '')
+        limit = min(max(request.args.get('limit', 10, type=int), 1), AUTOCOMPLETE_MAX_LIMIT)
+
+        return jsonify({
+            'success': True,
+            'clients': client_autocomplete.suggest(current_user, query, limit)
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': '取引先補完エラー'}), 500
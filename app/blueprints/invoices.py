@@ -4,20 +4,28 @@ InfluBerry Invoice Blueprint
 自動請求書発行システム API
 """
 
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify
 from flask_login import login_required, current_user
 from datetime import date, timedelta
+import hashlib
 from decimal import Decimal
 
 from app import db
+from app.models.client import Client
 from app.models.invoice import Invoice
 from app.models.project import Project
+from app.utils.usage_tracker import usage_tracker
+from app.utils.db_routing import use_read_replica
+from app.utils.search import search
+from app.utils.invoice_pdf import etag_for, invoice_pdf_renderer, invoice_render_data
+from app.utils.archival import archiver, parse_date_range
 
 invoices_bp = Blueprint('invoices', __name__)
 
 
 @invoices_bp.route('/', methods=['GET'])
 @login_required
+@use_read_replica
 def get_invoices():
     """ユーザーの請求書一覧取得"""
     try:
@@ -25,18 +33,30 @@ def get_invoices():
         page = request.args.get('page', 1, type=int)
         per_page = min(request.args.get('per_page', 10, type=int), 100)
         status = request.args.get('status')
+        # 請求日の範囲（アーカイブ済みの範囲にかかる場合のみアーカイブも検索）
+        try:
+            date_from, date_to = parse_date_range(request.args.get('date_from'), request.args.get('date_to'))
+        except ValueError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
         
         # クエリ構築
-        query = Invoice.query.filter_by(user_id=current_user.id)
+        source = archiver.invoice_source(current_user.id, date_from, date_to)
+        query = db.session.query(source).filter(source.user_id == current_user.id)
         
         # ステータスフィルター
         if status:
-            query = query.filter(Invoice.status == status)
+            query = query.filter(source.status == status)
+        if date_from:
+            query = query.filter(source.invoice_date >= date_from)
+        if date_to:
+            query = query.filter(source.invoice_date <= date_to)
         
         # ページネーション
-        invoices = query.order_by(Invoice.created_at.desc()).paginate(
+        invoices = query.order_by(source.created_at.desc()).paginate(
             page=page, per_page=per_page, error_out=False
         )
+        # 案件（アーカイブ済みを含む）をまとめて読み込み
+        archiver.preload_projects(invoice.project_id for invoice in invoices.items)
         
         return jsonify({
             'success': True,
@@ -125,6 +145,113 @@ def get_invoice_by_number(invoice_number):
             'success': False,
             'message': f'請求書取得エラー: {str(e)}'
         }), 500
+
+
+def _pdf_response(body, etag, filename, mimetype):
+    response = Response(body, mimetype=mimetype)
+    response.set_etag(etag)
+    # 請求書の更新でETagが変わるため、毎回再検証（変更なしなら304）
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+@invoices_bp.route('/<int:invoice_id>/pdf', methods=['GET'])
+@login_required
+def download_invoice_pdf(invoice_id):
+    """請求書PDFダウンロード（キャッシュ済みなら即時・ETag一致なら304・生成中なら202）"""
+    try:
+        invoice = Invoice.query.filter_by(
+            id=invoice_id,
+            user_id=current_user.id
+        ).first()
+        
+        if not invoice:
+            return jsonify({
+                'success': False,
+                'message': '請求書が見つかりません'
+            }), 404
+        
+        data = invoice_render_data(invoice)
+        etag = etag_for(data)
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+            response.set_etag(etag)
+            return response
+        
+        pdf = invoice_pdf_renderer.get(data)
+        if pdf is None:
+            response = jsonify({
+                'success': False,
+                'message': 'PDFを生成中です。しばらくしてから再度お試しください'
+            })
+            response.status_code = 202
+            response.headers['Retry-After'] = '2'
+            return response
+        
+        return _pdf_response(pdf, etag, f'{invoice.invoice_number}.pdf', 'application/pdf')
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'請求書PDF生成エラー: {str(e)}'
+        }), 500
+
+
+@invoices_bp.route('/pdf-archive', methods=['GET'])
+@login_required
+def download_invoice_pdf_archive():
+    """月次一括出力（請求日が指定月の請求書PDFをZIPで返す）"""
+    try:
+        month = request.args.get('month', '')
+        try:
+            start = date.fromisoformat(f'{month}-01')
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'message': 'month は YYYY-MM 形式で指定してください'
+            }), 400
+        end = date(start.year + 1, 1, 1) if start.month == 12 else date(start.year, start.month + 1, 1)
+        
+        source = archiver.invoice_source(current_user.id, start, end)
+        invoices = db.session.query(source).filter(
+            source.user_id == current_user.id,
+            source.invoice_date >= start,
+            source.invoice_date < end
+        ).order_by(source.invoice_date.asc(), source.id.asc()).limit(
+            invoice_pdf_renderer.archive_max_invoices + 1
+        ).all()
+        
+        if not invoices:
+            return jsonify({
+                'success': False,
+                'message': '対象月の請求書がありません'
+            }), 404
+        if len(invoices) > invoice_pdf_renderer.archive_max_invoices:
+            return jsonify({
+                'success': False,
+                'message': f'一括出力は{invoice_pdf_renderer.archive_max_invoices}件までです'
+            }), 400
+        
+        datas = [invoice_render_data(invoice) for invoice in invoices]
+        # 対象請求書の版が同じならZIPも同じ内容
+        versions = '|'.join(etag_for(data) for data in datas)
+        etag = f'invoice-archive-{month}-{hashlib.sha1(versions.encode()).hexdigest()}'
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+            response.set_etag(etag)
+            return response
+        
+        archive = invoice_pdf_renderer.build_archive(datas)
+        return _pdf_response(archive, etag, f'invoices-{month}.zip', 'application/zip')
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'請求書一括出力エラー: {str(e)}'
+        }), 500
+
+
 @invoices_bp.route('/create-from-project/<int:project_id>', methods=['POST'])
 @login_required
 def create_invoice_from_project(project_id):
@@ -157,6 +284,8 @@ def create_invoice_from_project(project_id):
         # データベース保存
         db.session.add(invoice)
         db.session.commit()
+        usage_tracker.record(current_user.id, 'sponsor_management', 'invoice_creation')
+        invoice_pdf_renderer.submit(invoice_render_data(invoice))
         
         return jsonify({
             'success': True,
@@ -200,10 +329,17 @@ def create_invoice():
                 'message': 'プロジェクトが見つかりません'
             }), 404
         
+        # 取引先（未登録の住所・担当者は請求書の入力値で補完）
+        client = Client.get_or_create(
+            current_user.id, data['client_company'],
+            address=data.get('client_address'), contact=data.get('client_contact')
+        )
+        
         # 請求書作成
         invoice = Invoice(
             user_id=current_user.id,
             project_id=data['project_id'],
+            client_id=client.id if client else None,
             client_company=data['client_company'],
             subtotal=Decimal(str(data['subtotal'])),
             description=data['description'],
@@ -229,6 +365,8 @@ def create_invoice():
         # データベース保存
         db.session.add(invoice)
         db.session.commit()
+        usage_tracker.record(current_user.id, 'sponsor_management', 'invoice_creation')
+        invoice_pdf_renderer.submit(invoice_render_data(invoice))
         
         return jsonify({
             'success': True,
@@ -280,12 +418,18 @@ def update_invoice(invoice_id):
                 else:
                     setattr(invoice, field, data[field])
         
+        # 請求先変更時は取引先を付け替え
+        if 'client_company' in data:
+            client = Client.get_or_create(current_user.id, invoice.client_company)
+            invoice.client_id = client.id if client else None
+        
         # 金額再計算
         if 'subtotal' in data or 'tax_rate' in data:
             invoice.calculate_amounts()
         
         # データベース保存
         db.session.commit()
+        invoice_pdf_renderer.submit(invoice_render_data(invoice))
         
         return jsonify({
             'success': True,
@@ -327,6 +471,7 @@ def delete_invoice(invoice_id):
         # データベースから削除
         db.session.delete(invoice)
         db.session.commit()
+        invoice_pdf_renderer.discard(invoice_id)
         
         return jsonify({
             'success': True,
@@ -343,38 +488,39 @@ def delete_invoice(invoice_id):
 
 @invoices_bp.route('/stats', methods=['GET'])
 @login_required
+@use_read_replica
 def get_invoice_stats():
-    """請求書統計情報取得"""
+    """請求書統計情報取得（アーカイブ済みの請求書を含む）"""
     try:
+        source = archiver.invoice_source(current_user.id)
+        user_invoices = db.session.query(source).filter(source.user_id == current_user.id)
+        
         # 基本統計
-        total_invoices = Invoice.query.filter_by(user_id=current_user.id).count()
+        total_invoices = user_invoices.count()
         
         # ステータス別統計
         stats_by_status = {}
         statuses = ['draft', 'sent', 'paid', 'overdue', 'cancelled']
         
         for status in statuses:
-            count = Invoice.query.filter_by(
-                user_id=current_user.id, 
-                status=status
-            ).count()
+            count = user_invoices.filter(source.status == status).count()
             stats_by_status[status] = count
         
         # 金額統計
-        paid_invoices = Invoice.query.filter_by(
-            user_id=current_user.id, 
-            status='paid'
-        ).all()
+        paid_invoices = user_invoices.filter(source.status == 'paid').all()
         
         total_paid = sum(float(inv.total_amount) for inv in paid_invoices)
         
-        # 今月の統計
+        # 今月の統計（アーカイブは請求日が今月より前のみ）
+        # 上限も指定して請求日の範囲を閉じる（PostgreSQLでは今年のパーティションのみ読む）
         from datetime import datetime
         this_month = datetime.now().replace(day=1).date()
+        next_month = date(this_month.year + 1, 1, 1) if this_month.month == 12 else this_month.replace(month=this_month.month + 1)
         
         monthly_invoices = Invoice.query.filter(
             Invoice.user_id == current_user.id,
-            Invoice.invoice_date >= this_month
+            Invoice.invoice_date >= this_month,
+            Invoice.invoice_date < next_month
         ).count()
         
         return jsonify({
@@ -396,6 +542,7 @@ def get_invoice_stats():
 
 @invoices_bp.route('/overdue', methods=['GET'])
 @login_required
+@use_read_replica
 def get_overdue_invoices():
     """期限超過請求書取得"""
     try:
@@ -415,4 +562,48 @@ def get_overdue_invoices():
         return jsonify({
             'success': False,
             'message': f'期限超過請求書取得エラー: {str(e)}'
-        }), 500
\ No newline at end of file
+        }), 500
+
+
+@invoices_bp.route('/search', methods=['GET'])
+@login_required
+@use_read_replica
+def search_invoices():
+    """請求書全文検索（請求書番号・請求先・案件名・内容・備考、関連度順）"""
+    try:
+        keyword = request.args.get('q', '').strip()
+        page = max(request.args.get('page', 1, type=int), 1)
+        per_page = min(max(request.args.get('per_page', 10, type=int), 1), 100)
+        status = request.args.get('status')
+        
+        try:
+            invoices, total = search(
+                Invoice, current_user.id, keyword, page=page, per_page=per_page,
+                filters={'status': status} if status else None
+            )
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'message': str(e)
+            }), 400
+        
+        pages = (total + per_page - 1) // per_page
+        return jsonify({
+            'success': True,
+            'query': keyword,
+            'invoices': [invoice.to_dict() for invoice in invoices],
+            'pagination': {
+                'page': page,
+                'pages': pages,
+                'per_page': per_page,
+                'total': total,
+                'has_next': page < pages,
+                'has_prev': page > 1
+            }
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'請求書検索エラー: {str(e)}'
+        }), 500
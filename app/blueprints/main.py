@@ -19,13 +19,17 @@ def api_info():
             'auth': '/api/auth',
             'projects': '/api/projects',
             'dashboard': '/api/dashboard',
+            'dashboard-summary': '/api/dashboard/summary',
             'user-status': '/api/user-status',
             'health': '/health'
         },
         'authentication': 'Flask-Login (Session-based)'
     })
 
+from flask import request
 from flask_login import login_required, current_user
+from app.utils.dashboard_summary import DashboardSummary
+from app.utils.db_routing import use_read_replica
 
 @main_bp.route('/api/dashboard')
 @login_required
@@ -41,13 +45,35 @@ def dashboard_info():
         }
     })
 
+@main_bp.route('/api/dashboard/summary')
+@login_required
+@use_read_replica
+def dashboard_summary():
+    """
+    ダッシュボード一括取得（?fields=project_stats,invoice_stats で必要なセクションのみ）
+    各セクションは個別エンドポイントと同じ形
+    """
+    try:
+        try:
+            sections = DashboardSummary.parse_fields(request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        return jsonify(DashboardSummary(current_user).build(sections)), 200
+        
+    except Exception as e:
+        return jsonify({'error': 'ダッシュボード取得エラー'}), 500
+
 @main_bp.route('/api/user-status')
 @login_required
 def user_status():
     """認証済みユーザーのステータス確認"""
-    from app.models.project import Project
+    from app import db
+    from app.utils.archival import archiver
     
-    project_count = Project.query.filter_by(user_id=current_user.id).count()
+    # アーカイブ済みの案件を含む件数
+    source = archiver.project_source(current_user.id)
+    project_count = db.session.query(source).filter(source.user_id == current_user.id).count()
     
     return jsonify({
         'user': current_user.to_dict(),
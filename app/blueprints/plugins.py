@@ -78,22 +78,24 @@ def get_available_plugins():
 def get_plugin_usage_stats():
     """プラグイン使用統計"""
     try:
-        # Phase 1段階では sponsor_management のみ使用統計
-        from app.models.project import Project
+        # Phase 1段階では sponsor_management のみ使用統計（使用カウンターから取得）
+        from app.plugins.manager import plugin_manager
         
-        project_count = Project.query.filter_by(user_id=current_user.id).count()
-        completed_projects = Project.query.filter_by(
-            user_id=current_user.id, 
-            status='completed'
-        ).count()
+        sponsor_plugin = plugin_manager.get_plugin('sponsor_management')
+        if sponsor_plugin is None:
+            # 無効化・ロード失敗時は空の統計を返す
+            sponsor_stats = {'total_usage': 0, 'this_month_usage': 0, 'features_used': [], 'last_used': None}
+        else:
+            sponsor_stats = sponsor_plugin.get_usage_stats(current_user.id)
         
         stats = {
             'sponsor_management': {
-                'total_usage': project_count,
-                'this_month_usage': project_count,  # 簡易実装：実際は当月フィルタ必要
-                'features_used': ['project_creation', 'status_management'],
-                'last_used': datetime.utcnow().isoformat(),
-                'efficiency_score': (completed_projects / project_count * 100) if project_count > 0 else 0
+                'total_usage': sponsor_stats['total_usage'],
+                'this_month_usage': sponsor_stats['this_month_usage'],
+                'features_used': sponsor_stats.get('features_used', []),
+                'last_used': sponsor_stats['last_used'],
+                'efficiency_score': sponsor_stats.get('efficiency_score', 0),
+                'status': 'active' if sponsor_plugin is not None else 'unavailable'
             },
             'pricing_calculator': {'status': 'not_released'},
             'content_calendar': {'status': 'not_released'}, 
@@ -104,7 +106,7 @@ def get_plugin_usage_stats():
             'usage_stats': stats,
             'summary': {
                 'most_used_plugin': 'sponsor_management',
-                'total_actions_this_month': project_count,
+                'total_actions_this_month': sponsor_stats['this_month_usage'],
                 'user_efficiency_score': stats['sponsor_management']['efficiency_score']
             }
         }), 200
@@ -117,20 +119,9 @@ def get_plugin_usage_stats():
 def get_plugin_settings():
     """プラグイン設定取得"""
     try:
-        # 将来のプラグイン設定管理（現在は基本設定のみ）
-        settings = {
-            'sponsor_management': {
-                'auto_notifications': True,
-                'default_currency': 'JPY',
-                'deadline_reminders': True,
-                'reminder_days_before': 3
-            },
-            'global_settings': {
-                'email_notifications': True,
-                'browser_notifications': False,
-                'data_export_format': 'csv'
-            }
-        }
+        from app.utils.plugin_settings import plugin_settings_store
+        
+        settings = plugin_settings_store.get_all(current_user)
         
         return jsonify({
             'plugin_settings': settings,
@@ -144,20 +135,25 @@ def get_plugin_settings():
 @login_required
 def update_plugin_settings():
     """プラグイン設定更新"""
+    from app.utils.plugin_settings import plugin_settings_store, PluginSettingsError
+    
     try:
         data = request.get_json()
         if not data:
             return jsonify({'error': 'データが送信されていません'}), 400
         
-        # 将来の実装：データベースにプラグイン設定保存
-        # 現在は成功レスポンスのみ返す（設定保存機能は将来実装）
+        updated = plugin_settings_store.update(current_user, data)
         
         return jsonify({
             'message': 'プラグイン設定を更新しました',
-            'updated_settings': data
+            'updated_settings': {name: updated[name] for name in data}
         }), 200
         
+    except PluginSettingsError as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
+        db.session.rollback()
         return jsonify({'error': 'プラグイン設定更新エラー'}), 500
 
 @plugins_bp.route('/marketplace', methods=['GET'])
@@ -193,6 +189,8 @@ def get_plugin_marketplace():
 def plugins_health_check():
     """プラグインシステム稼働状況"""
     try:
+        from app.plugins.manager import plugin_manager
+        
         health_status = {
             'system_status': 'healthy',
             'active_plugins': 1,  # sponsor_management
@@ -204,7 +202,9 @@ def plugins_health_check():
                 'pricing_calculator': 'development', 
                 'content_calendar': 'development',
                 'proposal_generator': 'planning'
-            }
+            },
+            # プラグインマネージャー実状態（ロード状況・ロード時間メトリクス）
+            'plugin_system': plugin_manager.get_system_status()
         }
         
         return jsonify(health_status), 200
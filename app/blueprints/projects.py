@@ -8,10 +8,16 @@ from flask_login import login_required, current_user
 from datetime import datetime, date
 from decimal import Decimal, InvalidOperation
 
+from app.models.client import Client
 from app.models.project import Project
 from app import db
 from app.utils.db_optimizations import ProjectQueryOptimizer
 from app.utils.security_validators import SecurityDecorator, ProjectValidator
+from app.utils.usage_tracker import usage_tracker
+from app.utils.db_routing import use_read_replica
+from app.utils.search import search
+from app.utils.revenue_forecast import MAX_FORECAST_MONTHS, revenue_forecaster
+from app.utils.archival import archiver, parse_date_range
 
 projects_bp = Blueprint('projects', __name__)
 
@@ -33,6 +39,9 @@ def create_project():
         if validation_errors:
             return jsonify({'error': validation_errors[0]}), 400
         
+        # 取引先（正規化名で既存を再利用）
+        client = Client.get_or_create(current_user.id, validated_data['company_name'])
+        
         # 新規プロジェクト作成
         project = Project(
             user_id=current_user.id,
@@ -42,11 +51,13 @@ def create_project():
             description=validated_data['description'],
             project_name=validated_data.get('project_name', ''),
             notes=validated_data.get('notes', ''),
-            status=data.get('status', 'proposed')
+            status=data.get('status', 'proposed'),
+            client_id=client.id if client else None
         )
         
         db.session.add(project)
         db.session.commit()
+        usage_tracker.record(current_user.id, 'sponsor_management', 'project_creation')
         
         return jsonify({
             'message': 'プロジェクトを作成しました',
@@ -60,6 +71,7 @@ def create_project():
 @projects_bp.route('', methods=['GET'])
 @projects_bp.route('/', methods=['GET'])
 @login_required
+@use_read_replica
 def get_projects():
     """プロジェクト一覧取得"""
     try:  # 一時的にコメントアウト - デバッグ用
@@ -69,6 +81,11 @@ def get_projects():
             status = None
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 20, type=int)
+        # 締切日の範囲（アーカイブ済みの範囲にかかる場合のみアーカイブも検索）
+        try:
+            date_from, date_to = parse_date_range(request.args.get('date_from'), request.args.get('date_to'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
         # sort_by, order パラメータは無視（ProjectQueryOptimizerで固定順序）
         
@@ -77,7 +94,9 @@ def get_projects():
             user_id=current_user.id,
             status=status,
             page=page,
-            per_page=per_page
+            per_page=per_page,
+            date_from=date_from,
+            date_to=date_to
         )
         # pagination.itemsを直接使用（変数代入を削除）
         
@@ -96,6 +115,42 @@ def get_projects():
     except Exception as e:  # 一時的にコメントアウト - デバッグ用
         return jsonify({'error': 'プロジェクト一覧取得エラー'}), 500
 
+@projects_bp.route('/search', methods=['GET'])
+@login_required
+@use_read_replica
+def search_projects():
+    """プロジェクト全文検索（企業名・案件名・内容・メモ、関連度順）"""
+    try:
+        keyword = request.args.get('q', '').strip()
+        page = max(request.args.get('page', 1, type=int), 1)
+        per_page = min(max(request.args.get('per_page', 20, type=int), 1), 100)
+        status = request.args.get('status') or None
+        
+        try:
+            projects, total = search(
+                Project, current_user.id, keyword, page=page, per_page=per_page,
+                filters={'status': status} if status else None
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        pages = (total + per_page - 1) // per_page
+        return jsonify({
+            'query': keyword,
+            'projects': [project.to_dict() for project in projects],
+            'pagination': {
+                'page': page,
+                'per_page': per_page,
+                'total': total,
+                'pages': pages,
+                'has_next': page < pages,
+                'has_prev': page > 1
+            }
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': 'プロジェクト検索エラー'}), 500
+
 @projects_bp.route('/<int:project_id>', methods=['GET'])
 @login_required
 def get_project(project_id):
@@ -137,6 +192,8 @@ def update_project(project_id):
         # 更新可能フィールド
         if 'company_name' in data:
             project.company_name = data['company_name']
+            client = Client.get_or_create(current_user.id, data['company_name'])
+            project.client_id = client.id if client else None
         
         if 'amount' in data:
             try:
@@ -170,6 +227,8 @@ def update_project(project_id):
         
         project.updated_at = datetime.utcnow()
         db.session.commit()
+        if 'status' in data:
+            usage_tracker.record(current_user.id, 'sponsor_management', 'status_management')
         
         return jsonify({
             'message': 'プロジェクトを更新しました',
@@ -207,6 +266,7 @@ def delete_project(project_id):
 
 @projects_bp.route('/stats', methods=['GET'])
 @login_required
+@use_read_replica
 def get_project_stats():
     """プロジェクト統計情報"""
     try:
@@ -218,4 +278,39 @@ def get_project_stats():
         return jsonify(stats)
         
     except Exception as e:
-        return jsonify({'error': '統計情報取得エラー'}), 500
\ No newline at end of file
+        return jsonify({'error': '統計情報取得エラー'}), 500
+@projects_bp.route('/forecast', methods=['GET'])
+@login_required
+@use_read_replica
+def get_revenue_forecast():
+    """月別売上予測（提案中・契約中の案件を過去の成約率で重み付け）"""
+    try:
+        months = request.args.get('months', 6, type=int)
+        if not 1 <= months <= MAX_FORECAST_MONTHS:
+            return jsonify({'error': f'monthsは1〜{MAX_FORECAST_MONTHS}で指定してください'}), 400
+        
+        forecast = revenue_forecaster.get(current_user, months=months)
+        return jsonify({'success': True, 'forecast': forecast}), 200
+        
+    except Exception as e:
+        return jsonify({'error': '売上予測取得エラー'}), 500
+
+@projects_bp.route('/<int:project_id>/restore', methods=['POST'])
+@login_required
+def restore_project(project_id):
+    """アーカイブ済み案件を請求書ごと通常の案件に戻す（編集・再発行用）"""
+    try:
+        result = archiver.restore(current_user.id, project_id)
+        if result is None:
+            return jsonify({'error': 'アーカイブ済みの案件が見つかりません'}), 404
+        
+        project = db.session.get(Project, project_id)
+        return jsonify({
+            'success': True,
+            'message': f"案件を復元しました（請求書{result['invoices']}件）",
+            'project': project.to_dict()
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': 'プロジェクト復元エラー'}), 500
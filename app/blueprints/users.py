@@ -6,12 +6,13 @@ InfluBerry v2 - 認証統合済み設計
 from flask import Blueprint, request, jsonify
 from flask_login import login_required, current_user
 from datetime import datetime
-from werkzeug.security import generate_password_hash
 
 from app.models.user import User
 from app.models.project import Project
 from app import db
 from app.utils.db_optimizations import UserQueryOptimizer
+from app.utils.password_hashing import PasswordHashingBusy, hashing_busy_response
+from app.utils.db_routing import use_read_replica
 
 users_bp = Blueprint('users', __name__)
 
@@ -94,12 +95,16 @@ def change_password():
         
         return jsonify({'message': 'パスワードを変更しました'}), 200
         
+    except PasswordHashingBusy:
+        db.session.rollback()
+        return hashing_busy_response()
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': 'パスワード変更エラー'}), 500
 
 @users_bp.route('/stats', methods=['GET'])
 @login_required
+@use_read_replica
 def get_user_stats():
     """ユーザー統計情報"""
     try:
@@ -155,6 +160,9 @@ def deactivate_account():
         
         return jsonify({'message': 'アカウントを無効化しました'}), 200
         
+    except PasswordHashingBusy:
+        db.session.rollback()
+        return hashing_busy_response()
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': 'アカウント無効化エラー'}), 500
\ No newline at end of file
@@ -3,7 +3,28 @@ Models package for InfluBerry v2
 """
 
 from .user import User
+from .client import Client
 from .project import Project
 from .invoice import Invoice
+from .plugin_usage import PluginUsageEvent, PluginUsageCounter
+from .plugin_setting import PluginSetting
+from .deadline_reminder import DeadlineReminder
+from .deleted_record import DeletedRecord, register_deletion_tracking
+from .archive import projects_archive, invoices_archive
 
-__all__ = ['User', 'Project', 'Invoice']
+# 差分同期用の削除記録（users / projects / invoices）
+register_deletion_tracking(User, Project, Invoice)
+
+# 全文検索の索引更新（projects / invoices）
+from app.utils.search import register_search_indexing
+register_search_indexing(Project, Invoice)
+
+# 売上予測キャッシュの無効化（users.projects_version）
+from app.utils.revenue_forecast import register_forecast_invalidation
+register_forecast_invalidation(Project)
+
+# 請求書の年パーティション（PostgreSQLのcreate_all時）
+from app.utils.partitioning import register_invoice_partitioning
+register_invoice_partitioning(Invoice)
+
+__all__ = ['User', 'Client', 'Project', 'Invoice', 'PluginUsageEvent', 'PluginUsageCounter', 'PluginSetting', 'DeadlineReminder', 'DeletedRecord', 'projects_archive', 'invoices_archive']
@@ -0,0 +1,50 @@
+# app/models/archive.py
+"""
+InfluBerry アーカイブテーブル
+完了から一定期間が経過した案件と、その請求書（支払済み・キャンセル）の移動先
+列は元テーブル（projects / invoices）と同じ（idも元の値を保持）で、移動日時 archived_at を追加する
+読み取りは app.utils.archival を経由し、必要な場合のみ元テーブルとUNIONする
+"""
+
+from app import db
+from .project import Project
+from .invoice import Invoice
+
+
+# 元テーブルから引き継ぐ外部キー（案件IDはアーカイブ側の案件を参照）
+ARCHIVE_FOREIGN_KEYS = {
+    'user_id': ('users.id', 'CASCADE'),
+    'client_id': ('clients.id', 'SET NULL'),
+    'project_id': ('projects_archive.id', 'CASCADE')
+}
+
+
+def _archive_table(name, source, *indexes):
+    """元テーブルと同じ列構成のアーカイブテーブル（索引は読み取りパターンに必要なものだけ）"""
+    columns = []
+    for column in source.columns:
+        args = []
+        if column.name in ARCHIVE_FOREIGN_KEYS:
+            target, ondelete = ARCHIVE_FOREIGN_KEYS[column.name]
+            args.append(db.ForeignKey(target, ondelete=ondelete))
+        columns.append(db.Column(
+            column.name, column.type.copy(), *args,
+            primary_key=column.primary_key,
+            autoincrement=False,
+            nullable=column.nullable,
+            unique=bool(column.unique)
+        ))
+    columns.append(db.Column('archived_at', db.DateTime, nullable=False))
+    return db.Table(name, db.metadata, *columns, *indexes)
+
+
+projects_archive = _archive_table(
+    'projects_archive', Project.__table__,
+    db.Index('ix_projects_archive_user_deadline', 'user_id', 'deadline')
+)
+
+invoices_archive = _archive_table(
+    'invoices_archive', Invoice.__table__,
+    db.Index('ix_invoices_archive_user_invoice_date', 'user_id', 'invoice_date'),
+    db.Index('ix_invoices_archive_project_id', 'project_id')
+)
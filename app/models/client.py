@@ -0,0 +1,108 @@
+# app/models/client.py
+"""
+InfluBerry Client モデル
+取引先（案件の企業名・請求先）をユーザー単位で正規化して保持
+"""
+
+import re
+import unicodedata
+from datetime import datetime
+from sqlalchemy.exc import IntegrityError
+from app import db
+
+_SPACES = re.compile(r'\s+')
+
+
+def normalize_client_name(name):
+    """
+    取引先名の照合キー（NFKC・小文字化・空白除去・ひらがな→カタカナ）
+    表記ゆれ（全角/半角・大文字/小文字・空白の有無・かな種別）を同じ取引先として扱う
+    """
+    normalized = unicodedata.normalize('NFKC', str(name or '')).lower()
+    normalized = _SPACES.sub('', normalized)
+    return ''.join(
+        chr(ord(ch) + 0x60) if 'ぁ' <= ch <= 'ゖ' else ch
+        for ch in normalized
+    )
+
+
+class Client(db.Model):
+    """取引先（ユーザー × 正規化名で一意）"""
+
+    __tablename__ = 'clients'
+
+    # Primary Key
+    id = db.Column(db.Integer, primary_key=True)
+
+    # Foreign Key
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+
+    # Client Information
+    name = db.Column(db.String(255), nullable=False)  # 表示名（最初に登録された表記）
+    normalized_name = db.Column(db.String(255), nullable=False)  # 照合キー
+    address = db.Column(db.Text)  # 住所（請求書作成時に自動入力）
+    contact = db.Column(db.String(255))  # 担当者
+
+    # Timestamps
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        # (user_id, normalized_name) の一意インデックスは前方一致検索にも使用
+        db.UniqueConstraint('user_id', 'normalized_name', name='uq_clients_user_normalized_name'),
+    )
+
+    @classmethod
+    def get_or_create(cls, user_id, name, address=None, contact=None):
+        """
+        取引先取得（なければ作成）。住所・担当者は未登録の場合のみ補完
+
+        Returns:
+            Client | None: 名前が空の場合はNone（commitは呼び出し側）
+        """
+        normalized = normalize_client_name(name)
+        if not normalized:
+            return None
+
+        query = cls.query.filter_by(user_id=user_id, normalized_name=normalized)
+        with db.session.no_autoflush:
+            client = query.first()
+        changed = False
+        if client is None:
+            # 同時作成で一意制約に当たった場合は先に作られた取引先を使う
+            try:
+                with db.session.begin_nested():
+                    client = cls(user_id=user_id, name=str(name).strip(), normalized_name=normalized)
+                    db.session.add(client)
+                changed = True
+            except IntegrityError:
+                client = query.first()
+        if address and not client.address:
+            client.address = address
+            changed = True
+        if contact and not client.contact:
+            client.contact = contact
+            changed = True
+
+        if changed:
+            # 版数更新で各ワーカーの補完候補キャッシュを無効化（users.updated_at は変更しない）
+            from app.models.user import User
+            User.query.filter_by(id=user_id).update(
+                {User.clients_version: User.clients_version + 1, User.updated_at: User.updated_at},
+                synchronize_session=False
+            )
+        return client
+
+    def to_dict(self):
+        """辞書形式変換"""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'address': self.address,
+            'contact': self.contact,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+    def __repr__(self):
+        return f'<Client {self.name} user={self.user_id}>'
@@ -0,0 +1,32 @@
+# app/models/deadline_reminder.py
+"""
+InfluBerry DeadlineReminder モデル
+締切リマインダーの送信記録（同じ案件・締切日への重複送信防止）
+"""
+
+from datetime import datetime
+from app import db
+
+
+class DeadlineReminder(db.Model):
+    """案件 × 締切日単位の送信記録（締切日が変更された案件は再度通知対象）"""
+
+    __tablename__ = 'deadline_reminders'
+
+    # Primary Key
+    id = db.Column(db.Integer, primary_key=True)
+
+    # Foreign Keys
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False)
+
+    # Reminder
+    deadline = db.Column(db.Date, nullable=False)  # 通知時点の締切日
+    sent_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint('project_id', 'deadline', name='uq_deadline_reminders_project_deadline'),
+    )
+
+    def __repr__(self):
+        return f'<DeadlineReminder project={self.project_id} deadline={self.deadline}>'
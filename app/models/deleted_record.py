@@ -0,0 +1,55 @@
+# app/models/deleted_record.py
+"""
+InfluBerry DeletedRecord モデル
+削除記録（tombstone）: 環境間の差分同期で削除を伝搬するために使用
+"""
+
+from datetime import datetime
+from sqlalchemy import event, insert
+from app import db
+
+
+# 削除を記録する対象テーブル（差分同期の対象）
+# アーカイブへの移動・アーカイブからの復元はORMを経由しないため app.utils.archival が記録する
+TRACKED_TABLES = ('users', 'projects', 'invoices', 'projects_archive', 'invoices_archive')
+
+
+class DeletedRecord(db.Model):
+    """削除されたレコードの記録（追記専用）"""
+
+    __tablename__ = 'deleted_records'
+
+    # Primary Key（同期時の読み出し位置として使用）
+    id = db.Column(db.Integer, primary_key=True)
+
+    # Deleted Record
+    table_name = db.Column(db.String(50), nullable=False)
+    record_id = db.Column(db.Integer, nullable=False)
+
+    # Timestamps
+    deleted_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+    def __repr__(self):
+        return f'<DeletedRecord {self.table_name}#{self.record_id}>'
+
+
+def record_deletions(connection, table_name, record_ids):
+    """tombstoneの追加（呼び出し側の削除と同一トランザクション）"""
+    deleted_at = datetime.utcnow()
+    if record_ids:
+        connection.execute(insert(DeletedRecord.__table__), [
+            {'table_name': table_name, 'record_id': record_id, 'deleted_at': deleted_at}
+            for record_id in record_ids
+        ])
+
+
+def _record_deletion(mapper, connection, target):
+    """ORM経由の削除時に同一トランザクションでtombstoneを追加"""
+    record_deletions(connection, mapper.local_table.name, [target.id])
+
+
+def register_deletion_tracking(*models):
+    """対象モデルへ削除記録リスナーを登録"""
+    for model in models:
+        if not event.contains(model, 'after_delete', _record_deletion):
+            event.listen(model, 'after_delete', _record_deletion)
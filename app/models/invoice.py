@@ -20,6 +20,7 @@ class Invoice(db.Model):
     # Foreign Keys
     user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
     project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False, index=True)
+    client_id = db.Column(db.Integer, db.ForeignKey('clients.id', ondelete='SET NULL'), nullable=True, index=True)
     
     # Invoice Information
     invoice_number = db.Column(db.String(50), unique=True, nullable=False, index=True)  # 請求書番号
@@ -69,9 +70,15 @@ class Invoice(db.Model):
         nullable=False
     )
     
+    __table_args__ = (
+        # 全文検索の候補（ユーザーの一致行を新しい順）を索引順にたどって打ち切るため
+        db.Index('ix_invoices_user_id_id', 'user_id', 'id'),
+    )
+    
     # Relationships
     user = db.relationship('User', backref='invoices')
     project = db.relationship('Project', backref='invoices')
+    client = db.relationship('Client', lazy=True)
     
     def __init__(self, user_id, project_id, **kwargs):
         """コンストラクタ"""
@@ -121,6 +128,13 @@ class Invoice(db.Model):
         self.description = project.description
         self.project_name = project.project_name  # Task 5: プロジェクト名自動設定追加
         
+        # 取引先に登録済みの住所・担当者を自動入力（請求書には発行時点の値を保存）
+        self.client_id = project.client_id
+        client = project.client
+        if client:
+            self.client_address = client.address
+            self.client_contact = client.contact
+        
         # 金額計算実行
         self.calculate_amounts()
         
@@ -157,6 +171,7 @@ class Invoice(db.Model):
             'tax_rate': float(self.tax_rate) if self.tax_rate else 0,
             'tax_amount': float(self.tax_amount) if self.tax_amount else 0,
             'total_amount': float(self.total_amount) if self.total_amount else 0,
+            'client_id': self.client_id,
             'client_company': self.client_company,
             'client_address': self.client_address,
             'client_contact': self.client_contact,
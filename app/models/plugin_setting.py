@@ -0,0 +1,43 @@
+# app/models/plugin_setting.py
+"""
+InfluBerry PluginSetting モデル
+ユーザー別プラグイン設定（プラグインごとにJSONで保存）
+"""
+
+from datetime import datetime
+from app import db
+
+
+class PluginSetting(db.Model):
+    """ユーザー × プラグイン単位の設定"""
+
+    __tablename__ = 'plugin_settings'
+
+    # Primary Key
+    id = db.Column(db.Integer, primary_key=True)
+
+    # Foreign Key
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+
+    # Settings
+    plugin_name = db.Column(db.String(50), nullable=False)  # プラグイン名 / global_settings
+    settings = db.Column(db.JSON, nullable=False, default=dict)
+
+    # Timestamps
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'plugin_name', name='uq_plugin_settings_user_plugin'),
+    )
+
+    def to_dict(self):
+        """辞書形式変換"""
+        return {
+            'plugin_name': self.plugin_name,
+            'settings': self.settings,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+    def __repr__(self):
+        return f'<PluginSetting {self.plugin_name} user={self.user_id}>'
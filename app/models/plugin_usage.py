@@ -0,0 +1,98 @@
+# app/models/plugin_usage.py
+"""
+InfluBerry PluginUsage モデル
+プラグイン使用イベント（追記専用）と月別集計カウンター
+"""
+
+from datetime import datetime
+from app import db
+
+
+class PluginUsageEvent(db.Model):
+    """プラグイン使用イベント（追記専用ログ）"""
+
+    __tablename__ = 'plugin_usage_events'
+
+    # Primary Key
+    id = db.Column(db.Integer, primary_key=True)
+
+    # Foreign Key
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+
+    # Event Information
+    plugin_name = db.Column(db.String(50), nullable=False)
+    action = db.Column(db.String(50), nullable=False)  # 例: project_creation, status_management
+
+    # Timestamps
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_plugin_usage_events_user_plugin_created', 'user_id', 'plugin_name', 'created_at'),
+    )
+
+    def __repr__(self):
+        return f'<PluginUsageEvent {self.plugin_name}.{self.action} user={self.user_id}>'
+
+
+class PluginUsageCounter(db.Model):
+    """プラグイン使用回数の月別集計（ユーザー × プラグイン × 月 × 機能）"""
+
+    __tablename__ = 'plugin_usage_counters'
+
+    # Primary Key
+    id = db.Column(db.Integer, primary_key=True)
+
+    # Foreign Key
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+
+    # Counter Key
+    plugin_name = db.Column(db.String(50), nullable=False)
+    month = db.Column(db.String(7), nullable=False)  # YYYY-MM（UTC）
+    action = db.Column(db.String(50), nullable=False)
+
+    # Counter Values
+    count = db.Column(db.Integer, nullable=False, default=0)
+    last_used_at = db.Column(db.DateTime, nullable=False)
+
+    __table_args__ = (
+        # 集計読み出し（user_id, plugin_name）とUPSERTの競合判定を兼ねる
+        db.UniqueConstraint('user_id', 'plugin_name', 'month', 'action', name='uq_plugin_usage_counters_key'),
+    )
+
+    @classmethod
+    def get_user_summary(cls, user_id, plugin_name, pending_events=()):
+        """
+        ユーザー別プラグイン使用集計（単一インデックス読み出し）
+        pending_events: 未フラッシュのイベント（UsageTracker.pending_events）を加算
+        """
+        this_month = datetime.utcnow().strftime('%Y-%m')
+        rows = db.session.query(
+            cls.month, cls.action, cls.count, cls.last_used_at
+        ).filter(
+            cls.user_id == user_id,
+            cls.plugin_name == plugin_name
+        ).all()
+        rows = [(r.month, r.action, r.count, r.last_used_at) for r in rows]
+        rows.extend(
+            (e['created_at'].strftime('%Y-%m'), e['action'], 1, e['created_at'])
+            for e in pending_events
+        )
+
+        summary = {
+            'total_usage': 0,
+            'this_month_usage': 0,
+            'features_used': [],
+            'last_used': None
+        }
+        for month, action, count, last_used_at in rows:
+            summary['total_usage'] += count
+            if month == this_month:
+                summary['this_month_usage'] += count
+            if action not in summary['features_used']:
+                summary['features_used'].append(action)
+            if summary['last_used'] is None or last_used_at > summary['last_used']:
+                summary['last_used'] = last_used_at
+        return summary
+
+    def __repr__(self):
+        return f'<PluginUsageCounter {self.plugin_name}.{self.action} {self.month} user={self.user_id}: {self.count}>'
@@ -20,6 +20,9 @@ class Project(db.Model):
     # Foreign Key
     user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False, index=True)
     
+    # 取引先（company_name は表示用の入力値として保持）
+    client_id = db.Column(db.Integer, db.ForeignKey('clients.id', ondelete='SET NULL'), nullable=True, index=True)
+    
     # Project Information
     company_name = db.Column(db.String(255), nullable=False)
     amount = db.Column(db.Numeric(10, 2), nullable=False)  # 金額（最大8桁、小数点2桁）
@@ -48,6 +51,11 @@ class Project(db.Model):
         nullable=False
     )
     
+    __table_args__ = (
+        # 全文検索の候補（ユーザーの一致行を新しい順）を索引順にたどって打ち切るため
+        db.Index('ix_projects_user_id_id', 'user_id', 'id'),
+    )
+    
     def __init__(self, user_id, company_name, amount, deadline, description, **kwargs):
         """コンストラクタ"""
         self.user_id = user_id
@@ -62,12 +70,17 @@ class Project(db.Model):
         
         # オプション引数
         self.status = kwargs.get('status', 'proposed')
+        self.client_id = kwargs.get('client_id')
+    
+    # Relationships
+    client = db.relationship('Client', lazy=True)
     
     def to_dict(self):
         """辞書形式でプロジェクト情報を返す"""
         return {
             'id': self.id,
             'user_id': self.user_id,
+            'client_id': self.client_id,
             'company_name': self.company_name,
             'project_name': self.project_name,  # 新フィールド追加
             'amount': float(self.amount) if self.amount else 0.0,
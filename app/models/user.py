@@ -5,8 +5,8 @@ Flask-Login完全対応版
 
 from datetime import datetime
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
 from app import db
+from app.utils.password_hashing import password_hasher
 
 
 class User(UserMixin, db.Model):
@@ -26,6 +26,18 @@ class User(UserMixin, db.Model):
     is_active = db.Column(db.Boolean, default=True, nullable=False)
     plan_type = db.Column(db.String(20), default='free', nullable=False)
     
+    # プラグイン設定の版数（設定キャッシュの無効化判定に使用）
+    settings_version = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    
+    # 取引先の版数（取引先補完候補キャッシュの無効化判定に使用）
+    clients_version = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    
+    # 案件の版数（売上予測キャッシュの無効化判定に使用・案件の変更時に自動加算）
+    projects_version = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    
+    # カレンダーフィードの購読トークン（URLに含める・再発行で旧URLは無効）
+    calendar_token = db.Column(db.String(64), unique=True, nullable=True, index=True)
+    
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(
@@ -49,11 +61,15 @@ class User(UserMixin, db.Model):
     
     def set_password(self, password):
         """パスワードハッシュ化"""
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
     
     def check_password(self, password):
         """パスワード検証"""
-        return check_password_hash(self.password_hash, password)
+        return password_hasher.verify(self.password_hash, password)
+    
+    def check_password_and_rehash(self, password):
+        """パスワード検証（旧形式・旧コストのハッシュは成功時に再ハッシュ、commitは呼び出し側）"""
+        return password_hasher.verify_and_update(self, password)
     
     def to_dict(self):
         """辞書形式変換"""
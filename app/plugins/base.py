@@ -5,9 +5,57 @@ InfluBerry v2 - 動的Blueprint登録・統一インターフェース実装
 """
 
 from abc import ABC, abstractmethod
-from flask import Blueprint
+from flask import Blueprint, g, has_request_context
 from typing import List, Dict, Optional
 
+class PluginUserContext:
+    """
+    プラグイン利用可否判定用ユーザーコンテキスト
+    リクエスト内で1回だけ構築し、全プラグインの判定で共有する
+    """
+    
+    __slots__ = ('user_id', 'plan_type', 'is_active')
+    
+    def __init__(self, user_id: int, plan_type: Optional[str], is_active: bool):
+        self.user_id = user_id
+        self.plan_type = plan_type
+        self.is_active = is_active
+    
+    @classmethod
+    def from_user(cls, user) -> 'PluginUserContext':
+        """Userインスタンスからコンテキスト作成（クエリなし）"""
+        if user is None:
+            return cls(None, None, False)
+        return cls(user.id, user.plan_type, bool(user.is_active))
+    
+    @classmethod
+    def for_user_id(cls, user_id: int) -> 'PluginUserContext':
+        """
+        ユーザーIDからコンテキスト取得（リクエスト内キャッシュ）
+        
+        ログイン中ユーザー本人の場合はcurrent_userを再利用し、クエリを発行しない
+        """
+        cache = g.setdefault('_plugin_user_contexts', {}) if has_request_context() else {}
+        context = cache.get(user_id)
+        if context is not None:
+            return context
+        
+        user = None
+        if has_request_context():
+            from flask_login import current_user
+            if current_user.is_authenticated and current_user.id == user_id:
+                user = current_user._get_current_object()
+        if user is None:
+            from app.models.user import User
+            user = User.query.get(user_id)
+        
+        context = cls.from_user(user)
+        cache[user_id] = context
+        return context
+    
+    def __repr__(self):
+        return f'<PluginUserContext user={self.user_id} plan={self.plan_type}>'
+
 class BasePlugin(ABC):
     """プラグインベースクラス - 全プラグインの統一インターフェース"""
     
@@ -55,32 +103,58 @@ class BasePlugin(ABC):
             'endpoints': self.get_api_endpoints()
         }
     
-    def is_enabled_for_user(self, user_id: int) -> bool:
+    def is_enabled_for_user(self, user_id: int,
+                            context: Optional[PluginUserContext] = None,
+                            plan_enabled: Optional[bool] = None) -> bool:
         """
         ユーザーがプラグインを利用可能かチェック
         
         Args:
             user_id (int): ユーザーID
+            context (Optional[PluginUserContext]): 構築済みユーザーコンテキスト
+                （省略時はリクエスト内キャッシュから取得）
+            plan_enabled (Optional[bool]): プラン別利用可否（PluginManagerのキャッシュ値）
             
         Returns:
             bool: 利用可能かどうか
         """
-        from app.models.user import User
-        user = User.query.get(user_id)
+        if context is None:
+            context = PluginUserContext.for_user_id(user_id)
         
-        if not user or not user.is_active:
+        if not context.is_active:
             return False
             
         # プラグインが非アクティブな場合
         if not self.is_active:
             return False
+        
+        # プラン別利用可否
+        if plan_enabled is None:
+            plan_enabled = self.is_enabled_for_plan(context.plan_type)
+        if not plan_enabled:
+            return False
             
         # フリープランの制限チェック
-        if user.plan_type == 'free':
-            return self._check_free_plan_limits(user_id)
+        if context.plan_type == 'free':
+            return self._check_free_plan_limits(context.user_id)
         
         return True
     
+    def is_enabled_for_plan(self, plan_type: str) -> bool:
+        """
+        プラン単位の利用可否（各プラグインで実装）
+        
+        結果はPluginManagerが (plan_type, プラグイン名, version) 単位でキャッシュするため、
+        ユーザー個別の状態には依存させないこと
+        
+        Args:
+            plan_type (str): プランタイプ
+            
+        Returns:
+            bool: 利用可能かどうか
+        """
+        return True
+    
     def _check_free_plan_limits(self, user_id: int) -> bool:
         """
         フリープラン制限チェック（各プラグインで実装）
@@ -112,6 +186,15 @@ class BasePlugin(ABC):
             'last_used': None
         }
     
+    def get_default_settings(self) -> Dict:
+        """
+        プラグイン設定の既定値（各プラグインで実装）
+        
+        Returns:
+            Dict: 未保存ユーザーに適用する設定
+        """
+        return {}
+    
     def validate_plugin_settings(self, settings: Dict) -> bool:
         """
         プラグイン設定バリデーション（各プラグインで実装）
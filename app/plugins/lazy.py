@@ -0,0 +1,138 @@
+"""
+LazyBlueprintView - プラグインBlueprint遅延構築
+InfluBerry v2 - 起動時はURLプレフィックスのみ登録し、初回リクエスト時にBlueprintを構築
+Flaskは初回リクエスト後のBlueprint登録を許可しないため、構築したルートを内部Mapで振り分ける
+ルート以外（リクエストフック・エラーハンドラー・url_defaults・アプリ全体への登録・
+url_for でのプラグイン内エンドポイント参照）は再現できないため、そうしたプラグインは
+レジストリで "lazy": false を指定して起動時に通常のBlueprintとして登録する
+"""
+
+import threading
+from typing import Callable, List, Optional
+
+from flask import Blueprint, request
+from werkzeug.routing import Map, Rule
+
+
+# Blueprint単位で保持され、アプリ登録時にマージされる機能（遅延構築では呼ばれない）
+_BLUEPRINT_HOOKS = (
+    ('before_request_funcs', 'before_request'),
+    ('after_request_funcs', 'after_request'),
+    ('teardown_request_funcs', 'teardown_request'),
+    ('error_handler_spec', 'errorhandler'),
+    ('url_value_preprocessors', 'url_value_preprocessor'),
+    ('url_default_functions', 'url_defaults'),
+    ('template_context_processors', 'context_processor'),
+)
+
+
+class _AppAccessed(Exception):
+    """遅延登録関数がアプリ本体へ登録しようとした（app_errorhandler / before_app_request 等）"""
+
+
+class _NoApp:
+    def __getattr__(self, name):
+        raise _AppAccessed(name)
+
+
+def unsupported_features(blueprint: Blueprint) -> List[str]:
+    """遅延構築では動かないBlueprintの機能（ルート定義以外）"""
+    # Flaskが既定で登録する関数（テンプレートの既定コンテキスト等）は除く
+    defaults = Blueprint('_defaults', __name__)
+    features = []
+    for attribute, name in _BLUEPRINT_HOOKS:
+        registered = getattr(blueprint, attribute)
+        default = getattr(defaults, attribute)
+        if any(functions != default.get(key) for key, functions in registered.items() if functions):
+            features.append(name)
+    if blueprint._blueprints:
+        features.append('register_blueprint')
+    if blueprint.has_static_folder:
+        features.append('static_folder')
+    if blueprint.template_folder:
+        features.append('template_folder')
+    return features
+
+
+class _RuleCollector:
+    """Blueprintの遅延登録関数（deferred_functions）からURLルールを収集"""
+
+    def __init__(self, blueprint: Blueprint):
+        self.blueprint = blueprint
+        self.app = _NoApp()
+        self.options = {}
+        self.first_registration = True
+        self.url_prefix = None
+        self.subdomain = None
+        self.name = blueprint.name
+        self.name_prefix = ''
+        self.url_defaults = {}
+        self.rules = []
+        self.view_functions = {}
+
+    def add_url_rule(self, rule: str, endpoint: Optional[str] = None,
+                     view_func: Optional[Callable] = None, **options) -> None:
+        if endpoint is None:
+            endpoint = view_func.__name__
+        if not rule.startswith('/'):
+            rule = '/' + rule
+        # Flask同様、methods未指定はGETのみ（OPTIONSは外側のURLルールで自動応答）
+        methods = options.pop('methods', None) or ('GET',)
+        self.rules.append(Rule(rule, endpoint=endpoint, methods=methods))
+        if view_func is not None:
+            self.view_functions[endpoint] = view_func
+
+
+class LazyBlueprintView:
+    """
+    プラグインBlueprintの遅延構築・ディスパッチ
+
+    対応範囲: Blueprintのルート定義（@bp.route）のみ。それ以外を使うBlueprintは構築時に RuntimeError
+    """
+
+    def __init__(self, plugin_name: str, factory: Callable[[], Optional[Blueprint]]):
+        self.plugin_name = plugin_name
+        self.factory = factory
+        self.url_map = None
+        self.view_functions = {}
+        self._lock = threading.Lock()
+
+    @property
+    def is_built(self) -> bool:
+        return self.url_map is not None
+
+    def build(self) -> None:
+        """Blueprint構築（初回のみ・スレッドセーフ）"""
+        if self.url_map is not None:
+            return
+
+        with self._lock:
+            if self.url_map is not None:
+                return
+
+            blueprint = self.factory()
+            collector = _RuleCollector(blueprint) if blueprint else None
+            if collector:
+                features = unsupported_features(blueprint)
+                for deferred in blueprint.deferred_functions:
+                    try:
+                        deferred(collector)
+                    except _AppAccessed as e:
+                        features.append(f'app.{e.args[0]}')
+                if features:
+                    # 一部だけ動く状態で公開しない（フックの認可チェック等が素通りになるため）
+                    raise RuntimeError(
+                        f"プラグイン '{self.plugin_name}' のBlueprintは遅延構築で再現できない機能を使用しています: "
+                        f"{', '.join(dict.fromkeys(features))}。レジストリで \"lazy\": false を指定してください"
+                    )
+
+            self.view_functions = collector.view_functions if collector else {}
+            self.url_map = Map(collector.rules if collector else [], strict_slashes=False)
+
+    def __call__(self, subpath: str = ''):
+        self.build()
+
+        # NotFound / MethodNotAllowed はFlaskのエラーハンドラーで処理
+        adapter = self.url_map.bind('', url_scheme=request.scheme)
+        endpoint, view_args = adapter.match('/' + subpath, method=request.method)
+        return self.view_functions[endpoint](**view_args)
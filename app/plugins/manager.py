@@ -5,135 +5,339 @@ InfluBerry v2 - 動的Blueprint登録・プラグイン統合管理
 """
 
 from typing import Dict, List, Optional
+from datetime import datetime
 from flask import Flask
-from .base import BasePlugin
+from .base import BasePlugin, PluginUserContext
+from .lazy import LazyBlueprintView
+import importlib
+import json
 import logging
+import os
+import threading
+import time
+
+# プラグインレジストリファイル（プラグイン名 → "モジュール:クラス"）
+DEFAULT_REGISTRY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'registry.json')
 
 class PluginManager:
-    """プラグインシステム統合管理"""
+    """
+    プラグインシステム統合管理
+    
+    スレッド安全性（gthread/geventワーカーで複数リクエストから共有）:
+    - plugin_specs / blueprints は起動時（initialize_plugins）のみ変更し、以降は読み取り専用
+    - plugins / metrics の変更はロード時に _load_lock 内で行い、走査はスナップショットに対して行う
+    - _enablement_matrix は同じキーに同じ値を書くだけのため、競合しても結果は変わらない
+    """
+    
+    # プラグインURLプレフィックス配下で受け付けるHTTPメソッド
+    DISPATCH_METHODS = ['GET', 'POST', 'PUT', 'PATCH', 'DELETE']
     
     def __init__(self):
+        # ロード済みプラグインインスタンス
         self.plugins: Dict[str, BasePlugin] = {}
+        # 登録済みプラグイン定義（インスタンス化は初回利用時）
+        self.plugin_specs: Dict[str, Dict] = {}
+        # プラグイン別ロード時間メトリクス
+        self.metrics: Dict[str, Dict] = {}
         self.blueprints: List = []
+        # プラン別利用可否キャッシュ: (plan_type, プラグイン名, version) → bool
+        self._enablement_matrix: Dict[tuple, bool] = {}
         self.logger = logging.getLogger(__name__)
+        self._load_lock = threading.Lock()
+    
+    def register_spec(self, name: str, entry_point: str, source: str = 'registry',
+                      lazy: bool = True) -> bool:
+        """
+        プラグイン定義登録（モジュールのimport・インスタンス化は初回利用時）
+        
+        Args:
+            name (str): プラグイン名
+            entry_point (str): "モジュール:クラス" 形式のプラグインクラス参照
+            source (str): 定義元（registry / entry_point / instance）
+            lazy (bool): Blueprintを初回リクエスト時に構築するか
+                （Falseの場合は起動時に通常のBlueprintとして登録。フック・エラーハンドラー・url_for等を使うプラグイン用）
+        
+        Returns:
+            bool: 登録成功かどうか
+        """
+        if name in self.plugin_specs:
+            self.logger.warning(f"プラグイン '{name}' は既に登録されています")
+            return False
+        
+        self.plugin_specs[name] = {
+            'name': name,
+            'entry_point': entry_point,
+            'source': source
+        }
+        self.metrics[name] = {
+            'status': 'registered',
+            'source': source,
+            'load_seconds': None,
+            'blueprint_seconds': None,
+            'loaded_at': None,
+            'error': None
+        }
+        
+        # Blueprintは初回リクエスト時に構築（コールドスタート短縮）
+        self.blueprints.append({
+            'view': LazyBlueprintView(name, lambda: self._build_blueprint(name)) if lazy else None,
+            'plugin_name': name,
+            'url_prefix': f'/api/plugins/{name}',
+            'lazy': lazy
+        })
+        return True
     
-    def register_plugin(self, plugin: BasePlugin) -> bool:
+    def register_plugin(self, plugin: BasePlugin, lazy: bool = True) -> bool:
         """
-        プラグイン登録とBlueprint作成
+        プラグインインスタンス登録（Blueprintは初回リクエスト時に遅延構築）
         
         Args:
             plugin (BasePlugin): 登録するプラグイン
-            
+            lazy (bool): Blueprintを遅延構築するか（register_spec 参照）
+        
         Returns:
             bool: 登録成功かどうか
         """
         try:
-            if plugin.name in self.plugins:
-                self.logger.warning(f"プラグイン '{plugin.name}' は既に登録されています")
+            entry_point = f'{plugin.__class__.__module__}:{plugin.__class__.__name__}'
+            if not self.register_spec(plugin.name, entry_point, source='instance', lazy=lazy):
                 return False
             
-            # プラグインをレジストリに追加
+            # インスタンス化済みのためロード済みとして登録
             self.plugins[plugin.name] = plugin
-            
-            # Blueprintを作成・登録
-            blueprint = plugin.create_blueprint()
-            if blueprint:
-                self.blueprints.append({
-                    'blueprint': blueprint,
-                    'plugin_name': plugin.name,
-                    'url_prefix': f'/api/plugins/{plugin.name}'
-                })
-                self.logger.info(f"プラグイン '{plugin.name}' のBlueprint登録完了")
-            else:
-                self.logger.info(f"プラグイン '{plugin.name}' はBlueprint不要")
-                
+            self.metrics[plugin.name].update({
+                'status': 'loaded',
+                'load_seconds': 0.0,
+                'loaded_at': datetime.utcnow().isoformat()
+            })
             return True
-            
+        
         except Exception as e:
             self.logger.error(f"プラグイン '{plugin.name}' 登録エラー: {str(e)}")
             return False
     
-    def get_plugin(self, name: str) -> Optional[BasePlugin]:
+    def _load_plugin(self, name: str) -> Optional[BasePlugin]:
         """
-        プラグイン取得
+        プラグインクラスのimport・インスタンス化（初回のみ・スレッドセーフ）
         
         Args:
             name (str): プラグイン名
+        
+        Returns:
+            Optional[BasePlugin]: プラグインインスタンス（ロード失敗時はNone）
+        """
+        with self._load_lock:
+            if name in self.plugins:
+                return self.plugins[name]
+            
+            spec = self.plugin_specs.get(name)
+            metrics = self.metrics.get(name)
+            # ロード失敗済みプラグインは再試行しない（リクエスト毎のimportエラー回避）
+            if not spec or metrics['status'] == 'error':
+                return None
+            
+            start = time.perf_counter()
+            try:
+                module_name, _, class_name = spec['entry_point'].partition(':')
+                plugin_class = getattr(importlib.import_module(module_name), class_name)
+                plugin = plugin_class()
+                
+                if not isinstance(plugin, BasePlugin):
+                    raise TypeError(f"{spec['entry_point']} はBasePluginのサブクラスではありません")
+                if plugin.name != name:
+                    self.logger.warning(
+                        f"プラグイン名不一致: 登録名 '{name}' / クラス定義 '{plugin.name}'"
+                    )
+            
+            except Exception as e:
+                metrics.update({
+                    'status': 'error',
+                    'load_seconds': time.perf_counter() - start,
+                    'error': str(e)
+                })
+                self.logger.error(f"プラグイン '{name}' ロードエラー: {str(e)}")
+                return None
             
+            self.plugins[name] = plugin
+            metrics.update({
+                'status': 'loaded',
+                'load_seconds': time.perf_counter() - start,
+                'loaded_at': datetime.utcnow().isoformat()
+            })
+            self.logger.info(
+                f"プラグイン '{name}' ロード完了 ({metrics['load_seconds'] * 1000:.1f}ms)"
+            )
+            return plugin
+    
+    def _build_blueprint(self, name: str):
+        """プラグインBlueprint構築（LazyBlueprintViewから初回リクエスト時、lazy: false の場合は起動時に呼び出し）"""
+        plugin = self.get_plugin(name)
+        if plugin is None:
+            return None
+        
+        start = time.perf_counter()
+        blueprint = plugin.create_blueprint()
+        with self._load_lock:
+            self.metrics[name]['blueprint_seconds'] = time.perf_counter() - start
+        
+        if blueprint:
+            self.logger.info(f"プラグイン '{name}' のBlueprint構築完了")
+        else:
+            self.logger.info(f"プラグイン '{name}' はBlueprint不要")
+        return blueprint
+    
+    def get_plugin(self, name: str) -> Optional[BasePlugin]:
+        """
+        プラグイン取得（未ロードの場合はここでインスタンス化）
+        
+        Args:
+            name (str): プラグイン名
+        
         Returns:
             Optional[BasePlugin]: プラグインインスタンス
         """
-        return self.plugins.get(name)
+        plugin = self.plugins.get(name)
+        if plugin is None and name in self.plugin_specs:
+            plugin = self._load_plugin(name)
+        return plugin
     
-    def get_enabled_plugins(self, user_id: int) -> List[BasePlugin]:
+    def is_plan_enabled(self, plugin: BasePlugin, plan_type: str) -> bool:
+        """
+        プラン別利用可否（(plan_type, プラグイン名, version) 単位でキャッシュ）
+        
+        Args:
+            plugin (BasePlugin): 対象プラグイン
+            plan_type (str): プランタイプ
+            
+        Returns:
+            bool: 利用可能かどうか
+        """
+        key = (plan_type, plugin.name, plugin.version)
+        enabled = self._enablement_matrix.get(key)
+        if enabled is None:
+            enabled = bool(plugin.is_enabled_for_plan(plan_type))
+            self._enablement_matrix[key] = enabled
+        return enabled
+    
+    def get_enablement(self, user_id: int,
+                       context: Optional[PluginUserContext] = None) -> Dict[str, bool]:
+        """
+        全プラグインの利用可否を一括判定（ユーザー取得は1回のみ）
+        
+        Args:
+            user_id (int): ユーザーID
+            context (Optional[PluginUserContext]): 構築済みユーザーコンテキスト
+            
+        Returns:
+            Dict[str, bool]: プラグイン名 → 利用可能かどうか
+        """
+        if context is None:
+            context = PluginUserContext.for_user_id(user_id)
+        
+        return {
+            plugin.name: plugin.is_enabled_for_user(
+                user_id,
+                context=context,
+                plan_enabled=self.is_plan_enabled(plugin, context.plan_type)
+            )
+            for plugin in self.get_all_plugins()
+        }
+    
+    def get_enabled_plugins(self, user_id: int,
+                            context: Optional[PluginUserContext] = None) -> List[BasePlugin]:
         """
         ユーザーが利用可能なプラグイン一覧
         
         Args:
             user_id (int): ユーザーID
+            context (Optional[PluginUserContext]): 構築済みユーザーコンテキスト
             
         Returns:
             List[BasePlugin]: 利用可能プラグイン一覧
         """
-        enabled_plugins = []
-        for plugin in self.plugins.values():
-            if plugin.is_enabled_for_user(user_id):
-                enabled_plugins.append(plugin)
-        return enabled_plugins
+        enablement = self.get_enablement(user_id, context)
+        return [plugin for plugin in self.get_all_plugins() if enablement.get(plugin.name)]
     
     def get_all_plugins(self) -> List[BasePlugin]:
         """
-        全プラグイン一覧取得
+        全プラグイン一覧取得（未ロードのプラグインはロード）
         
         Returns:
             List[BasePlugin]: 全プラグイン一覧
         """
-        return list(self.plugins.values())
+        plugins = [self.get_plugin(name) for name in self.plugin_specs]
+        return [plugin for plugin in plugins if plugin is not None]
     
     def register_blueprints(self, app: Flask) -> None:
         """
-        Flask アプリにBlueprint登録
+        Flask アプリにプラグインURLプレフィックス登録
         
         Args:
             app (Flask): Flaskアプリケーション
         """
         try:
             for blueprint_info in self.blueprints:
-                app.register_blueprint(
-                    blueprint_info['blueprint'],
-                    url_prefix=blueprint_info['url_prefix']
+                url_prefix = blueprint_info['url_prefix']
+                endpoint = f"plugin_{blueprint_info['plugin_name']}"
+                view = blueprint_info['view']
+                
+                if not blueprint_info['lazy']:
+                    blueprint = self._build_blueprint(blueprint_info['plugin_name'])
+                    if blueprint:
+                        app.register_blueprint(blueprint, url_prefix=url_prefix)
+                    self.logger.info(
+                        f"Blueprint '{blueprint_info['plugin_name']}' を '{url_prefix}' で登録完了"
+                    )
+                    continue
+                
+                app.add_url_rule(
+                    url_prefix,
+                    endpoint=endpoint,
+                    view_func=view,
+                    methods=self.DISPATCH_METHODS
+                )
+                app.add_url_rule(
+                    f'{url_prefix}/<path:subpath>',
+                    endpoint=endpoint,
+                    view_func=view,
+                    methods=self.DISPATCH_METHODS
                 )
                 self.logger.info(
                     f"Blueprint '{blueprint_info['plugin_name']}' を "
-                    f"'{blueprint_info['url_prefix']}' で登録完了"
+                    f"'{url_prefix}' で登録完了（遅延構築）"
                 )
         except Exception as e:
             self.logger.error(f"Blueprint登録エラー: {str(e)}")
             raise
     
-    def get_plugin_info(self, user_id: int) -> List[Dict]:
+    def get_plugin_info(self, user_id: int,
+                        context: Optional[PluginUserContext] = None) -> List[Dict]:
         """
         フロントエンド用プラグイン情報
         
         Args:
             user_id (int): ユーザーID
+            context (Optional[PluginUserContext]): 構築済みユーザーコンテキスト
             
         Returns:
             List[Dict]: プラグイン情報一覧
         """
+        enablement = self.get_enablement(user_id, context)
         plugin_info = []
-        for plugin in self.plugins.values():
+        for plugin in self.get_all_plugins():
             info = plugin.get_plugin_info()
-            info['enabled_for_user'] = plugin.is_enabled_for_user(user_id)
+            info['enabled_for_user'] = enablement.get(plugin.name, False)
             plugin_info.append(info)
         return plugin_info
     
-    def get_plugin_usage_stats(self, user_id: int) -> Dict:
+    def get_plugin_usage_stats(self, user_id: int,
+                               context: Optional[PluginUserContext] = None) -> Dict:
         """
         全プラグインの使用統計
         
         Args:
             user_id (int): ユーザーID
+            context (Optional[PluginUserContext]): 構築済みユーザーコンテキスト
             
         Returns:
             Dict: 使用統計情報
@@ -141,38 +345,66 @@ class PluginManager:
         stats = {}
         total_usage = 0
         
-        for plugin_name, plugin in self.plugins.items():
+        for plugin in self.get_all_plugins():
             plugin_stats = plugin.get_usage_stats(user_id)
-            stats[plugin_name] = plugin_stats
+            stats[plugin.name] = plugin_stats
             total_usage += plugin_stats.get('total_usage', 0)
         
+        enablement = self.get_enablement(user_id, context)
+        
         return {
             'plugin_stats': stats,
             'total_usage': total_usage,
-            'active_plugins': len(self.get_enabled_plugins(user_id)),
-            'total_plugins': len(self.plugins)
+            'active_plugins': len([name for name, enabled in enablement.items() if enabled]),
+            'total_plugins': len(self.plugin_specs)
         }
     
-    def initialize_plugins(self) -> None:
+    def discover_plugins(self, registry_path: Optional[str] = None,
+                         entry_point_group: Optional[str] = None) -> int:
+        """
+        プラグイン定義の探索（レジストリファイル・パッケージentry points）
+        
+        Args:
+            registry_path (Optional[str]): レジストリファイルパス
+            entry_point_group (Optional[str]): entry pointsグループ名（Noneの場合は探索しない）
+        
+        Returns:
+            int: 新規登録したプラグイン数
+        """
+        registered = 0
+        
+        with open(registry_path or DEFAULT_REGISTRY_PATH, encoding='utf-8') as f:
+            registry = json.load(f)
+        
+        for entry in registry.get('plugins', []):
+            if not entry.get('enabled', True):
+                continue
+            if self.register_spec(entry['name'], entry['entry_point'], source='registry',
+                                  lazy=entry.get('lazy', True)):
+                registered += 1
+        
+        # 外部パッケージのプラグイン（メタデータ走査のコストがあるため設定時のみ）
+        if entry_point_group:
+            from importlib.metadata import entry_points
+            for ep in entry_points(group=entry_point_group):
+                if self.register_spec(ep.name, ep.value, source='entry_point'):
+                    registered += 1
+        
+        return registered
+    
+    def initialize_plugins(self, registry_path: Optional[str] = None,
+                           entry_point_group: Optional[str] = None) -> None:
         """
         起動時プラグイン初期化・自動登録
+        
+        プラグイン定義の登録のみ行い、import・インスタンス化・Blueprint構築は初回利用時
         """
         try:
-            # Phase 1: sponsor_managementプラグインのみ登録
-            from .sponsor_management import SponsorManagementPlugin
-            
-            sponsor_plugin = SponsorManagementPlugin()
-            self.register_plugin(sponsor_plugin)
-            
-            self.logger.info(f"プラグイン初期化完了: {len(self.plugins)}個のプラグイン登録")
-            
-            # 将来のプラグイン追加（Phase 2以降）
-            # from .pricing_calculator import PricingCalculatorPlugin
-            # from .content_calendar import ContentCalendarPlugin
-            # from .proposal_generator import ProposalGeneratorPlugin
-            
-        except ImportError as e:
-            self.logger.warning(f"プラグイン初期化中にインポートエラー: {str(e)}")
+            registered = self.discover_plugins(registry_path, entry_point_group)
+            self.logger.info(f"プラグイン初期化完了: {registered}個のプラグイン登録")
+        
+        except (OSError, ValueError, KeyError) as e:
+            self.logger.warning(f"プラグインレジストリ読み込みエラー: {str(e)}")
         except Exception as e:
             self.logger.error(f"プラグイン初期化エラー: {str(e)}")
             raise
@@ -183,7 +415,7 @@ class PluginManager:
         
         Args:
             plugin (BasePlugin): チェック対象プラグイン
-            
+        
         Returns:
             bool: 互換性があるかどうか
         """
@@ -192,24 +424,43 @@ class PluginManager:
     
     def get_system_status(self) -> Dict:
         """
-        プラグインシステム状態取得
+        プラグインシステム状態取得（未ロードのプラグインはロードしない）
         
         Returns:
             Dict: システム状態情報
         """
-        active_plugins = len([p for p in self.plugins.values() if p.is_active])
+        # 他スレッドのロードと並行して走査するためスナップショットを取る
+        with self._load_lock:
+            plugins = list(self.plugins.values())
+            metrics_snapshot = {name: dict(metrics) for name, metrics in self.metrics.items()}
+        
+        active_plugins = len([p for p in plugins if p.is_active])
+        failed_plugins = [name for name, m in metrics_snapshot.items() if m['status'] == 'error']
         
         return {
-            'system_status': 'healthy',
-            'total_plugins': len(self.plugins),
+            'system_status': 'degraded' if failed_plugins else 'healthy',
+            'total_plugins': len(self.plugin_specs),
+            'loaded_plugins': len(plugins),
             'active_plugins': active_plugins,
+            'failed_plugins': failed_plugins,
             'registered_blueprints': len(self.blueprints),
-            'plugin_list': [p.name for p in self.plugins.values()]
+            'built_blueprints': len([b for b in self.blueprints if not b['lazy'] or b['view'].is_built]),
+            'plugin_list': list(self.plugin_specs),
+            'plugin_metrics': {
+                name: dict(
+                    metrics,
+                    load_ms=round(metrics['load_seconds'] * 1000, 2)
+                    if metrics['load_seconds'] is not None else None,
+                    blueprint_ms=round(metrics['blueprint_seconds'] * 1000, 2)
+                    if metrics['blueprint_seconds'] is not None else None
+                )
+                for name, metrics in metrics_snapshot.items()
+            }
         }
     
     def __repr__(self):
-        return f'<PluginManager {len(self.plugins)} plugins>'
+        return f'<PluginManager {len(self.plugins)}/{len(self.plugin_specs)} plugins loaded>'
 
 
 # グローバルプラグインマネージャーインスタンス
-plugin_manager = PluginManager()
\ No newline at end of file
+plugin_manager = PluginManager()
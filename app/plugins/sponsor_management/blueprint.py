@@ -12,6 +12,9 @@ from typing import List, Dict
 from ..base import BasePlugin
 from app.models.project import Project
 from app.models.user import User
+from app.utils.usage_tracker import usage_tracker
+from app.utils.db_routing import use_read_replica
+from app.utils.archival import archiver
 from app import db
 
 class SponsorManagementPlugin(BasePlugin):
@@ -31,24 +34,27 @@ class SponsorManagementPlugin(BasePlugin):
         
         @bp.route('/dashboard', methods=['GET'])
         @login_required
+        @use_read_replica
         def get_sponsor_dashboard():
             """スポンサー案件ダッシュボード"""
             try:
-                # 案件統計
-                total_projects = Project.query.filter_by(user_id=current_user.id).count()
+                usage_tracker.record(current_user.id, self.name, 'dashboard')
+                # 案件統計（完了件数・収益はアーカイブ済みの案件を含む）
+                source = archiver.project_source(current_user.id)
+                total_projects = db.session.query(source).filter(source.user_id == current_user.id).count()
                 active_projects = Project.query.filter_by(
                     user_id=current_user.id, 
                     status='contracted'
                 ).count()
-                completed_projects = Project.query.filter_by(
-                    user_id=current_user.id, 
-                    status='completed'
+                completed_projects = db.session.query(source).filter(
+                    source.user_id == current_user.id,
+                    source.status == 'completed'
                 ).count()
                 
                 # 収益統計
-                total_revenue = db.session.query(db.func.sum(Project.amount)).filter_by(
-                    user_id=current_user.id,
-                    status='completed'
+                total_revenue = db.session.query(db.func.sum(source.amount)).filter(
+                    source.user_id == current_user.id,
+                    source.status == 'completed'
                 ).scalar() or 0
                 
                 # 今月の案件
@@ -99,29 +105,33 @@ class SponsorManagementPlugin(BasePlugin):
         
         @bp.route('/analytics', methods=['GET'])
         @login_required
+        @use_read_replica
         def get_sponsor_analytics():
             """詳細分析データ"""
             try:
+                usage_tracker.record(current_user.id, self.name, 'analytics')
+                # 全期間の分析（アーカイブ済みの案件を含む）
+                source = archiver.project_source(current_user.id)
                 # 月別収益分析
                 monthly_revenue = db.session.query(
-                    db.func.strftime('%Y-%m', Project.created_at).label('month'),
-                    db.func.sum(Project.amount).label('revenue'),
-                    db.func.count(Project.id).label('project_count')
+                    db.func.strftime('%Y-%m', source.created_at).label('month'),
+                    db.func.sum(source.amount).label('revenue'),
+                    db.func.count(source.id).label('project_count')
                 ).filter(
-                    Project.user_id == current_user.id,
-                    Project.status == 'completed'
+                    source.user_id == current_user.id,
+                    source.status == 'completed'
                 ).group_by('month').order_by('month').all()
                 
                 # ステータス別分布
                 status_distribution = db.session.query(
-                    Project.status,
-                    db.func.count(Project.id).label('count'),
-                    db.func.sum(Project.amount).label('total_amount')
-                ).filter_by(user_id=current_user.id).group_by(Project.status).all()
+                    source.status,
+                    db.func.count(source.id).label('count'),
+                    db.func.sum(source.amount).label('total_amount')
+                ).filter(source.user_id == current_user.id).group_by(source.status).all()
                 
                 # 平均案件単価
-                avg_amount = db.session.query(db.func.avg(Project.amount)).filter_by(
-                    user_id=current_user.id
+                avg_amount = db.session.query(db.func.avg(source.amount)).filter(
+                    source.user_id == current_user.id
                 ).scalar() or 0
                 
                 analytics_data = {
@@ -195,38 +205,27 @@ class SponsorManagementPlugin(BasePlugin):
         ]
     
     def get_usage_stats(self, user_id: int) -> Dict:
-        """使用統計取得"""
+        """使用統計取得（使用カウンター + 案件集計の2クエリ）"""
         try:
-            project_count = Project.query.filter_by(user_id=user_id).count()
-            completed_projects = Project.query.filter_by(
-                user_id=user_id, 
-                status='completed'
-            ).count()
+            from app.models.plugin_usage import PluginUsageCounter
+            from app.utils.db_optimizations import ProjectQueryOptimizer
             
-            # 今月の使用量
-            this_month = datetime.utcnow().replace(day=1)
-            this_month_usage = Project.query.filter(
-                Project.user_id == user_id,
-                Project.created_at >= this_month
-            ).count()
-            
-            # 最終使用日
-            last_project = Project.query.filter_by(user_id=user_id).order_by(
-                Project.updated_at.desc()
-            ).first()
+            usage = PluginUsageCounter.get_user_summary(
+                user_id, self.name, usage_tracker.pending_events(user_id, self.name)
+            )
+            project_stats = ProjectQueryOptimizer.get_user_stats_optimized(user_id)
+            project_count = project_stats['total_projects']
+            completed_projects = project_stats['projects_by_status']['completed']
             
             return {
                 'plugin_name': self.name,
-                'total_usage': project_count,
-                'this_month_usage': this_month_usage,
-                'features_used': ['project_creation', 'status_management', 'analytics'],
-                'last_used': last_project.updated_at.isoformat() if last_project else None,
+                'total_usage': usage['total_usage'],
+                'this_month_usage': usage['this_month_usage'],
+                'features_used': usage['features_used'],
+                'last_used': usage['last_used'].isoformat() if usage['last_used'] else None,
                 'efficiency_score': (completed_projects / project_count * 100) if project_count > 0 else 0,
                 'completion_rate': completed_projects,
-                'active_projects': Project.query.filter_by(
-                    user_id=user_id, 
-                    status='contracted'
-                ).count()
+                'active_projects': project_stats['projects_by_status']['contracted']
             }
             
         except Exception:
@@ -238,7 +237,26 @@ class SponsorManagementPlugin(BasePlugin):
         # Phase 4以降: 月5件まで制限予定
         return True
     
+    def get_default_settings(self) -> Dict:
+        """プラグイン設定の既定値"""
+        return {
+            'auto_notifications': True,
+            'default_currency': 'JPY',
+            'deadline_reminders': True,
+            'reminder_days_before': 3
+        }
+    
     def validate_plugin_settings(self, settings: Dict) -> bool:
         """プラグイン設定バリデーション"""
         required_settings = ['auto_notifications', 'default_currency']
-        return all(key in settings for key in required_settings)
\ No newline at end of file
+        if not all(key in settings for key in required_settings):
+            return False
+        
+        for key in ('auto_notifications', 'deadline_reminders'):
+            if key in settings and not isinstance(settings[key], bool):
+                return False
+        if settings['default_currency'] not in ('JPY', 'USD'):
+            return False
+        
+        days = settings.get('reminder_days_before', 3)
+        return isinstance(days, int) and not isinstance(days, bool) and 0 <= days <= 30
\ No newline at end of file
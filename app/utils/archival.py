@@ -0,0 +1,311 @@
+"""
+案件・請求書のアーカイブ（ホット/コールド分離）
+完了から ARCHIVE_AFTER_DAYS 日以上経過した案件を、請求書（支払済み・キャンセルで同じく経過済み）ごと
+アーカイブテーブルへバッチ単位で移動し、日常のクエリが走査する projects / invoices と索引を小さく保つ
+
+読み取り側は project_source / invoice_source で対象を選ぶ:
+- ユーザーのアーカイブ済み範囲（締切日・請求日の最大値）が要求範囲にかからなければ元テーブルのみ
+- かかる場合は元テーブルとアーカイブのUNION ALLを Project / Invoice として読む（読み取り専用）
+"""
+
+from datetime import date, datetime, timedelta
+
+import click
+from sqlalchemy import delete, func, insert, literal, select, text
+from sqlalchemy.orm import aliased
+
+# アーカイブ対象となる請求書ステータス（これ以外の請求書が残る案件は移動しない）
+CLOSED_INVOICE_STATUSES = ('paid', 'cancelled')
+
+
+def parse_date_range(date_from, date_to):
+    """
+    一覧の日付範囲（YYYY-MM-DD・省略可）の解析
+
+    Raises:
+        ValueError: 形式不正・開始日が終了日より後
+    """
+    try:
+        start = date.fromisoformat(date_from) if date_from else None
+        end = date.fromisoformat(date_to) if date_to else None
+    except ValueError:
+        raise ValueError('date_from / date_to は YYYY-MM-DD 形式で指定してください')
+    if start and end and start > end:
+        raise ValueError('date_from は date_to 以前の日付を指定してください')
+    return start, end
+
+
+class Archiver:
+    """アーカイブの移動・復元と読み取り対象の選択"""
+
+    def __init__(self):
+        self.after_days = 365
+        self.batch_size = 500
+
+    def init_app(self, app):
+        """Flaskアプリ登録（設定読み込み）"""
+        self.after_days = app.config['ARCHIVE_AFTER_DAYS']
+        self.batch_size = app.config['ARCHIVE_BATCH_SIZE']
+
+    # --- 読み取り対象 ---
+
+    def project_source(self, user_id, date_from=None, date_to=None):
+        """
+        案件の読み取り対象（date_from / date_to: 締切日の範囲・date_from省略時は全期間）
+
+        Returns:
+            Project または aliased(Project, 元テーブル ∪ アーカイブ)。呼び出し側でも user_id・範囲で絞り込む
+        """
+        from app.models.archive import projects_archive
+        from app.models.project import Project
+
+        return self._source(Project, projects_archive, 'deadline', user_id, date_from, date_to)
+
+    def invoice_source(self, user_id, date_from=None, date_to=None):
+        """請求書の読み取り対象（date_from / date_to: 請求日の範囲）"""
+        from app.models.archive import invoices_archive
+        from app.models.invoice import Invoice
+
+        return self._source(Invoice, invoices_archive, 'invoice_date', user_id, date_from, date_to)
+
+    @staticmethod
+    def _source(model, archive, date_column, user_id, date_from, date_to):
+        from app import db
+
+        # アーカイブ済み範囲の上端（(user_id, 日付) 索引の1探索）
+        horizon = db.session.execute(
+            select(func.max(archive.c[date_column])).where(archive.c.user_id == user_id)
+        ).scalar()
+        if horizon is None or (date_from is not None and date_from > horizon):
+            return model
+
+        def branch(table):
+            query = select(*[table.c[column.name] for column in model.__table__.columns]).where(
+                table.c.user_id == user_id
+            )
+            if date_from is not None:
+                query = query.where(table.c[date_column] >= date_from)
+            if date_to is not None:
+                query = query.where(table.c[date_column] <= date_to)
+            return query
+
+        combined = branch(model.__table__).union_all(branch(archive)).subquery(f'{model.__tablename__}_all')
+        return aliased(model, combined)
+
+    def preload_projects(self, project_ids):
+        """
+        請求書の案件（アーカイブ済みを含む）を1クエリでセッションへ読み込む
+        （Invoice.project の遅延読み込みがSQLを発行せずに解決される）
+        """
+        from app import db
+        from app.models.archive import projects_archive
+        from app.models.project import Project
+
+        project_ids = list(set(project_ids))
+        if not project_ids:
+            return
+        columns = [column.name for column in Project.__table__.columns]
+        combined = select(*[Project.__table__.c[name] for name in columns]).where(
+            Project.id.in_(project_ids)
+        ).union_all(
+            select(*[projects_archive.c[name] for name in columns]).where(projects_archive.c.id.in_(project_ids))
+        ).subquery('projects_all')
+        db.session.query(aliased(Project, combined)).all()
+
+    # --- 移動 ---
+
+    def cutoff(self, today=None):
+        """この日時より前に完了・支払済みになったものが対象"""
+        today = today or date.today()
+        return datetime.combine(today - timedelta(days=self.after_days), datetime.min.time())
+
+    def run(self, today=None, batch_size=None, dry_run=False):
+        """
+        対象案件を請求書ごとアーカイブへ移動（バッチごとにコミット）
+
+        Returns:
+            dict: projects / invoices / batches
+        """
+        from app import db
+
+        cutoff = self.cutoff(today)
+        batch_size = batch_size or self.batch_size
+        result = {'projects': 0, 'invoices': 0, 'batches': 0}
+        last_id = 0
+        while True:
+            candidate_ids, project_ids, invoice_ids = self._lock_batch(cutoff, batch_size, last_id)
+            if not candidate_ids:
+                db.session.rollback()
+                break
+            last_id = candidate_ids[-1]
+            if dry_run:
+                db.session.rollback()
+            elif project_ids:
+                self._archive_rows(project_ids, invoice_ids)
+                db.session.commit()
+            result['projects'] += len(project_ids)
+            result['invoices'] += len(invoice_ids)
+            result['batches'] += 1
+        return result
+
+    @staticmethod
+    def _lock_batch(cutoff, batch_size, last_id):
+        """
+        候補案件とその請求書を行ロックし、ロック後の値で対象を確定する
+        （移動中に請求書の追加・ステータス変更が割り込んでも未完了のデータを移動しない）
+
+        Returns:
+            tuple: (候補案件ID, 移動する案件ID, 移動する請求書ID)
+        """
+        from app import db
+        from app.models.invoice import Invoice
+        from app.models.project import Project
+
+        open_invoice = select(Invoice.id).where(
+            Invoice.project_id == Project.id,
+            (Invoice.status.notin_(CLOSED_INVOICE_STATUSES)) | (Invoice.updated_at >= cutoff)
+        ).exists()
+        candidate_ids = db.session.execute(
+            select(Project.id).where(
+                Project.status == 'completed',
+                Project.updated_at < cutoff,
+                Project.id > last_id,
+                ~open_invoice
+            ).order_by(Project.id).limit(batch_size).with_for_update(skip_locked=True)
+        ).scalars().all()
+        if not candidate_ids:
+            return [], [], []
+
+        invoices = db.session.execute(
+            select(Invoice.id, Invoice.project_id, Invoice.status, Invoice.updated_at)
+            .where(Invoice.project_id.in_(candidate_ids))
+            .with_for_update()
+        ).all()
+        blocked = {
+            invoice.project_id for invoice in invoices
+            if invoice.status not in CLOSED_INVOICE_STATUSES or invoice.updated_at >= cutoff
+        }
+        project_ids = [project_id for project_id in candidate_ids if project_id not in blocked]
+        invoice_ids = [invoice.id for invoice in invoices if invoice.project_id not in blocked]
+        return candidate_ids, project_ids, invoice_ids
+
+    @staticmethod
+    def _copy(connection, source, target, ids, values):
+        """source の指定行を target へ INSERT ... SELECT（values: 上書きする列の値）"""
+        names = [column.name for column in target.columns if column.name in source.c]
+        extra = [name for name in values if name not in names]
+        columns = [literal(values[name]) if name in values else source.c[name] for name in names]
+        connection.execute(
+            insert(target).from_select(
+                names + extra,
+                select(*columns, *[literal(values[name]) for name in extra]).where(source.c.id.in_(ids))
+            )
+        )
+
+    def _archive_rows(self, project_ids, invoice_ids):
+        from app import db
+        from app.models.archive import invoices_archive, projects_archive
+        from app.models.deadline_reminder import DeadlineReminder
+        from app.models.deleted_record import record_deletions
+        from app.models.invoice import Invoice
+        from app.models.project import Project
+
+        connection = db.session.connection()
+        now = datetime.utcnow()
+        self._copy(connection, Project.__table__, projects_archive, project_ids, {'archived_at': now})
+        if invoice_ids:
+            self._copy(connection, Invoice.__table__, invoices_archive, invoice_ids, {'archived_at': now})
+
+        # 元テーブル側の付随データ（SQLiteの検索索引・送信済みリマインダー）
+        if connection.dialect.name == 'sqlite':
+            for table_name, ids in (('projects', project_ids), ('invoices', invoice_ids)):
+                if ids:
+                    connection.execute(text(f'DELETE FROM {table_name}_fts WHERE rowid = :id'), [{'id': i} for i in ids])
+        connection.execute(delete(DeadlineReminder.__table__).where(DeadlineReminder.project_id.in_(project_ids)))
+        if invoice_ids:
+            connection.execute(delete(Invoice.__table__).where(Invoice.id.in_(invoice_ids)))
+        connection.execute(delete(Project.__table__).where(Project.id.in_(project_ids)))
+        # 差分同期（sync_databases.py）で移行先の元テーブルからも消えるようtombstoneを記録
+        record_deletions(connection, Invoice.__tablename__, invoice_ids)
+        record_deletions(connection, Project.__tablename__, project_ids)
+
+    def restore(self, user_id, project_id):
+        """
+        アーカイブ済み案件を請求書ごと元テーブルへ戻す
+        （updated_at を現在時刻にするため、次回以降のアーカイブ対象からは再び経過日数分外れる）
+
+        Returns:
+            dict | None: projects / invoices（対象が無ければNone）
+        """
+        from app import db
+        from app.models.archive import invoices_archive, projects_archive
+        from app.models.deleted_record import record_deletions
+        from app.models.invoice import Invoice
+        from app.models.project import Project
+        from app.utils.search import write_index
+
+        connection = db.session.connection()
+        found = connection.execute(
+            select(projects_archive.c.id).where(
+                projects_archive.c.id == project_id,
+                projects_archive.c.user_id == user_id
+            ).with_for_update()
+        ).scalar()
+        if found is None:
+            return None
+        invoice_ids = connection.execute(
+            select(invoices_archive.c.id).where(invoices_archive.c.project_id == project_id).with_for_update()
+        ).scalars().all()
+
+        now = datetime.utcnow()
+        self._copy(connection, projects_archive, Project.__table__, [project_id], {'updated_at': now})
+        if invoice_ids:
+            self._copy(connection, invoices_archive, Invoice.__table__, invoice_ids, {'updated_at': now})
+
+        # 検索索引（ORMを経由しないため明示的に書き込む）
+        for model, ids in ((Project, [project_id]), (Invoice, invoice_ids)):
+            if ids:
+                rows = connection.execute(select(model.__table__).where(model.__table__.c.id.in_(ids))).all()
+                write_index(connection, model.__tablename__, rows)
+
+        if invoice_ids:
+            connection.execute(delete(invoices_archive).where(invoices_archive.c.id.in_(invoice_ids)))
+        connection.execute(delete(projects_archive).where(projects_archive.c.id == project_id))
+        record_deletions(connection, invoices_archive.name, invoice_ids)
+        record_deletions(connection, projects_archive.name, [project_id])
+        db.session.commit()
+        return {'projects': 1, 'invoices': len(invoice_ids)}
+
+
+# グローバルアーカイブ
+archiver = Archiver()
+
+
+@click.group('archive', help='案件・請求書のアーカイブ')
+def archive_cli():
+    pass
+
+
+@archive_cli.command('run')
+@click.option('--date', 'run_date', default=None, help='基準日 YYYY-MM-DD（既定: 今日）')
+@click.option('--batch-size', type=int, default=None, help='1トランザクションで移動する案件数')
+@click.option('--dry-run', is_flag=True, help='移動せず対象件数のみ表示')
+def run_command(run_date, batch_size, dry_run):
+    """完了から一定期間が経過した案件・請求書をアーカイブへ移動"""
+    today = datetime.strptime(run_date, '%Y-%m-%d').date() if run_date else date.today()
+    result = archiver.run(today=today, batch_size=batch_size, dry_run=dry_run)
+    click.echo(
+        f"{'対象' if dry_run else '移動'}: 案件{result['projects']}件 / 請求書{result['invoices']}件"
+        f"（{result['batches']}バッチ・基準: {archiver.cutoff(today):%Y-%m-%d}より前）"
+    )
+
+
+@archive_cli.command('restore')
+@click.option('--user-id', type=int, required=True, help='案件の所有ユーザー')
+@click.option('--project-id', type=int, required=True, help='戻す案件')
+def restore_command(user_id, project_id):
+    """アーカイブ済み案件を請求書ごと元テーブルへ戻す"""
+    result = archiver.restore(user_id, project_id)
+    if result is None:
+        raise click.ClickException('アーカイブに該当する案件がありません')
+    click.echo(f"復元: 案件{result['projects']}件 / 請求書{result['invoices']}件")
@@ -0,0 +1,187 @@
+"""
+案件締切・請求書支払期限のiCalendarフィード
+ユーザーごとのトークン付きURLでカレンダーアプリから購読する
+検証子（ETag / Last-Modified）は案件・請求書の最新 updated_at と件数から算出し、
+カレンダーアプリの定期取得は変更がなければフィードを生成せず304で応答する
+"""
+
+import hashlib
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select, true
+
+from app.utils.versioned_cache import VersionedLRUCache
+
+PRODID = '-//InfluBerry//Deadline Calendar//JA'
+UID_DOMAIN = 'influberry.jp'
+
+
+def _escape(value):
+    """TEXT値のエスケープ（RFC 5545 3.3.11）"""
+    return (
+        str(value or '')
+        .replace('\\', '\\\\')
+        .replace(';', '\\;')
+        .replace(',', '\\,')
+        .replace('\r\n', '\\n')
+        .replace('\n', '\\n')
+    )
+
+
+def _fold(line):
+    """75オクテットごとの行折り返し（UTF-8の文字境界で分割）"""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line
+    parts = []
+    current = ''
+    size = 0
+    limit = 75
+    for ch in line:
+        width = len(ch.encode('utf-8'))
+        if size + width > limit:
+            parts.append(current)
+            current = ''
+            size = 0
+            limit = 74  # 継続行は先頭の空白1文字分を除く
+        current += ch
+        size += width
+    parts.append(current)
+    return '\r\n '.join(parts)
+
+
+def _date_value(value):
+    return value.strftime('%Y%m%d')
+
+
+def _utc_stamp(value):
+    return (value or datetime.utcnow()).strftime('%Y%m%dT%H%M%SZ')
+
+
+def _event(uid, day, summary, description, updated_at):
+    """終日イベント"""
+    return [
+        'BEGIN:VEVENT',
+        f'UID:{uid}@{UID_DOMAIN}',
+        f'DTSTAMP:{_utc_stamp(updated_at)}',
+        f'LAST-MODIFIED:{_utc_stamp(updated_at)}',
+        f'DTSTART;VALUE=DATE:{_date_value(day)}',
+        f'DTEND;VALUE=DATE:{_date_value(day + timedelta(days=1))}',
+        f'SUMMARY:{_escape(summary)}',
+        f'DESCRIPTION:{_escape(description)}',
+        'TRANSP:TRANSPARENT',
+        'END:VEVENT'
+    ]
+
+
+def build_calendar(projects, invoices, app_url=''):
+    """
+    iCalendar本文（bytes・CRLF改行）
+
+    Args:
+        projects (list[Project]): 締切日を終日イベントとして出力
+        invoices (list[Invoice]): 支払期限を終日イベントとして出力（キャンセル済みは除外）
+    """
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        f'PRODID:{PRODID}',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        'X-WR-CALNAME:InfluBerry',
+        'X-WR-TIMEZONE:Asia/Tokyo',
+        'REFRESH-INTERVAL;VALUE=DURATION:PT1H',
+        'X-PUBLISHED-TTL:PT1H'
+    ]
+    for project in projects:
+        title = project.project_name or project.company_name
+        suffix = '（完了）' if project.status == 'completed' else ''
+        lines += _event(
+            f'project-{project.id}',
+            project.deadline,
+            f'【締切】{title}{suffix}',
+            f'企業: {project.company_name}\n'
+            f'金額: ¥{int(project.amount or 0):,}\n'
+            f'ステータス: {project.get_status_display()}\n{app_url}',
+            project.updated_at
+        )
+    for invoice in invoices:
+        if invoice.status == 'cancelled':
+            continue
+        suffix = '（入金済）' if invoice.status == 'paid' else ''
+        lines += _event(
+            f'invoice-{invoice.id}',
+            invoice.due_date,
+            f'【支払期限】{invoice.client_company} {invoice.invoice_number}{suffix}',
+            f'請求書番号: {invoice.invoice_number}\n'
+            f'請求金額: ¥{int(invoice.total_amount or 0):,}\n{app_url}',
+            invoice.updated_at
+        )
+    lines.append('END:VCALENDAR')
+    return ('\r\n'.join(_fold(line) for line in lines) + '\r\n').encode('utf-8')
+
+
+class CalendarFeed:
+    """フィードの検証子算出と生成結果のLRUキャッシュ"""
+
+    def __init__(self, max_entries=256):
+        self.app_url = ''
+        self._cache = VersionedLRUCache(max_entries)  # user_id -> (etag, body)
+
+    def init_app(self, app):
+        """Flaskアプリ登録（設定読み込み）"""
+        self._cache.max_entries = app.config['CALENDAR_FEED_CACHE_SIZE']
+        self.app_url = app.config['REMINDER_APP_URL']
+        self._cache.invalidate()
+
+    @staticmethod
+    def validators(user_id):
+        """
+        検証子（1クエリ）: 案件・請求書の最新 updated_at と件数
+        削除は件数の変化でETagに反映される
+
+        Returns:
+            tuple[str, datetime | None]: (ETag, Last-Modified)
+        """
+        from app import db
+        from app.models.invoice import Invoice
+        from app.models.project import Project
+
+        project_stats = select(
+            func.max(Project.updated_at), func.count(Project.id)
+        ).where(Project.user_id == user_id).subquery()
+        invoice_stats = select(
+            func.max(Invoice.updated_at), func.count(Invoice.id)
+        ).where(Invoice.user_id == user_id).subquery()
+        project_latest, project_count, invoice_latest, invoice_count = db.session.execute(
+            select(project_stats, invoice_stats).select_from(project_stats.join(invoice_stats, true()))
+        ).one()
+
+        # SQLiteの集計結果は文字列になる場合があるため正規化
+        latest = [
+            value if isinstance(value, datetime) else datetime.fromisoformat(value)
+            for value in (project_latest, invoice_latest) if value
+        ]
+        last_modified = max(latest) if latest else None
+        source = f'{user_id}:{last_modified}:{project_count}:{invoice_count}'
+        return hashlib.sha256(source.encode('utf-8')).hexdigest()[:32], last_modified
+
+    def render(self, user_id, etag):
+        """フィード本文（同じETagの間はキャッシュから返す）"""
+        return self._cache.get_or_create(user_id, etag, lambda: self._build(user_id))
+
+    def invalidate(self, user_id=None):
+        """キャッシュ破棄（user_id省略時は全件）"""
+        self._cache.invalidate(user_id)
+
+    def _build(self, user_id):
+        from app.models.invoice import Invoice
+        from app.models.project import Project
+
+        projects = Project.query.filter_by(user_id=user_id).order_by(Project.deadline, Project.id).all()
+        invoices = Invoice.query.filter_by(user_id=user_id).order_by(Invoice.due_date, Invoice.id).all()
+        return build_calendar(projects, invoices, self.app_url)
+
+
+# グローバルカレンダーフィード
+calendar_feed = CalendarFeed()
@@ -0,0 +1,100 @@
+"""
+取引先名の前方一致補完
+ユーザーごとの取引先名をソート済み配列としてワーカー内に保持し、二分探索で候補を返す（DBアクセスなし）
+キャッシュは users.clients_version（取引先の追加・更新で加算）と一致する間だけ使用する
+"""
+
+from bisect import bisect_left
+
+from app.models.client import normalize_client_name
+from app.utils.versioned_cache import VersionedLRUCache
+
+# 法人格（先頭の法人格を除いた名前でも前方一致させる）
+LEGAL_ENTITY_PREFIXES = tuple(normalize_client_name(prefix) for prefix in (
+    '株式会社', '有限会社', '合同会社', '合資会社', '合名会社',
+    '一般社団法人', '一般財団法人', '(株)', '(有)', '(同)'
+))
+
+
+class ClientPrefixIndex:
+    """1ユーザー分の前方一致索引（不変・スレッド間で共有可）"""
+
+    def __init__(self, clients):
+        self.clients = clients  # [dict]
+        entries = []
+        for position, client in enumerate(clients):
+            key = client['normalized_name']
+            entries.append((key, position))
+            for prefix in LEGAL_ENTITY_PREFIXES:
+                if key.startswith(prefix) and len(key) > len(prefix):
+                    entries.append((key[len(prefix):], position))
+                    break
+        entries.sort()
+        self.keys = [key for key, _ in entries]
+        self.positions = [position for _, position in entries]
+
+    def search(self, prefix, limit):
+        """前方一致する取引先（照合キー順・重複なし）"""
+        results = []
+        seen = set()
+        index = bisect_left(self.keys, prefix)
+        while index < len(self.keys) and len(results) < limit:
+            if not self.keys[index].startswith(prefix):
+                break
+            position = self.positions[index]
+            if position not in seen:
+                seen.add(position)
+                results.append(self.clients[position])
+            index += 1
+        return results
+
+
+class ClientAutocomplete:
+    """ユーザー別前方一致索引のLRUキャッシュ"""
+
+    def __init__(self, max_entries=1024):
+        self._cache = VersionedLRUCache(max_entries)  # user_id -> (clients_version, ClientPrefixIndex)
+
+    def init_app(self, app):
+        """Flaskアプリ登録（設定読み込み）"""
+        self._cache.max_entries = app.config['CLIENT_AUTOCOMPLETE_CACHE_SIZE']
+        self.invalidate()
+
+    def suggest(self, user, query, limit=10):
+        """
+        取引先名の補完候補
+
+        Returns:
+            list[dict]: id / name / address / contact
+        """
+        prefix = normalize_client_name(query)
+        if not prefix:
+            return []
+        return [
+            {key: client[key] for key in ('id', 'name', 'address', 'contact')}
+            for client in self._get_index(user).search(prefix, limit)
+        ]
+
+    def invalidate(self, user_id=None):
+        """キャッシュ破棄（user_id省略時は全件）"""
+        self._cache.invalidate(user_id)
+
+    def _get_index(self, user):
+        return self._cache.get_or_create(
+            user.id, user.clients_version or 0, lambda: ClientPrefixIndex(self._load(user.id))
+        )
+
+    @staticmethod
+    def _load(user_id):
+        """ユーザーの全取引先（1クエリ）"""
+        from app import db
+        from app.models.client import Client
+
+        rows = db.session.query(
+            Client.id, Client.name, Client.normalized_name, Client.address, Client.contact
+        ).filter(Client.user_id == user_id)
+        return [row._asdict() for row in rows]
+
+
+# グローバル取引先補完
+client_autocomplete = ClientAutocomplete()
@@ -0,0 +1,194 @@
+"""
+ダッシュボード一括取得
+画面表示時に個別に呼ばれていた各エンドポイント（/api/auth/me・/api/user-status・/api/projects/stats・
+/api/users/stats・/api/invoices/stats・/api/plugins/sponsor_management/dashboard）と同じ形のデータを、
+共通の集計クエリから1リクエストで組み立てる
+"""
+
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import and_, case, func
+
+INVOICE_STATUSES = ('draft', 'sent', 'paid', 'overdue', 'cancelled')
+
+
+class DashboardSummary:
+    """
+    セクション単位で必要な集計だけを遅延実行する（同じ集計は1リクエスト内で1回のみ）
+
+    sections と必要な集計:
+        user              -> なし
+        user_status       -> project_totals
+        project_stats     -> project_totals
+        user_stats        -> project_totals
+        invoice_stats     -> invoice_totals
+        sponsor_dashboard -> project_totals / upcoming_deadlines / recent_projects
+    """
+
+    SECTIONS = ('user', 'user_status', 'project_stats', 'user_stats', 'invoice_stats', 'sponsor_dashboard')
+
+    def __init__(self, user, today=None):
+        self.user = user
+        self.today = today or date.today()
+        self._results = {}
+
+    def build(self, sections=None):
+        """指定セクションの辞書（sections省略時は全セクション）"""
+        return {name: getattr(self, f'_section_{name}')() for name in (sections or self.SECTIONS)}
+
+    @classmethod
+    def parse_fields(cls, value):
+        """
+        フィールドマスク（カンマ区切り）の解析
+
+        Raises:
+            ValueError: 未知のセクション名
+        """
+        if not value:
+            return None
+        sections = [name.strip() for name in value.split(',') if name.strip()]
+        unknown = [name for name in sections if name not in cls.SECTIONS]
+        if unknown:
+            raise ValueError(f"不明なフィールドです: {', '.join(unknown)}")
+        return list(dict.fromkeys(sections))
+
+    # --- 共通集計（各1クエリ） ---
+
+    def _once(self, key, loader):
+        if key not in self._results:
+            self._results[key] = loader()
+        return self._results[key]
+
+    def _project_totals(self):
+        from app import db
+        from app.utils.archival import archiver
+
+        def load():
+            month_start = datetime.combine(self.today.replace(day=1), datetime.min.time())
+            # 全期間の集計（アーカイブ済みの案件を含む）
+            source = archiver.project_source(self.user.id)
+            return db.session.query(
+                func.count(source.id).label('total'),
+                func.count(case((source.status == 'proposed', 1))).label('proposed'),
+                func.count(case((source.status == 'contracted', 1))).label('contracted'),
+                func.count(case((source.status == 'completed', 1))).label('completed'),
+                func.coalesce(func.sum(case((source.status == 'completed', source.amount), else_=0)), 0)
+                .label('total_earnings'),
+                func.coalesce(func.sum(source.amount), 0).label('total_potential'),
+                func.count(case((source.created_at >= month_start, 1))).label('this_month')
+            ).filter(source.user_id == self.user.id).one()
+        return self._once('project_totals', load)
+
+    def _invoice_totals(self):
+        from app import db
+        from app.utils.archival import archiver
+
+        def load():
+            source = archiver.invoice_source(self.user.id)
+            month_start = self.today.replace(day=1)
+            next_month = (month_start + timedelta(days=32)).replace(day=1)
+            columns = [func.count(source.id).label('total')]
+            columns += [
+                func.count(case((source.status == status, 1))).label(status)
+                for status in INVOICE_STATUSES
+            ]
+            columns += [
+                func.coalesce(func.sum(case((source.status == 'paid', source.total_amount), else_=0)), 0)
+                .label('total_paid'),
+                func.count(case((and_(source.invoice_date >= month_start, source.invoice_date < next_month), 1)))
+                .label('this_month')
+            ]
+            return db.session.query(*columns).filter(source.user_id == self.user.id).one()
+        return self._once('invoice_totals', load)
+
+    def _upcoming_deadlines(self):
+        from app.models.project import Project
+
+        return self._once('upcoming_deadlines', lambda: Project.query.filter(
+            Project.user_id == self.user.id,
+            Project.status == 'contracted',
+            Project.deadline <= self.today + timedelta(days=7)
+        ).order_by(Project.deadline).all())
+
+    def _recent_projects(self):
+        from app.utils.db_optimizations import ProjectQueryOptimizer
+
+        return self._once(
+            'recent_projects',
+            lambda: ProjectQueryOptimizer.get_recent_projects_optimized(self.user.id, limit=5)
+        )
+
+    # --- セクション（既存エンドポイントと同じ形） ---
+
+    def _section_user(self):
+        return self.user.to_dict()
+
+    def _section_user_status(self):
+        return {
+            'user': self.user.to_dict(),
+            'project_count': self._project_totals().total,
+            'last_activity': self.user.updated_at.isoformat() if self.user.updated_at else None
+        }
+
+    def _section_project_stats(self):
+        totals = self._project_totals()
+        return {
+            'total_projects': totals.total,
+            'projects_by_status': {
+                'proposed': totals.proposed,
+                'contracted': totals.contracted,
+                'completed': totals.completed
+            },
+            'total_earnings': float(totals.total_earnings),
+            'total_potential_earnings': float(totals.total_potential)
+        }
+
+    def _section_user_stats(self):
+        totals = self._project_totals()
+        return {
+            'total_projects': totals.total,
+            'completed_projects': totals.completed,
+            'total_earnings': float(totals.total_earnings)
+        }
+
+    def _section_invoice_stats(self):
+        totals = self._invoice_totals()
+        return {
+            'total_invoices': totals.total,
+            'by_status': {status: getattr(totals, status) for status in INVOICE_STATUSES},
+            'total_paid_amount': float(totals.total_paid),
+            'this_month_invoices': totals.this_month
+        }
+
+    def _section_sponsor_dashboard(self):
+        """スポンサー管理プラグインのダッシュボード（プラグイン無効時はNone）"""
+        from app.plugins.manager import plugin_manager
+        from app.utils.usage_tracker import usage_tracker
+
+        plugin = plugin_manager.get_plugin('sponsor_management')
+        if plugin is None:
+            return None
+        usage_tracker.record(self.user.id, plugin.name, 'dashboard')
+
+        totals = self._project_totals()
+        return {
+            'summary': {
+                'total_projects': totals.total,
+                'active_projects': totals.contracted,
+                'completed_projects': totals.completed,
+                'completion_rate': (totals.completed / totals.total * 100) if totals.total > 0 else 0,
+                'total_revenue': float(totals.total_earnings),
+                'this_month_projects': totals.this_month
+            },
+            'upcoming_deadlines': [
+                {
+                    'id': p.id,
+                    'company_name': p.company_name,
+                    'amount': float(p.amount),
+                    'deadline': p.deadline.isoformat(),
+                    'days_remaining': (p.deadline - self.today).days
+                }
+                for p in self._upcoming_deadlines()
+            ],
+            'recent_projects': [p.to_dict() for p in self._recent_projects()]
+        }
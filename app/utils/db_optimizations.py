@@ -4,29 +4,36 @@
 パフォーマンス向上とクエリ統一化のためのユーティリティ
 """
 
-from sqlalchemy import func
+from sqlalchemy import func, case
 from app.models.project import Project
 from app.models.user import User
 from app import db
+from app.utils.archival import archiver
 
 
 class ProjectQueryOptimizer:
     """Project関連クエリの最適化ヘルパー"""
     
     @staticmethod
-    def get_user_projects_optimized(user_id, status=None, page=1, per_page=10):
+    def get_user_projects_optimized(user_id, status=None, page=1, per_page=10, date_from=None, date_to=None):
         """
         ユーザーのプロジェクト一覧を最適化されたクエリで取得
+        （締切日の範囲がアーカイブ済み範囲にかかる場合のみアーカイブを含める）
         """
-        query = Project.query.filter_by(user_id=user_id)
+        source = archiver.project_source(user_id, date_from, date_to)
+        query = db.session.query(source).filter(source.user_id == user_id)
         
         if status:
-            query = query.filter_by(status=status)
+            query = query.filter(source.status == status)
+        if date_from:
+            query = query.filter(source.deadline >= date_from)
+        if date_to:
+            query = query.filter(source.deadline <= date_to)
         
         # インデックスを活用した並び順指定
         query = query.order_by(
-            Project.deadline.asc(),
-            Project.created_at.desc()
+            source.deadline.asc(),
+            source.created_at.desc()
         )
         
         # ページネーション適用
@@ -39,22 +46,23 @@ class ProjectQueryOptimizer:
     @staticmethod
     def get_user_stats_optimized(user_id):
         """
-        ユーザー統計情報を単一クエリで効率的に取得
+        ユーザー統計情報を単一クエリで効率的に取得（アーカイブ済みの案件を含む）
         """
+        source = archiver.project_source(user_id)
         # 単一クエリで全ての統計を取得
         stats_query = db.session.query(
-            func.count(Project.id).label('total'),
-            func.count(func.nullif(Project.status != 'proposed', True)).label('proposed'),
-            func.count(func.nullif(Project.status != 'contracted', True)).label('contracted'),
-            func.count(func.nullif(Project.status != 'completed', True)).label('completed'),
+            func.count(source.id).label('total'),
+            func.count(func.nullif(source.status != 'proposed', True)).label('proposed'),
+            func.count(func.nullif(source.status != 'contracted', True)).label('contracted'),
+            func.count(func.nullif(source.status != 'completed', True)).label('completed'),
             func.coalesce(func.sum(
-                func.case(
-                    (Project.status == 'completed', Project.amount),
+                case(
+                    (source.status == 'completed', source.amount),
                     else_=0
                 )
             ), 0).label('total_earnings'),
-            func.coalesce(func.sum(Project.amount), 0).label('total_potential')
-        ).filter_by(user_id=user_id).first()
+            func.coalesce(func.sum(source.amount), 0).label('total_potential')
+        ).filter(source.user_id == user_id).first()
         
         return {
             'total_projects': stats_query.total,
@@ -84,8 +92,9 @@ class UserQueryOptimizer:
     @staticmethod
     def get_user_with_stats_optimized(user_id):
         """
-        ユーザー情報と統計を結合クエリで効率的に取得
+        ユーザー情報と統計を結合クエリで効率的に取得（アーカイブ済みの案件を含む）
         """
+        source = archiver.project_source(user_id)
         user_query = db.session.query(
             User.id,
             User.username,
@@ -94,22 +103,22 @@ class UserQueryOptimizer:
             User.plan_type,
             User.is_active,
             User.created_at,
-            func.count(Project.id).label('project_count'),
+            func.count(source.id).label('project_count'),
             func.count(
-                func.case(
-                    (Project.status == 'completed', 1),
+                case(
+                    (source.status == 'completed', 1),
                     else_=None
                 )
             ).label('completed_count'),
             func.coalesce(
                 func.sum(
-                    func.case(
-                        (Project.status == 'completed', Project.amount),
+                    case(
+                        (source.status == 'completed', source.amount),
                         else_=0
                     )
                 ), 0
             ).label('total_earnings')
-        ).outerjoin(Project, User.id == Project.user_id)\
+        ).outerjoin(source, User.id == source.user_id)\
          .filter(User.id == user_id)\
          .group_by(User.id)\
          .first()
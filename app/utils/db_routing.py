@@ -0,0 +1,175 @@
+"""
+読み取りレプリカへのルーティング
+@use_read_replica を付けたGETエンドポイントのクエリをレプリカへ送り、
+本人の書き込み直後（read-your-writes）とレプリカ障害時はプライマリを使う
+リクエスト途中でレプリカが切断・接続不能になった場合は、そのクエリをプライマリで再実行する
+"""
+
+import threading
+import time
+from functools import wraps
+
+from flask import g, has_app_context, has_request_context, request, session
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+REPLICA_BIND_KEY = 'replica'
+PIN_SESSION_KEY = '_db_primary_until'
+
+# 書き込みとみなすリクエスト（Core経由の書き込みはflushを通らないため、成功したこれらのリクエストも固定対象）
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class RoutingSession(Session):
+    """レプリカ利用中のリクエストでは、既定バインドの読み取りをレプリカエンジンへ振り向けるセッション"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        engine = super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+        if bind is None and not self._flushing and has_app_context() and g.get('_db_use_replica'):
+            engines = self._db.engines
+            if engine is engines.get(None) and REPLICA_BIND_KEY in engines:
+                return engines[REPLICA_BIND_KEY]
+        return engine
+
+    def execute(self, *args, **kwargs):
+        """
+        レプリカの切断・接続失敗（handle_errorで検知）時は、レプリカを停止扱いにしてプライマリで1回だけ再実行
+        （ルーティング対象は読み取り専用のGETのため、セッションを巻き戻しても失う書き込みはない）
+        """
+        try:
+            return super().execute(*args, **kwargs)
+        except Exception:
+            if not (has_app_context() and g.get('_db_use_replica') and g.pop('_db_replica_failed', False)):
+                raise
+            g._db_use_replica = False
+            self.rollback()
+            return super().execute(*args, **kwargs)
+
+
+class ReplicaRouter:
+    """レプリカ設定・稼働状態・read-your-writes固定の管理"""
+
+    def __init__(self):
+        self.app = None
+        self.pin_seconds = 5
+        self.retry_seconds = 30
+        self._state = 'unknown'  # unknown / up / down
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+
+    def configure(self, app):
+        """
+        レプリカURLをSQLALCHEMY_BINDSへ追加（db.init_app より前に呼ぶ）
+        """
+        replica_uri = app.config.get('SQLALCHEMY_REPLICA_URI')
+        if replica_uri:
+            if replica_uri.startswith('postgres://'):
+                replica_uri = replica_uri.replace('postgres://', 'postgresql://', 1)
+            binds = dict(app.config.get('SQLALCHEMY_BINDS') or {})
+            binds[REPLICA_BIND_KEY] = replica_uri
+            app.config['SQLALCHEMY_BINDS'] = binds
+
+    def init_app(self, app, db):
+        """db.init_app 後に呼ぶ（書き込み検知・固定Cookie・レプリカ障害検知の登録）"""
+        self.app = app
+        self.pin_seconds = app.config['DB_REPLICA_PIN_SECONDS']
+        self.retry_seconds = app.config['DB_REPLICA_RETRY_SECONDS']
+
+        app.after_request(self._pin_after_write)
+        if not event.contains(RoutingSession, 'after_flush', _mark_write):
+            event.listen(RoutingSession, 'after_flush', _mark_write)
+
+        if not self.enabled:
+            return
+        with app.app_context():
+            engine = db.engines[REPLICA_BIND_KEY]
+        event.listen(engine, 'handle_error', self._on_replica_error)
+
+    @property
+    def enabled(self):
+        return self.app is not None and bool(self.app.config.get('SQLALCHEMY_REPLICA_URI'))
+
+    def should_use_replica(self):
+        """現在のリクエストでレプリカを使うか（固定期間中・障害中はプライマリ）"""
+        if not self.enabled:
+            return False
+        pinned_until = session.get(PIN_SESSION_KEY)
+        if pinned_until and pinned_until > time.time():
+            return False
+        return self._is_available()
+
+    def _is_available(self):
+        """レプリカ稼働判定（障害検知後は retry_seconds 経過まで使わず、経過後に1回だけ接続確認）"""
+        if self._state == 'up':
+            return True
+        now = time.time()
+        if self._state == 'down' and now < self._retry_at:
+            return False
+        with self._lock:
+            if self._state == 'up':
+                return True
+            if self._state == 'down' and now < self._retry_at:
+                return False
+            from app import db
+            try:
+                with db.engines[REPLICA_BIND_KEY].connect():
+                    pass
+            except Exception as e:
+                self._mark_down(e)
+                return False
+            if self._state == 'down':
+                self.app.logger.info('Read replica recovered')
+            self._state = 'up'
+            return True
+
+    def _mark_down(self, error):
+        if self._state != 'down':
+            self.app.logger.warning(f'Read replica unavailable, falling back to primary: {error}')
+        self._state = 'down'
+        self._retry_at = time.time() + self.retry_seconds
+
+    def _on_replica_error(self, context):
+        """レプリカの接続断・接続失敗を検知したら一定時間プライマリへ切り替え（実行中のクエリは再実行させる）"""
+        if context.is_disconnect or context.connection is None:
+            self._mark_down(context.original_exception)
+            if has_app_context():
+                g._db_replica_failed = True
+
+    def _pin_after_write(self, response):
+        """
+        書き込みのあったリクエスト後、一定時間そのユーザーをプライマリへ固定
+        （ORMのflush、またはCore経由で書き込みうる成功した更新系リクエスト）
+        """
+        if not self.enabled:
+            return response
+        wrote = g.get('_db_wrote') or (request.method not in SAFE_METHODS and response.status_code < 400)
+        if wrote:
+            session[PIN_SESSION_KEY] = time.time() + self.pin_seconds
+        return response
+
+
+def _mark_write(session_, flush_context):
+    """ORMのflush（INSERT/UPDATE/DELETE）をリクエスト内で記録"""
+    if has_request_context():
+        g._db_wrote = True
+
+
+def use_read_replica(f):
+    """
+    読み取り専用エンドポイント用デコレータ（@login_required の内側に付ける）
+    レプリカ未設定・本人の書き込み直後・レプリカ障害時はプライマリのまま
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not replica_router.should_use_replica():
+            return f(*args, **kwargs)
+        g._db_use_replica = True
+        try:
+            return f(*args, **kwargs)
+        finally:
+            g._db_use_replica = False
+    return decorated_function
+
+
+# グローバルレプリカルーター
+replica_router = ReplicaRouter()
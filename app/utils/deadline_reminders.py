@@ -0,0 +1,219 @@
+"""
+締切リマインダー
+sponsor_management の deadline_reminders / reminder_days_before 設定に従い、
+締切が近い案件をユーザーごとに1通のダイジェストメールで送信する（`flask reminders send` を定期実行）
+送信記録（deadline_reminders テーブル）で同じ案件・締切日への重複送信を防ぐ
+"""
+
+import smtplib
+from datetime import date, datetime, timedelta
+
+import click
+from flask_mail import Mail, Message
+from sqlalchemy.exc import IntegrityError
+
+PLUGIN_NAME = 'sponsor_management'
+
+# reminder_days_before の上限（sponsor_management の設定検証と同じ）
+MAX_REMINDER_DAYS = 30
+
+USER_CHUNK_SIZE = 500
+
+
+class DeadlineReminderJob:
+    """締切リマインダーの抽出・送信"""
+
+    def __init__(self):
+        self.mail = Mail()
+        self.app = None
+        self.logger = None
+
+    def init_app(self, app):
+        """Flaskアプリ登録（Flask-Mail初期化）"""
+        self.app = app
+        self.logger = app.logger
+        self.mail.init_app(app)
+
+    def find_due(self, today=None):
+        """
+        通知対象の案件（全ユーザー分）
+
+        deadline インデックスで today〜today+MAX_REMINDER_DAYS を1回だけ範囲走査し、
+        送信済み（案件 × 締切日）を除外した後、各ユーザーの設定で絞り込む
+
+        Returns:
+            list[tuple[User, list[Project]]]: user_id順・各ユーザー内は締切日順
+        """
+        from app import db
+        from app.models.deadline_reminder import DeadlineReminder
+        from app.models.project import Project
+        from app.models.user import User
+        from app.utils.plugin_settings import GLOBAL_SETTINGS_KEY, plugin_settings_store
+
+        today = today or date.today()
+        projects = Project.query.outerjoin(
+            DeadlineReminder,
+            db.and_(
+                DeadlineReminder.project_id == Project.id,
+                DeadlineReminder.deadline == Project.deadline
+            )
+        ).filter(
+            Project.deadline >= today,
+            Project.deadline <= today + timedelta(days=MAX_REMINDER_DAYS),
+            Project.status != 'completed',
+            DeadlineReminder.id.is_(None)
+        ).order_by(Project.user_id, Project.deadline, Project.id).all()
+        if not projects:
+            return []
+
+        user_ids = sorted({project.user_id for project in projects})
+        users = {}
+        for start in range(0, len(user_ids), USER_CHUNK_SIZE):
+            chunk = user_ids[start:start + USER_CHUNK_SIZE]
+            users.update(
+                (user.id, user)
+                for user in User.query.filter(User.id.in_(chunk), User.is_active.is_(True))
+            )
+        settings = plugin_settings_store.get_all_for_users(list(users.values()))
+
+        due = {}
+        for project in projects:
+            user = users.get(project.user_id)
+            if user is None:
+                continue
+            user_settings = settings[user.id]
+            plugin_settings = user_settings.get(PLUGIN_NAME, {})
+            if not user_settings.get(GLOBAL_SETTINGS_KEY, {}).get('email_notifications', True):
+                continue
+            if not plugin_settings.get('deadline_reminders', True):
+                continue
+            if (project.deadline - today).days <= plugin_settings.get('reminder_days_before', 3):
+                due.setdefault(user.id, (user, []))[1].append(project)
+        return [due[user_id] for user_id in sorted(due)]
+
+    def run(self, today=None, dry_run=False):
+        """
+        リマインダー送信（SMTP接続は全ユーザーで1本を使い回す）
+
+        送信前に送信記録を確定（commit）して他の実行との重複を防ぎ、送信失敗時は記録を取り消す
+
+        Returns:
+            dict: users / projects（送信済み）・failed（送信失敗ユーザー数）
+        """
+        today = today or date.today()
+        due = self.find_due(today)
+        if dry_run:
+            return {
+                'users': len(due),
+                'projects': sum(len(projects) for _, projects in due),
+                'failed': 0
+            }
+
+        result = {'users': 0, 'projects': 0, 'failed': 0}
+        if not due:
+            return result
+
+        # 送信記録のcommitで読み込み済みの案件が失効するため、先に全メールを組み立てる
+        batches = [
+            (user.id, [(project.id, project.deadline) for project in projects],
+             self.build_message(user, projects, today))
+            for user, projects in due
+        ]
+        with self.mail.connect() as connection:
+            for index, (user_id, keys, message) in enumerate(batches):
+                claims = self._claim(user_id, keys)
+                if claims is None:
+                    continue
+                try:
+                    connection.send(message)
+                except smtplib.SMTPServerDisconnected as e:
+                    # 接続断: 残りは次回実行で送信
+                    self._release(claims)
+                    result['failed'] += len(batches) - index
+                    self.logger.error(f'Deadline reminder aborted (SMTP disconnected): {e}')
+                    break
+                except Exception as e:
+                    self._release(claims)
+                    result['failed'] += 1
+                    self.logger.warning(f'Deadline reminder failed: user={user_id} error={e}')
+                else:
+                    result['users'] += 1
+                    result['projects'] += len(keys)
+        return result
+
+    def build_message(self, user, projects, today):
+        """ダイジェストメール（プレーンテキスト）"""
+        name = user.influencer_name or user.username
+        lines = [f'{name} 様', '', f'締切が近い案件が{len(projects)}件あります。', '']
+        for project in projects:
+            days = (project.deadline - today).days
+            remaining = '本日' if days == 0 else f'あと{days}日'
+            title = project.project_name or project.company_name
+            lines.append(f'・{title}（{project.company_name}）')
+            lines.append(
+                f'  締切: {project.format_deadline()}（{remaining}） / '
+                f'金額: ¥{int(project.amount or 0):,} / ステータス: {project.get_status_display()}'
+            )
+        lines += [
+            '',
+            'リマインダーの設定はプラグイン設定（スポンサー管理）から変更できます。',
+            '',
+            'InfluBerry',
+            self.app.config['REMINDER_APP_URL']
+        ]
+        return Message(
+            subject=f'【InfluBerry】締切が近い案件のお知らせ（{len(projects)}件）',
+            recipients=[user.email],
+            body='\n'.join(lines)
+        )
+
+    @staticmethod
+    def _claim(user_id, keys):
+        """送信記録の確定（keys: [(project_id, deadline)]・他の実行が記録済みならNone）"""
+        from app import db
+        from app.models.deadline_reminder import DeadlineReminder
+
+        claims = [
+            DeadlineReminder(user_id=user_id, project_id=project_id, deadline=deadline)
+            for project_id, deadline in keys
+        ]
+        db.session.add_all(claims)
+        try:
+            db.session.flush()
+            claim_ids = [claim.id for claim in claims]
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return None
+        return claim_ids
+
+    @staticmethod
+    def _release(claim_ids):
+        """送信失敗時の記録取り消し（次回実行で再送）"""
+        from app import db
+        from app.models.deadline_reminder import DeadlineReminder
+
+        DeadlineReminder.query.filter(DeadlineReminder.id.in_(claim_ids)).delete(synchronize_session=False)
+        db.session.commit()
+
+
+# グローバル締切リマインダー
+deadline_reminder_job = DeadlineReminderJob()
+
+
+@click.group('reminders', help='締切リマインダー')
+def reminders_cli():
+    pass
+
+
+@reminders_cli.command('send')
+@click.option('--date', 'run_date', default=None, help='基準日 YYYY-MM-DD（既定: 今日）')
+@click.option('--dry-run', is_flag=True, help='送信せず対象件数のみ表示')
+def send_command(run_date, dry_run):
+    """締切が近い案件のダイジェストメールを送信"""
+    today = datetime.strptime(run_date, '%Y-%m-%d').date() if run_date else date.today()
+    result = deadline_reminder_job.run(today=today, dry_run=dry_run)
+    click.echo(
+        f"{'対象' if dry_run else '送信'}: {result['users']}ユーザー / {result['projects']}件"
+        f"（失敗: {result['failed']}）"
+    )
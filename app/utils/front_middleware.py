@@ -0,0 +1,78 @@
+"""
+フロントWSGIミドルウェア
+旧ドメインリダイレクト・ヘルスチェック・静的ファイル配信を
+Flaskのリクエストコンテキスト生成（Flask-Login・CORS処理含む）より前に応答する
+"""
+
+import json
+from urllib.parse import quote
+
+
+class FrontMiddleware:
+    """
+    Flaskアプリ前段のWSGIミドルウェア
+    アプリ処理が不要なリクエストを短絡応答し、それ以外はFlaskへ委譲
+    """
+
+    HEALTH_PATH = '/health'
+
+    def __init__(self, wsgi_app, static_manifest=None, legacy_redirects=None):
+        self.wsgi_app = wsgi_app
+        self.static_manifest = static_manifest
+        # 旧ホスト → 新ホスト
+        self.legacy_redirects = dict(legacy_redirects or {})
+        self._health_body = json.dumps({
+            'status': 'ok',
+            'message': 'InfluBerry v2 API is running'
+        }).encode('utf-8')
+
+    def __call__(self, environ, start_response):
+        # 旧ドメイン → 新ドメイン 301リダイレクト（全リクエスト対象）
+        new_host = self.legacy_redirects.get(environ.get('HTTP_HOST'))
+        if new_host:
+            return self._redirect(environ, start_response, new_host)
+
+        if environ.get('REQUEST_METHOD') in ('GET', 'HEAD'):
+            path = environ.get('PATH_INFO', '')
+
+            if path == self.HEALTH_PATH:
+                return self._health(environ, start_response)
+
+            if self.static_manifest is not None:
+                asset = self.static_manifest.get(path)
+                if asset is not None:
+                    status, headers, body = self.static_manifest.build_response(asset, environ)
+                    start_response(status, headers)
+                    return body
+
+        return self.wsgi_app(environ, start_response)
+
+    def _redirect(self, environ, start_response, new_host):
+        """旧ドメインからの301リダイレクト応答"""
+        scheme = environ.get('HTTP_X_FORWARDED_PROTO') or environ.get('wsgi.url_scheme', 'http')
+        path = quote(
+            (environ.get('SCRIPT_NAME', '') + environ.get('PATH_INFO', '')).encode('latin-1'),
+            safe="/;=,~!$&'()*+:@-._"
+        )
+        location = f"{scheme.split(',')[0].strip()}://{new_host}{path}"
+        query_string = environ.get('QUERY_STRING')
+        if query_string:
+            location += '?' + query_string
+
+        start_response('301 Moved Permanently', [
+            ('Location', location),
+            ('Content-Type', 'text/plain; charset=utf-8'),
+            ('Content-Length', '0'),
+        ])
+        return []
+
+    def _health(self, environ, start_response):
+        """ヘルスチェック応答（DB・認証処理なし）"""
+        start_response('200 OK', [
+            ('Content-Type', 'application/json'),
+            ('Content-Length', str(len(self._health_body))),
+            ('Cache-Control', 'no-store'),
+        ])
+        if environ.get('REQUEST_METHOD') == 'HEAD':
+            return []
+        return [self._health_body]
@@ -0,0 +1,358 @@
+"""
+請求書PDFの生成・キャッシュ
+- 描画は app.utils.pdf（純Python）で行い、ワーカー内の専用スレッドでバックグラウンド実行
+- 生成結果は 請求書ID + updated_at をキーにファイルへ保存（複数ワーカーで共有）し、ETagで再ダウンロードを304にする
+- 月次一括出力はキャッシュにない分をプロセスプールで並列生成してZIPにまとめる
+"""
+
+import io
+import os
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import date, datetime
+from decimal import Decimal
+from multiprocessing import get_context
+
+from app.utils.pdf import A4_HEIGHT, A4_WIDTH, PDFCanvas, wrap_text
+
+# レイアウト変更時に上げる（既存キャッシュ・ETagを無効化）
+RENDER_VERSION = 1
+
+MARGIN = 50
+BOTTOM = A4_HEIGHT - 60
+
+
+def invoice_render_data(invoice):
+    """
+    描画に必要な値をプリミティブのdictで取得（スレッド・プロセスへ渡せるようORMから切り離す）
+    """
+    def iso(value):
+        return value.isoformat() if value else None
+
+    def amount(value):
+        return str(value) if value is not None else '0'
+
+    return {
+        'id': invoice.id,
+        'invoice_number': invoice.invoice_number,
+        'invoice_date': iso(invoice.invoice_date),
+        'due_date': iso(invoice.due_date),
+        'client_company': invoice.client_company,
+        'client_address': invoice.client_address,
+        'client_contact': invoice.client_contact,
+        'influencer_name': invoice.influencer_name,
+        'influencer_address': invoice.influencer_address,
+        'influencer_email': invoice.influencer_email,
+        'project_name': invoice.project_name,
+        'description': invoice.description,
+        'notes': invoice.notes,
+        'subtotal': amount(invoice.subtotal),
+        'tax_rate': amount(invoice.tax_rate),
+        'tax_amount': amount(invoice.tax_amount),
+        'total_amount': amount(invoice.total_amount),
+        'payment_method': invoice.payment_method,
+        'updated_at': iso(invoice.updated_at)
+    }
+
+
+def cache_version(data):
+    """キャッシュキーの版（updated_at + 描画バージョン）"""
+    updated_at = datetime.fromisoformat(data['updated_at']) if data['updated_at'] else datetime.min
+    return f"{updated_at.strftime('%Y%m%d%H%M%S%f')}-v{RENDER_VERSION}"
+
+
+def etag_for(data):
+    return f"invoice-{data['id']}-{cache_version(data)}"
+
+
+def _yen(value):
+    return f'¥{Decimal(value):,.0f}'
+
+
+def _date_ja(value):
+    if not value:
+        return ''
+    return date.fromisoformat(value).strftime('%Y年%m月%d日')
+
+
+def render_invoice_pdf(data):
+    """
+    請求書PDFを描画（プロセスプールから呼ぶためモジュール関数・引数はdict）
+
+    Returns:
+        bytes: PDF
+    """
+    canvas = PDFCanvas(title=f"請求書 {data['invoice_number'] or ''}")
+    right = A4_WIDTH - MARGIN
+
+    canvas.text(A4_WIDTH / 2, 70, '請求書', size=24, align='center')
+
+    # 請求書番号・日付（右上）
+    y = 110
+    for label, value in (('請求書番号', data['invoice_number']),
+                         ('請求日', _date_ja(data['invoice_date'])),
+                         ('お支払期限', _date_ja(data['due_date']))):
+        canvas.text(right - 150, y, label, size=9)
+        canvas.text(right, y, value, size=9, align='right')
+        y += 14
+
+    # 請求先（左）
+    y = 160
+    canvas.text(MARGIN, y, f"{data['client_company'] or ''} 御中", size=14)
+    canvas.line(MARGIN, y + 6, MARGIN + 260, y + 6)
+    y += 22
+    for line in wrap_text(data['client_address'], 9, 260):
+        canvas.text(MARGIN, y, line, size=9)
+        y += 12
+    if data['client_contact']:
+        canvas.text(MARGIN, y, f"{data['client_contact']} 様", size=9)
+
+    # 請求元（右）
+    y = 180
+    canvas.text(right - 200, y, data['influencer_name'], size=11)
+    y += 16
+    for line in wrap_text(data['influencer_address'], 9, 200):
+        canvas.text(right - 200, y, line, size=9)
+        y += 12
+    if data['influencer_email']:
+        canvas.text(right - 200, y, data['influencer_email'], size=9)
+
+    # ご請求金額
+    y = 260
+    canvas.text(MARGIN, y, '下記の通りご請求申し上げます。', size=10)
+    canvas.rect(MARGIN, y + 12, 280, 34, fill_gray=0.93)
+    canvas.text(MARGIN + 10, y + 35, 'ご請求金額（税込）', size=11)
+    canvas.text(MARGIN + 270, y + 36, _yen(data['total_amount']), size=16, align='right')
+
+    # 明細
+    y = 340
+    canvas.rect(MARGIN, y, right - MARGIN, 20, fill_gray=0.85)
+    canvas.text(MARGIN + 8, y + 14, '内容', size=10)
+    canvas.text(right - 8, y + 14, '金額', size=10, align='right')
+    y += 20
+
+    item_lines = []
+    if data['project_name']:
+        item_lines.append(data['project_name'])
+    item_lines.extend(wrap_text(data['description'], 9, right - MARGIN - 140))
+    row_top = y
+    for index, line in enumerate(item_lines):
+        if y + 16 > BOTTOM:
+            canvas.show_page()
+            y = 60
+        canvas.text(MARGIN + 8, y + 13, line, size=10 if index == 0 and data['project_name'] else 9)
+        y += 14
+    canvas.text(right - 8, row_top + 13, _yen(data['subtotal']), size=10, align='right')
+    y += 6
+    canvas.line(MARGIN, y, right, y)
+
+    # 小計・消費税・合計
+    if y + 70 > BOTTOM:
+        canvas.show_page()
+        y = 60
+    y += 18
+    tax_rate = f"{Decimal(data['tax_rate']):g}"
+    for label, value, size in (('小計', data['subtotal'], 10),
+                               (f'消費税（{tax_rate}%）', data['tax_amount'], 10),
+                               ('合計', data['total_amount'], 12)):
+        canvas.text(right - 200, y, label, size=size)
+        canvas.text(right - 8, y, _yen(value), size=size, align='right')
+        y += 18
+    canvas.line(right - 200, y - 12, right, y - 12)
+
+    # お支払方法・備考
+    y += 10
+    sections = []
+    if data['payment_method']:
+        sections.append(('お支払方法', [data['payment_method']]))
+    if data['notes']:
+        sections.append(('備考', wrap_text(data['notes'], 9, right - MARGIN)))
+    for title, lines in sections:
+        if y + 30 > BOTTOM:
+            canvas.show_page()
+            y = 60
+        canvas.text(MARGIN, y, title, size=10)
+        y += 14
+        for line in lines:
+            if y + 12 > BOTTOM:
+                canvas.show_page()
+                y = 60
+            canvas.text(MARGIN, y, line, size=9)
+            y += 12
+        y += 10
+
+    return canvas.to_bytes()
+
+
+class InvoicePDFCache:
+    """生成済みPDFのファイルキャッシュ（{請求書ID}/{版}.pdf、旧版は保存時に削除）"""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _path(self, invoice_id, version):
+        return os.path.join(self.directory, str(invoice_id), f'{version}.pdf')
+
+    def get(self, invoice_id, version):
+        try:
+            with open(self._path(invoice_id, version), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, invoice_id, version, pdf):
+        """一時ファイル経由で置き換え（読み込み中の他ワーカーに途中状態を見せない）"""
+        path = self._path(invoice_id, version)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(pdf)
+        os.replace(temp_path, path)
+        self.discard(invoice_id, keep=os.path.basename(path))
+
+    def discard(self, invoice_id, keep=None):
+        """請求書の旧版（keep以外、keep=Noneなら全版）を削除"""
+        directory = os.path.join(self.directory, str(invoice_id))
+        try:
+            names = os.listdir(directory)
+        except FileNotFoundError:
+            return
+        for name in names:
+            if name.endswith('.pdf') and name != keep:
+                try:
+                    os.remove(os.path.join(directory, name))
+                except FileNotFoundError:
+                    pass
+
+
+class InvoicePDFRenderer:
+    """請求書PDFのバックグラウンド生成・キャッシュ・月次一括出力"""
+
+    def __init__(self):
+        self.cache = InvoicePDFCache('instance/invoice_pdfs')
+        self.workers = 2
+        self.wait_seconds = 3.0
+        self.process_workers = 2
+        self.archive_max_invoices = 500
+        self.logger = None
+        self._executor = None
+        self._executor_pid = None
+        self._process_pool = None
+        self._process_pool_pid = None
+        self._pending = {}  # (請求書ID, 版) -> Future
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """Flaskアプリ登録（設定読み込み）"""
+        self.cache = InvoicePDFCache(
+            app.config['INVOICE_PDF_CACHE_DIR'] or os.path.join(app.instance_path, 'invoice_pdfs')
+        )
+        self.workers = app.config['INVOICE_PDF_RENDER_WORKERS']
+        self.wait_seconds = app.config['INVOICE_PDF_WAIT_SECONDS']
+        self.process_workers = app.config['INVOICE_PDF_PROCESS_WORKERS']
+        self.archive_max_invoices = app.config['INVOICE_PDF_ARCHIVE_MAX_INVOICES']
+        self.logger = app.logger
+
+    def get_cached(self, data):
+        return self.cache.get(data['id'], cache_version(data))
+
+    def submit(self, data):
+        """
+        バックグラウンド生成を予約（同じ版の生成中は同じFutureを返す）
+
+        Returns:
+            Future: 完了時にPDFのbytes
+        """
+        key = (data['id'], cache_version(data))
+        with self._lock:
+            future = self._pending.get(key)
+            if future is None:
+                future = self._get_executor().submit(self._render_and_store, data)
+                self._pending[key] = future
+                future.add_done_callback(lambda _: self._forget(key))
+        return future
+
+    def get(self, data):
+        """
+        キャッシュ済みならそのまま、なければ生成を予約して wait_seconds まで待つ
+
+        Returns:
+            bytes | None: PDF（生成が間に合わない場合はNone、生成は継続）
+        """
+        pdf = self.get_cached(data)
+        if pdf is not None:
+            return pdf
+        future = self.submit(data)
+        try:
+            return future.result(timeout=self.wait_seconds)
+        except FutureTimeoutError:
+            return None
+
+    def discard(self, invoice_id):
+        """請求書削除時のキャッシュ削除"""
+        self.cache.discard(invoice_id)
+
+    def build_archive(self, datas):
+        """
+        複数請求書のPDFをZIPにまとめる（キャッシュにない分はプロセスプールで並列生成）
+
+        Returns:
+            bytes: ZIP
+        """
+        pdfs = {data['id']: self.get_cached(data) for data in datas}
+        missing = [data for data in datas if pdfs[data['id']] is None]
+        if missing:
+            if self.process_workers > 0 and len(missing) > 1:
+                chunksize = max(1, len(missing) // (self.process_workers * 4))
+                rendered = list(self._get_process_pool().map(render_invoice_pdf, missing, chunksize=chunksize))
+            else:
+                rendered = [render_invoice_pdf(data) for data in missing]
+            for data, pdf in zip(missing, rendered):
+                pdfs[data['id']] = pdf
+                self.cache.put(data['id'], cache_version(data), pdf)
+
+        buffer = io.BytesIO()
+        # PDFはストリーム圧縮済みのため再圧縮しない
+        with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_STORED) as archive:
+            for data in datas:
+                name = f"{data['invoice_number'] or data['id']}.pdf"
+                archive.writestr(name, pdfs[data['id']])
+        return buffer.getvalue()
+
+    def _render_and_store(self, data):
+        pdf = render_invoice_pdf(data)
+        self.cache.put(data['id'], cache_version(data), pdf)
+        return pdf
+
+    def _forget(self, key):
+        with self._lock:
+            self._pending.pop(key, None)
+
+    def _get_executor(self):
+        """fork後のワーカーごとにスレッドプールを作成（_lock保持中に呼ぶ）"""
+        pid = os.getpid()
+        if self._executor_pid != pid:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='invoice-pdf')
+            self._executor_pid = pid
+            self._pending = {}
+        return self._executor
+
+    def _get_process_pool(self):
+        """
+        一括出力用プロセスプール（ワーカーごとに初回利用時に作成）
+        スレッドを持つプロセスからのforkを避けるためspawnで起動する
+        """
+        pid = os.getpid()
+        with self._lock:
+            if self._process_pool_pid != pid:
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.process_workers, mp_context=get_context('spawn')
+                )
+                self._process_pool_pid = pid
+            return self._process_pool
+
+
+# グローバル請求書PDFレンダラー
+invoice_pdf_renderer = InvoicePDFRenderer()
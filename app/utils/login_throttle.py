@@ -0,0 +1,205 @@
+"""
+ログイン失敗回数によるスロットリング
+アカウント単位・IP単位の失敗回数から指数バックオフの待機時間を決め、
+パスワードハッシュ検証・DBアクセスの前にO(1)で拒否する
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class MemoryThrottleStore:
+    """
+    ワーカー内メモリの失敗カウンター（開発・単一ワーカー用）
+
+    key -> [failures, blocked_until, expires_at]
+    """
+
+    def __init__(self, max_entries=100000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, now):
+        """(失敗回数, ブロック解除時刻) 取得"""
+        entry = self._entries.get(key)
+        if entry is None or entry[2] <= now:
+            return 0, 0.0
+        return entry[0], entry[1]
+
+    def incr(self, key, now, window):
+        """失敗回数加算（window秒間失敗がなければリセット）"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[2] <= now:
+                entry = [0, 0.0, 0.0]
+                self._entries[key] = entry
+            entry[0] += 1
+            entry[2] = now + window
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return entry[0]
+
+    def block(self, key, until):
+        """ブロック解除時刻設定"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry[1] = until
+
+    def reset(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def incr_metric(self, name):
+        with self._lock:
+            self._metrics[name] = self._metrics.get(name, 0) + 1
+
+    def get_metrics(self):
+        with self._lock:
+            return dict(self._metrics)
+
+
+class RedisThrottleStore:
+    """Redis共有の失敗カウンター・メトリクス（複数ワーカー・複数インスタンス用）"""
+
+    def __init__(self, url, prefix='login_throttle:'):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError(
+                'LOGIN_THROTTLE_STORAGE_URI に redis:// を指定する場合は redis パッケージが必要です'
+            ) from e
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key, now):
+        failures, blocked_until = self.client.hmget(self.prefix + key, 'failures', 'blocked_until')
+        return int(failures or 0), float(blocked_until or 0)
+
+    def incr(self, key, now, window):
+        pipe = self.client.pipeline()
+        pipe.hincrby(self.prefix + key, 'failures', 1)
+        pipe.expire(self.prefix + key, int(window))
+        failures, _ = pipe.execute()
+        return failures
+
+    def block(self, key, until):
+        self.client.hset(self.prefix + key, 'blocked_until', until)
+
+    def reset(self, key):
+        self.client.delete(self.prefix + key)
+
+    def incr_metric(self, name):
+        self.client.hincrby(self.prefix + 'metrics', name, 1)
+
+    def get_metrics(self):
+        return {name.decode(): int(value) for name, value in self.client.hgetall(self.prefix + 'metrics').items()}
+
+
+def create_store(uri):
+    """ストレージURIからストア作成（memory:// / redis://）"""
+    if uri.startswith('memory://'):
+        return MemoryThrottleStore()
+    if uri.startswith(('redis://', 'rediss://')):
+        return RedisThrottleStore(uri)
+    raise ValueError(f'未対応のLOGIN_THROTTLE_STORAGE_URIです: {uri}')
+
+
+class LoginThrottle:
+    """アカウント・IP単位のログイン失敗スロットリング"""
+
+    def __init__(self):
+        self.enabled = True
+        self.store = MemoryThrottleStore()
+        self.account_free_attempts = 5
+        self.ip_free_attempts = 20
+        self.base_delay = 1.0
+        self.max_delay = 900.0
+        self.window = 3600
+        self.logger = None
+
+    def init_app(self, app):
+        """Flaskアプリ登録（設定読み込み・ストア作成）"""
+        self.enabled = app.config['LOGIN_THROTTLE_ENABLED']
+        self.store = create_store(app.config['LOGIN_THROTTLE_STORAGE_URI'])
+        self.account_free_attempts = app.config['LOGIN_THROTTLE_ACCOUNT_ATTEMPTS']
+        self.ip_free_attempts = app.config['LOGIN_THROTTLE_IP_ATTEMPTS']
+        self.base_delay = app.config['LOGIN_THROTTLE_BASE_DELAY_SECONDS']
+        self.max_delay = app.config['LOGIN_THROTTLE_MAX_DELAY_SECONDS']
+        self.window = app.config['LOGIN_THROTTLE_WINDOW_SECONDS']
+        self.logger = app.logger
+        if self.enabled and isinstance(self.store, MemoryThrottleStore) and not (app.debug or app.testing):
+            app.logger.warning(
+                'LOGIN_THROTTLE_STORAGE_URI=memory:// はワーカー単位のカウンターです。'
+                '複数ワーカーでは redis:// を指定してください'
+            )
+
+    @staticmethod
+    def _keys(email, ip):
+        return 'acct:' + str(email or '').strip().lower(), 'ip:' + str(ip or '')
+
+    def check(self, email, ip):
+        """
+        ログイン試行前チェック（ハッシュ検証・DBアクセスなし）
+
+        Returns:
+            int: 再試行までの秒数（0なら試行可）
+        """
+        if not self.enabled:
+            return 0
+        now = time.time()
+        account_key, ip_key = self._keys(email, ip)
+        for key, metric in ((ip_key, 'rejected_ip'), (account_key, 'rejected_account')):
+            _, blocked_until = self.store.get(key, now)
+            if blocked_until > now:
+                self._count(metric)
+                return max(1, int(blocked_until - now + 0.999))
+        return 0
+
+    def record_failure(self, email, ip):
+        """ログイン失敗記録（閾値超過後は失敗ごとに待機時間を倍増）"""
+        if not self.enabled:
+            return
+        now = time.time()
+        account_key, ip_key = self._keys(email, ip)
+        self._count('failures_recorded')
+        for key, free_attempts in ((account_key, self.account_free_attempts), (ip_key, self.ip_free_attempts)):
+            failures = self.store.incr(key, now, self.window)
+            if failures >= free_attempts:
+                delay = min(self.max_delay, self.base_delay * 2 ** (failures - free_attempts))
+                self.store.block(key, now + delay)
+                self._count('blocks_started')
+                if self.logger is not None:
+                    self.logger.info(f'Login throttled: {key.split(":", 1)[0]} failures={failures} delay={delay:.0f}s')
+
+    def record_success(self, email, ip):
+        """ログイン成功時はアカウントの失敗回数のみリセット（IPは共有の可能性があるため維持）"""
+        if not self.enabled:
+            return
+        account_key, _ = self._keys(email, ip)
+        self.store.reset(account_key)
+
+    def get_metrics(self):
+        """拒否件数などのメトリクス（カウンターと同じストアに保持・redisなら全ワーカー合算）"""
+        metrics = dict.fromkeys(('rejected_account', 'rejected_ip', 'failures_recorded', 'blocks_started'), 0)
+        metrics.update(self.store.get_metrics())
+        return metrics
+
+    def _count(self, metric):
+        self.store.incr_metric(metric)
+
+
+def get_client_ip(request):
+    """
+    クライアントIP（ProxyFixで信頼できるプロキシが付加した X-Forwarded-For から解決済み）
+    X-Forwarded-For の先頭はクライアントが任意に指定できるため使わない
+    """
+    return request.remote_addr
+
+
+# グローバルログインスロットル
+login_throttle = LoginThrottle()
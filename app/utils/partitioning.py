@@ -0,0 +1,244 @@
+"""
+請求書テーブルの年単位レンジパーティション（PostgreSQLのみ・SQLiteは従来の単一テーブル）
+invoices を invoice_date の年ごとのパーティション invoices_y<年> に分割し、請求日で範囲を絞る
+クエリ（今月の件数・月次一括出力・期間指定の一覧）が該当年のパーティションだけを読むようにする
+
+- 範囲外の請求日（パーティション未作成の年）は invoices_default に入る
+- `flask partitions ensure` で今年から INVOICE_PARTITION_YEARS_AHEAD 年先までを作成し、
+  invoices_default に入った年も切り出す（定期実行）
+- 主キーは (id, invoice_date)。分割キーを含まない一意制約は張れないため、
+  請求書番号の一意性は invoice_numbers（トリガーで同期）で保証する
+- 既存DBの変換はマイグレーション f6d3b9a2c457（変換SQLを固定して保持）で行い、
+  このモジュールは create_all 時の変換と `flask partitions ensure` に使う
+"""
+
+from datetime import date
+
+import click
+from sqlalchemy import event, text
+
+PARTITIONED_TABLE = 'invoices'
+PARTITION_COLUMN = 'invoice_date'
+DEFAULT_PARTITION = 'invoices_default'
+NUMBER_REGISTRY = 'invoice_numbers'
+NUMBER_COLUMN = 'invoice_number'
+DEFAULT_YEARS_AHEAD = 2
+
+
+def partition_name(year):
+    return f'{PARTITIONED_TABLE}_y{year}'
+
+
+def is_managed_table(name):
+    """パーティション・番号台帳（モデル定義外でこのモジュールが管理するテーブル）"""
+    return name == NUMBER_REGISTRY or name.startswith(f'{PARTITIONED_TABLE}_y') or name == DEFAULT_PARTITION
+
+
+def is_managed_index(name):
+    """パーティション化で一意でなくなる請求書番号の索引（一意性は invoice_numbers で保証）"""
+    return name == f'ix_{PARTITIONED_TABLE}_{NUMBER_COLUMN}'
+
+
+def is_partitioned(connection, table_name=PARTITIONED_TABLE):
+    if connection.dialect.name != 'postgresql':
+        return False
+    return connection.execute(
+        text('SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:name))'),
+        {'name': table_name}
+    ).scalar()
+
+
+def _table_definition(connection, table_name):
+    """索引（主キー以外）・外部キー・idシーケンス"""
+    indexes = connection.execute(text(
+        'SELECT pg_get_indexdef(ix.indexrelid), ix.indisunique FROM pg_index ix '
+        'WHERE ix.indrelid = to_regclass(:name) AND NOT ix.indisprimary'
+    ), {'name': table_name}).all()
+    foreign_keys = connection.execute(text(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = to_regclass(:name) AND contype = 'f'"
+    ), {'name': table_name}).all()
+    sequence = connection.execute(
+        text("SELECT pg_get_serial_sequence(:name, 'id')"), {'name': table_name}
+    ).scalar()
+    return indexes, foreign_keys, sequence
+
+
+def _index_columns(definition):
+    return definition.split(' USING ', 1)[1]
+
+
+def _recreate(connection, table_name, indexes, foreign_keys, sequence):
+    for name, definition in foreign_keys:
+        connection.execute(text(f'ALTER TABLE {table_name} ADD CONSTRAINT {name} {definition}'))
+    for definition, _ in indexes:
+        connection.execute(text(definition))
+    if sequence:
+        connection.execute(text(f'ALTER SEQUENCE {sequence} OWNED BY {table_name}.id'))
+
+
+def _create_partition(connection, year):
+    """
+    年パーティションの作成（invoices_default に該当年の行があれば移してから接続）
+
+    Returns:
+        int: invoices_default から移した行数
+    """
+    name = partition_name(year)
+    start, end = date(year, 1, 1).isoformat(), date(year + 1, 1, 1).isoformat()
+    bounds = f"FOR VALUES FROM ('{start}') TO ('{end}')"
+    in_range = f"{PARTITION_COLUMN} >= '{start}' AND {PARTITION_COLUMN} < '{end}'"
+
+    # 既定パーティションへの書き込みを止めてから確認（確認後に入った行で接続が失敗しないように）
+    connection.execute(text(f'LOCK TABLE {DEFAULT_PARTITION} IN EXCLUSIVE MODE'))
+    if not connection.execute(text(f'SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE {in_range})')).scalar():
+        connection.execute(text(f'CREATE TABLE {name} PARTITION OF {PARTITIONED_TABLE} {bounds}'))
+        return 0
+
+    connection.execute(text(
+        f'CREATE TABLE {name} (LIKE {PARTITIONED_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+    ))
+    moved = connection.execute(text(
+        f'WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE {in_range} RETURNING *) '
+        f'INSERT INTO {name} SELECT * FROM moved'
+    )).rowcount
+    connection.execute(text(f'ALTER TABLE {PARTITIONED_TABLE} ATTACH PARTITION {name} {bounds}'))
+    # 既定パーティションからの削除で台帳から外れた番号を戻す（接続前の挿入はトリガー対象外）
+    connection.execute(text(
+        f'INSERT INTO {NUMBER_REGISTRY} ({NUMBER_COLUMN}) SELECT {NUMBER_COLUMN} FROM {name} '
+        f'ON CONFLICT DO NOTHING'
+    ))
+    return moved
+
+
+def _create_number_registry(connection):
+    connection.execute(text(
+        f'CREATE TABLE {NUMBER_REGISTRY} ({NUMBER_COLUMN} VARCHAR(50) PRIMARY KEY)'
+    ))
+    connection.execute(text(
+        f'INSERT INTO {NUMBER_REGISTRY} ({NUMBER_COLUMN}) SELECT {NUMBER_COLUMN} FROM {PARTITIONED_TABLE}'
+    ))
+    connection.execute(text(f"""
+        CREATE OR REPLACE FUNCTION {NUMBER_REGISTRY}_sync() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('DELETE', 'UPDATE') THEN
+                DELETE FROM {NUMBER_REGISTRY} WHERE {NUMBER_COLUMN} = OLD.{NUMBER_COLUMN};
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO {NUMBER_REGISTRY} ({NUMBER_COLUMN}) VALUES (NEW.{NUMBER_COLUMN});
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """))
+    # パーティション間を移動するUPDATEはDELETE + INSERTとして発火する
+    connection.execute(text(
+        f'CREATE TRIGGER {NUMBER_REGISTRY}_sync AFTER INSERT OR DELETE OR UPDATE OF {NUMBER_COLUMN} '
+        f'ON {PARTITIONED_TABLE} FOR EACH ROW EXECUTE FUNCTION {NUMBER_REGISTRY}_sync()'
+    ))
+
+
+def partition_invoices(connection, years_ahead=DEFAULT_YEARS_AHEAD, today=None):
+    """
+    invoices をパーティションテーブルへ変換（既存行は請求日の年のパーティションへ移す）
+
+    Returns:
+        bool: 変換した場合True（PostgreSQL以外・変換済みなら何もしない）
+    """
+    if connection.dialect.name != 'postgresql' or is_partitioned(connection):
+        return False
+
+    today = today or date.today()
+    indexes, foreign_keys, sequence = _table_definition(connection, PARTITIONED_TABLE)
+    years = set(connection.execute(text(
+        f'SELECT DISTINCT CAST(EXTRACT(YEAR FROM {PARTITION_COLUMN}) AS INTEGER) FROM {PARTITIONED_TABLE}'
+    )).scalars())
+    years |= set(range(today.year, today.year + years_ahead + 1))
+
+    if sequence:
+        connection.execute(text(f'ALTER SEQUENCE {sequence} OWNED BY NONE'))
+    connection.execute(text(f'ALTER TABLE {PARTITIONED_TABLE} RENAME TO {PARTITIONED_TABLE}_unpartitioned'))
+    connection.execute(text(
+        f'CREATE TABLE {PARTITIONED_TABLE} (LIKE {PARTITIONED_TABLE}_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+        f'PARTITION BY RANGE ({PARTITION_COLUMN})'
+    ))
+    connection.execute(text(f'CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {PARTITIONED_TABLE} DEFAULT'))
+    for year in sorted(years):
+        _create_partition(connection, year)
+
+    # 索引は行を移した後に作成（名前は旧テーブルの削除で空く）
+    connection.execute(text(f'INSERT INTO {PARTITIONED_TABLE} SELECT * FROM {PARTITIONED_TABLE}_unpartitioned'))
+    connection.execute(text(f'DROP TABLE {PARTITIONED_TABLE}_unpartitioned'))
+    connection.execute(text(
+        f'ALTER TABLE {PARTITIONED_TABLE} ADD CONSTRAINT {PARTITIONED_TABLE}_pkey PRIMARY KEY (id, {PARTITION_COLUMN})'
+    ))
+    indexes = [
+        (definition.replace('CREATE UNIQUE INDEX', 'CREATE INDEX', 1), False)
+        if unique and PARTITION_COLUMN not in _index_columns(definition) else (definition, unique)
+        for definition, unique in indexes
+    ]
+    _recreate(connection, PARTITIONED_TABLE, indexes, foreign_keys, sequence)
+    _create_number_registry(connection)
+    return True
+
+
+def ensure_partitions(connection, years_ahead=DEFAULT_YEARS_AHEAD, today=None):
+    """
+    今年から years_ahead 年先までと、invoices_default に入った年のパーティションを作成
+
+    Returns:
+        list[tuple[str, int]]: 作成したパーティションと invoices_default から移した行数
+    """
+    if not is_partitioned(connection):
+        return []
+
+    today = today or date.today()
+    existing = set(connection.execute(text(
+        'SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid '
+        'WHERE i.inhparent = to_regclass(:name)'
+    ), {'name': PARTITIONED_TABLE}).scalars())
+    years = set(range(today.year, today.year + years_ahead + 1))
+    years |= set(connection.execute(text(
+        f'SELECT DISTINCT CAST(EXTRACT(YEAR FROM {PARTITION_COLUMN}) AS INTEGER) FROM {DEFAULT_PARTITION}'
+    )).scalars())
+
+    created = []
+    for year in sorted(years):
+        if partition_name(year) not in existing:
+            created.append((partition_name(year), _create_partition(connection, year)))
+    return created
+
+
+def _partition_after_create(target, connection, **kw):
+    partition_invoices(connection)
+
+
+def register_invoice_partitioning(model):
+    """create_all（PostgreSQL）で作成した請求書テーブルもパーティション化"""
+    if not event.contains(model.__table__, 'after_create', _partition_after_create):
+        event.listen(model.__table__, 'after_create', _partition_after_create)
+
+
+@click.group('partitions', help='請求書テーブルのパーティション管理（PostgreSQL）')
+def partitions_cli():
+    pass
+
+
+@partitions_cli.command('ensure')
+@click.option('--years-ahead', type=int, default=None, help='今年から何年先まで作成するか（既定: INVOICE_PARTITION_YEARS_AHEAD）')
+def ensure_command(years_ahead):
+    """先の年のパーティションを作成し、既定パーティションに入った年を切り出す"""
+    from flask import current_app
+    from app import db
+
+    if years_ahead is None:
+        years_ahead = current_app.config['INVOICE_PARTITION_YEARS_AHEAD']
+    with db.engine.begin() as connection:
+        if not is_partitioned(connection):
+            click.echo('invoices はパーティション化されていません（PostgreSQL以外・未マイグレーション）')
+            return
+        created = ensure_partitions(connection, years_ahead=years_ahead)
+    for name, moved in created:
+        click.echo(f'作成: {name}' + (f'（既定パーティションから{moved}件移動）' if moved else ''))
+    if not created:
+        click.echo('作成するパーティションはありません')
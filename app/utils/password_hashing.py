@@ -0,0 +1,120 @@
+"""
+パスワードハッシュ処理の専用スレッド実行
+ハッシュ計算（scrypt / PBKDF2）はGILを解放するため、上限付きの専用スレッドで実行して
+ログイン集中時にもワーカーの他リクエストを処理できるようにする
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+
+class PasswordHashingBusy(RuntimeError):
+    """ハッシュ処理の待ち行列が上限に達した・時間内に終わらなかった"""
+
+
+def normalize_method(method):
+    """
+    werkzeugのmethod文字列を、保存されるハッシュの接頭辞と同じ完全な形式にする
+    （'scrypt' → 'scrypt:32768:8:1'、'pbkdf2:sha256' → 'pbkdf2:sha256:<既定反復回数>'）
+    """
+    name, *args = method.split(':')
+    if name == 'scrypt' and not args:
+        return 'scrypt:32768:8:1'
+    if name == 'pbkdf2' and len(args) < 2:
+        hash_name = args[0] if args else 'sha256'
+        return f'pbkdf2:{hash_name}:{DEFAULT_PBKDF2_ITERATIONS}'
+    return method
+
+
+class PasswordHasher:
+    """上限付きスレッドプールでのパスワードハッシュ生成・検証"""
+
+    def __init__(self, method='scrypt:32768:8:1', workers=2, max_pending=8, timeout=10):
+        self.method = method
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._executor = None
+        self._executor_pid = None
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """Flaskアプリ登録（設定読み込み）"""
+        self.method = normalize_method(app.config['PASSWORD_HASH_METHOD'])
+        self.workers = app.config['PASSWORD_HASH_WORKERS']
+        self.max_pending = app.config['PASSWORD_HASH_MAX_PENDING']
+        self.timeout = app.config['PASSWORD_HASH_TIMEOUT_SECONDS']
+        self._slots = threading.BoundedSemaphore(self.workers + self.max_pending)
+        self._executor_pid = None
+
+    def hash(self, password):
+        """パスワードハッシュ生成"""
+        return self._run(generate_password_hash, password, method=self.method)
+
+    def verify(self, password_hash, password):
+        """パスワード検証"""
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """保存済みハッシュが現在の設定と異なる形式・コストかどうか"""
+        return normalize_method(password_hash.split('$', 1)[0]) != normalize_method(self.method)
+
+    def verify_and_update(self, user, password):
+        """
+        パスワード検証 + 旧形式ハッシュの再ハッシュ
+
+        Returns:
+            bool: 認証成功かどうか（再ハッシュ時は user.password_hash を更新、commitは呼び出し側）
+        """
+        if not self.verify(user.password_hash, password):
+            return False
+        if self.needs_rehash(user.password_hash):
+            user.password_hash = self.hash(password)
+        return True
+
+    def _run(self, func, *args, **kwargs):
+        """専用スレッドで実行（待ち行列が満杯・タイムアウト時はPasswordHashingBusy → 503）"""
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHashingBusy('password hashing queue is full')
+        try:
+            future = self._get_executor().submit(func, *args, **kwargs)
+        except Exception:
+            self._slots.release()
+            raise
+        # タイムアウトで呼び出し側が戻っても、計算完了まで枠を占有したままにする
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            raise PasswordHashingBusy('password hashing timed out') from None
+
+    def _get_executor(self):
+        """fork後のワーカーごとにスレッドプールを作成"""
+        pid = os.getpid()
+        if self._executor_pid != pid:
+            with self._lock:
+                if self._executor_pid != pid:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers, thread_name_prefix='password-hash'
+                    )
+                    self._executor_pid = pid
+        return self._executor
+
+
+def hashing_busy_response():
+    """ハッシュ処理混雑時の503レスポンス（Retry-After付き）"""
+    from flask import jsonify
+
+    response = jsonify({'error': 'ただいま混み合っています。しばらくしてから再度お試しください'})
+    response.status_code = 503
+    response.headers['Retry-After'] = '1'
+    return response
+
+
+# グローバルパスワードハッシャー
+password_hasher = PasswordHasher()
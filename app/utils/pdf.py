@@ -0,0 +1,151 @@
+"""
+最小構成のPDF生成（純Python・外部ライブラリなし）
+日本語はPDF標準のCJKフォント（非埋め込みのCIDフォント + UniJIS-UCS2-HW-H）で描画するため、
+フォントファイルを同梱せずに閲覧側（Acrobat・ブラウザ・プレビュー等）のフォントで表示される
+"""
+
+import zlib
+
+# A4（pt）
+A4_WIDTH = 595.28
+A4_HEIGHT = 841.89
+
+FONT_NAME = 'HeiseiKakuGo-W5'
+
+# UniJIS-UCS2-HW-H: ASCII（CID 1-95）・半角カナ（CID 327-389）は幅500、それ以外は全角（幅1000）
+_HALF_WIDTH_CIDS = '1 95 500 327 389 500'
+
+
+def text_width(text, size):
+    """文字列の描画幅（pt）"""
+    units = sum(500 if ord(ch) < 0x7f or 0xff61 <= ord(ch) <= 0xff9f else 1000 for ch in text)
+    return units * size / 1000
+
+
+def wrap_text(text, size, max_width):
+    """描画幅で折り返した行のリスト（改行は維持）"""
+    lines = []
+    for paragraph in str(text or '').splitlines() or ['']:
+        line = ''
+        for ch in paragraph:
+            if line and text_width(line + ch, size) > max_width:
+                lines.append(line)
+                line = ''
+            line += ch
+        lines.append(line)
+    return lines
+
+
+def _encode_text(text):
+    """UCS-2ビッグエンディアンの16進文字列（BMP外の文字は〓に置換）"""
+    return ''.join(
+        f'{ord(ch):04X}' if ord(ch) <= 0xffff else '3013'
+        for ch in text
+    )
+
+
+class PDFCanvas:
+    """
+    ページ単位で描画命令を積み、bytesとして出力するキャンバス
+    座標は左上原点（y は上端からの距離）で指定する
+    """
+
+    def __init__(self, width=A4_WIDTH, height=A4_HEIGHT, title=None):
+        self.width = width
+        self.height = height
+        self.title = title
+        self._pages = []
+        self._ops = []
+
+    def text(self, x, y, value, size=10, align='left'):
+        """文字列描画（align: left / right / center）"""
+        value = str(value or '')
+        if align == 'right':
+            x -= text_width(value, size)
+        elif align == 'center':
+            x -= text_width(value, size) / 2
+        self._ops.append(
+            f'BT /F1 {size:.2f} Tf {x:.2f} {self.height - y:.2f} Td <{_encode_text(value)}> Tj ET'
+        )
+
+    def line(self, x1, y1, x2, y2, width=0.5):
+        self._ops.append(
+            f'{width:.2f} w {x1:.2f} {self.height - y1:.2f} m {x2:.2f} {self.height - y2:.2f} l S'
+        )
+
+    def rect(self, x, y, w, h, width=0.5, fill_gray=None):
+        """矩形（fill_gray指定時は塗りつぶし 0.0=黒〜1.0=白）"""
+        box = f'{x:.2f} {self.height - y - h:.2f} {w:.2f} {h:.2f} re'
+        if fill_gray is not None:
+            self._ops.append(f'q {fill_gray:.2f} g {box} f Q')
+        self._ops.append(f'{width:.2f} w {box} S')
+
+    def show_page(self):
+        self._pages.append('\n'.join(self._ops))
+        self._ops = []
+
+    def to_bytes(self):
+        """PDFバイト列（同じ描画内容からは常に同じバイト列）"""
+        if self._ops or not self._pages:
+            self.show_page()
+
+        objects = []
+
+        def add(body):
+            objects.append(body)
+            return len(objects)
+
+        catalog = add(None)
+        pages = add(None)
+        descriptor = add(
+            f'<< /Type /FontDescriptor /FontName /{FONT_NAME} /Flags 4 '
+            '/FontBBox [-92 -250 1010 922] /ItalicAngle 0 /Ascent 752 /Descent -221 '
+            '/CapHeight 737 /StemV 114 >>'
+        )
+        cid_font = add(
+            f'<< /Type /Font /Subtype /CIDFontType0 /BaseFont /{FONT_NAME} '
+            '/CIDSystemInfo << /Registry (Adobe) /Ordering (Japan1) /Supplement 2 >> '
+            f'/FontDescriptor {descriptor} 0 R /DW 1000 /W [{_HALF_WIDTH_CIDS}] >>'
+        )
+        font = add(
+            f'<< /Type /Font /Subtype /Type0 /BaseFont /{FONT_NAME}-UniJIS-UCS2-HW-H '
+            f'/Encoding /UniJIS-UCS2-HW-H /DescendantFonts [{cid_font} 0 R] >>'
+        )
+
+        page_ids = []
+        for content in self._pages:
+            stream = zlib.compress(content.encode('latin-1'))
+            contents = add((
+                f'<< /Length {len(stream)} /Filter /FlateDecode >>\nstream\n'.encode('latin-1')
+                + stream + b'\nendstream'
+            ))
+            page_ids.append(add(
+                f'<< /Type /Page /Parent {pages} 0 R /MediaBox [0 0 {self.width:.2f} {self.height:.2f}] '
+                f'/Resources << /Font << /F1 {font} 0 R >> >> /Contents {contents} 0 R >>'
+            ))
+
+        objects[catalog - 1] = f'<< /Type /Catalog /Pages {pages} 0 R >>'
+        objects[pages - 1] = (
+            f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {len(page_ids)} >>"
+        )
+        info = None
+        if self.title:
+            info = add(f'<< /Title <FEFF{_encode_text(self.title)}> /Producer (InfluBerry) >>')
+
+        out = bytearray(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(len(out))
+            if isinstance(body, str):
+                body = body.encode('latin-1')
+            out += f'{number} 0 obj\n'.encode('latin-1') + body + b'\nendobj\n'
+
+        xref = len(out)
+        out += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode('latin-1')
+        for offset in offsets:
+            out += f'{offset:010d} 00000 n \n'.encode('latin-1')
+        trailer = f'/Size {len(objects) + 1} /Root {catalog} 0 R'
+        if info:
+            trailer += f' /Info {info} 0 R'
+        out += f'trailer\n<< {trailer} >>\nstartxref\n{xref}\n%%EOF\n'.encode('latin-1')
+        return bytes(out)
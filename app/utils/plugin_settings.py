@@ -0,0 +1,169 @@
+"""
+ユーザー別プラグイン設定ストア
+plugin_settings テーブルの前段にワーカー内のread-throughキャッシュを置き、
+users.settings_version（ログイン時に読み込み済み）との比較で無効化する
+"""
+
+from copy import deepcopy
+
+from app.utils.versioned_cache import VersionedLRUCache
+
+
+GLOBAL_SETTINGS_KEY = 'global_settings'
+
+GLOBAL_DEFAULT_SETTINGS = {
+    'email_notifications': True,
+    'browser_notifications': False,
+    'data_export_format': 'csv'
+}
+
+
+class PluginSettingsError(ValueError):
+    """プラグイン設定の検証エラー"""
+
+
+class PluginSettingsStore:
+    """プラグイン設定のread-throughキャッシュ付きストア"""
+
+    def __init__(self, max_entries=1024):
+        self._cache = VersionedLRUCache(max_entries)  # user_id -> (settings_version, {plugin_name: settings})
+
+    def init_app(self, app):
+        """Flaskアプリ登録（設定読み込み）"""
+        self._cache.max_entries = app.config['PLUGIN_SETTINGS_CACHE_SIZE']
+
+    def get_all(self, user):
+        """
+        ユーザーの全プラグイン設定取得（既定値とマージ済み）
+
+        キャッシュの版数が user.settings_version と一致すればクエリなし
+        """
+        return self._cache.get_or_create(
+            user.id, user.settings_version or 0, lambda: self._load(user.id)
+        )
+
+    def get_all_for_users(self, users):
+        """
+        複数ユーザーの全プラグイン設定取得（バッチ処理用）
+
+        キャッシュの版数が一致しないユーザー分はまとめて読み込む（IN句で一括）
+
+        Returns:
+            dict: {user_id: {plugin_name: settings}}
+        """
+        results = self._cache.get_many({user.id: user.settings_version or 0 for user in users})
+        missing = {user.id: user for user in users if user.id not in results}
+
+        if missing:
+            loaded = self._load_many(list(missing))
+            for user_id, settings in loaded.items():
+                self._cache.put(user_id, missing[user_id].settings_version or 0, settings)
+            results.update(loaded)
+        return results
+
+    def get(self, user, plugin_name):
+        """プラグイン単位の設定取得（返り値は共有オブジェクトのため変更しないこと）"""
+        return self.get_all(user).get(plugin_name, {})
+
+    def update(self, user, updates):
+        """
+        設定更新（既定値・保存済み値とマージ後に各プラグインで検証して保存）
+
+        Args:
+            user (User): 対象ユーザー
+            updates (dict): {plugin_name: {key: value}}
+
+        Raises:
+            PluginSettingsError: 未知のプラグイン・検証エラー
+        """
+        from app import db
+        from app.models.plugin_setting import PluginSetting
+
+        if not isinstance(updates, dict) or not updates:
+            raise PluginSettingsError('設定データが不正です')
+
+        current = self._load(user.id)
+        merged = {}
+        for plugin_name, values in updates.items():
+            if not isinstance(values, dict):
+                raise PluginSettingsError(f"'{plugin_name}' の設定はオブジェクトで指定してください")
+            if plugin_name not in current:
+                raise PluginSettingsError(f"プラグイン '{plugin_name}' は存在しません")
+
+            settings = dict(current[plugin_name], **values)
+            if not self._validate(plugin_name, settings):
+                raise PluginSettingsError(f"'{plugin_name}' の設定値が不正です")
+            merged[plugin_name] = settings
+
+        rows = {
+            row.plugin_name: row
+            for row in PluginSetting.query.filter(
+                PluginSetting.user_id == user.id,
+                PluginSetting.plugin_name.in_(list(merged))
+            )
+        }
+        for plugin_name, settings in merged.items():
+            row = rows.get(plugin_name)
+            if row is None:
+                db.session.add(PluginSetting(user_id=user.id, plugin_name=plugin_name, settings=settings))
+            else:
+                row.settings = settings
+
+        # 版数更新で他ワーカーのキャッシュも次回リクエスト時に無効化される
+        # （SQL式で加算し、同時更新でも版数が重複しないようにする）
+        from app.models.user import User
+        user.settings_version = User.settings_version + 1
+        db.session.commit()
+
+        current.update(merged)
+        self._cache.put(user.id, user.settings_version, current)
+        return current
+
+    def invalidate(self, user_id=None):
+        """キャッシュ破棄（user_id省略時は全件）"""
+        self._cache.invalidate(user_id)
+
+    def _load(self, user_id):
+        """既定値 + 保存済み設定の読み込み（1クエリ）"""
+        return self._load_many([user_id])[user_id]
+
+    def _load_many(self, user_ids, chunk_size=500):
+        """複数ユーザー分の既定値 + 保存済み設定の読み込み（chunk_size件ごとに1クエリ）"""
+        from app.models.plugin_setting import PluginSetting
+
+        defaults = self._default_settings()
+        loaded = {user_id: deepcopy(defaults) for user_id in user_ids}
+        for start in range(0, len(user_ids), chunk_size):
+            chunk = user_ids[start:start + chunk_size]
+            for row in PluginSetting.query.filter(PluginSetting.user_id.in_(chunk)):
+                settings = loaded[row.user_id]
+                if row.plugin_name in settings:
+                    settings[row.plugin_name].update(row.settings or {})
+        return loaded
+
+    def _default_settings(self):
+        """登録済みプラグイン + 共通設定の既定値"""
+        from app.plugins.manager import plugin_manager
+
+        defaults = {GLOBAL_SETTINGS_KEY: dict(GLOBAL_DEFAULT_SETTINGS)}
+        for name in plugin_manager.plugin_specs:
+            plugin = plugin_manager.get_plugin(name)
+            if plugin is not None:
+                defaults[name] = deepcopy(plugin.get_default_settings())
+        return defaults
+
+    @staticmethod
+    def _validate(plugin_name, settings):
+        """共通設定は既定値と同じキー・型のみ許可、プラグイン設定は各プラグインで検証"""
+        if plugin_name == GLOBAL_SETTINGS_KEY:
+            return all(
+                key in GLOBAL_DEFAULT_SETTINGS and type(value) is type(GLOBAL_DEFAULT_SETTINGS[key])
+                for key, value in settings.items()
+            )
+        from app.plugins.manager import plugin_manager
+        plugin = plugin_manager.get_plugin(plugin_name)
+        return plugin is not None and plugin.validate_plugin_settings(settings)
+
+
+# グローバルプラグイン設定ストア
+plugin_settings_store = PluginSettingsStore()
@@ -0,0 +1,118 @@
+"""
+APIレスポンスの動的圧縮
+Accept-Encoding に応じて閾値以上のJSON等のレスポンスを brotli / gzip で圧縮する
+ストリーミングレスポンスはチャンクごとに逐次圧縮・フラッシュし、全体をメモリに溜めない
+（静的ファイルはビルド時の事前圧縮ファイルをFrontMiddlewareが配信するため対象外）
+"""
+
+import zlib
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from app.utils.static_files import is_compressible, parse_accept_encoding
+
+
+def gzip_compressor(level):
+    """gzip形式（wbits=31）の逐次圧縮器"""
+    return zlib.compressobj(level, zlib.DEFLATED, 31)
+
+
+def compress_bytes(data, encoding, level):
+    """一括圧縮"""
+    if encoding == 'br':
+        return brotli.compress(data, quality=level, mode=brotli.MODE_TEXT)
+    compressor = gzip_compressor(level)
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_stream(chunks, encoding, level):
+    """
+    逐次圧縮（チャンクごとにフラッシュしてクライアントへ順次送信）
+    """
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=level, mode=brotli.MODE_TEXT)
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+    else:
+        compressor = gzip_compressor(level)
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            if data:
+                yield data
+        yield compressor.flush()
+
+
+class ResponseCompressor:
+    """after_requestでレスポンスを圧縮"""
+
+    def __init__(self):
+        self.enabled = True
+        self.min_size = 1024
+        self.levels = {'br': 5, 'gzip': 5}
+
+    def init_app(self, app):
+        """Flaskアプリ登録（設定読み込み・after_request登録）"""
+        self.enabled = app.config['COMPRESS_ENABLED']
+        self.min_size = app.config['COMPRESS_MIN_SIZE']
+        self.levels = {
+            'br': app.config['COMPRESS_BROTLI_QUALITY'],
+            'gzip': app.config['COMPRESS_GZIP_LEVEL']
+        }
+        app.after_request(self.compress_response)
+
+    def select_encoding(self, accept_encoding):
+        """クライアントが受け入れ可能なエンコーディング（brotli優先・なければNone）"""
+        accepted = parse_accept_encoding(accept_encoding)
+        if brotli is not None and 'br' in accepted:
+            return 'br'
+        if 'gzip' in accepted:
+            return 'gzip'
+        return None
+
+    def compress_response(self, response):
+        from flask import request
+
+        if not self.enabled or not self._should_compress(response):
+            return response
+        if not response.is_streamed and len(response.get_data()) < self.min_size:
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = self.select_encoding(request.headers.get('Accept-Encoding'))
+        if encoding is None:
+            return response
+
+        level = self.levels[encoding]
+        if response.is_streamed:
+            response.response = compress_stream(response.response, encoding, level)
+            response.headers.pop('Content-Length', None)
+        else:
+            response.set_data(compress_bytes(response.get_data(), encoding, level))
+
+        response.headers['Content-Encoding'] = encoding
+        # 表現ごとにバイト列が異なるため強いETagは弱いETagへ（If-None-Matchは弱い比較で一致）
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+    def _should_compress(self, response):
+        if response.status_code < 200 or response.status_code in (204, 206, 304):
+            return False
+        if response.direct_passthrough or 'Content-Encoding' in response.headers:
+            return False
+        return is_compressible(response.mimetype)
+
+
+# グローバルレスポンス圧縮
+response_compressor = ResponseCompressor()
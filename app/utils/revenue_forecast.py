@@ -0,0 +1,172 @@
+"""
+案件パイプラインの月別売上予測
+提案中・契約中の案件金額を、ユーザー自身の過去の成約率で重み付けして締切月ごとに集計する
+案件の列（status / amount / deadline）を1クエリで取得し、NumPy配列でまとめて計算する
+結果はワーカー内にキャッシュし、users.projects_version（案件の追加・更新・削除で加算）で無効化する
+NumPyは予測を計算する時に読み込む（モデル登録時に読み込まれるため起動時間に含めない）
+"""
+
+from datetime import date, datetime
+
+from sqlalchemy import event, select, update
+
+from app.utils.versioned_cache import VersionedLRUCache
+
+# 成約率の事前分布（履歴の少ないユーザーは業界並みの値に寄せる）
+PRIOR_RATES = {'proposed': 0.3, 'contracted': 0.9}
+PRIOR_WEIGHT = 5  # 事前分布を何件分の実績とみなすか
+
+MAX_FORECAST_MONTHS = 24
+
+
+def conversion_rates(status, past_deadline):
+    """
+    過去実績からの成約率（事前分布で平滑化）
+
+    - 提案中 → 完了: 完了 / (完了 + 締切を過ぎた提案中・契約中)
+    - 契約中 → 完了: 完了 / (完了 + 締切を過ぎた契約中)
+    """
+    import numpy as np
+
+    completed = int(np.count_nonzero(status == 'completed'))
+    stale_contracted = int(np.count_nonzero((status == 'contracted') & past_deadline))
+    stale_proposed = int(np.count_nonzero((status == 'proposed') & past_deadline))
+
+    samples = {
+        'proposed': completed + stale_contracted + stale_proposed,
+        'contracted': completed + stale_contracted
+    }
+    rates = {
+        key: (completed + PRIOR_RATES[key] * PRIOR_WEIGHT) / (samples[key] + PRIOR_WEIGHT)
+        for key in PRIOR_RATES
+    }
+    return rates, samples
+
+
+def forecast(status, amount, deadline, today, months):
+    """
+    月別予測（配列演算のみ・行ごとのループなし）
+
+    Args:
+        status (np.ndarray[str]): 案件ステータス
+        amount (np.ndarray[float]): 金額
+        deadline (np.ndarray[datetime64[D]]): 締切日
+        today (date): 基準日
+        months (int): 予測月数（当月を含む）
+
+    締切を過ぎた契約中案件は当月に計上し、締切を過ぎた提案中案件は失注として除外する
+    """
+    import numpy as np
+
+    today = np.datetime64(today, 'D')
+    current_month = today.astype('datetime64[M]')
+    past_deadline = deadline < today
+    rates, samples = conversion_rates(status, past_deadline)
+
+    contracted = status == 'contracted'
+    proposed = (status == 'proposed') & ~past_deadline
+    weights = np.where(contracted, rates['contracted'], np.where(proposed, rates['proposed'], 0.0))
+
+    offset = (np.maximum(deadline.astype('datetime64[M]'), current_month) - current_month).astype(np.int64)
+    open_pipeline = contracted | proposed
+    in_horizon = open_pipeline & (offset < months)
+    later = open_pipeline & ~in_horizon
+
+    def by_month(values):
+        return np.bincount(offset[in_horizon], weights=values[in_horizon], minlength=months)
+
+    expected = by_month(amount * weights)
+    contracted_amount = by_month(amount * contracted)
+    proposed_amount = by_month(amount * proposed)
+    project_count = np.bincount(offset[in_horizon], minlength=months)
+
+    month_labels = np.arange(current_month, current_month + months).astype(str)
+    return {
+        'months': [
+            {
+                'month': str(month_labels[i]),
+                'expected_revenue': round(float(expected[i])),
+                'contracted_amount': float(contracted_amount[i]),
+                'proposed_amount': float(proposed_amount[i]),
+                'best_case': float(contracted_amount[i] + proposed_amount[i]),
+                'project_count': int(project_count[i])
+            }
+            for i in range(months)
+        ],
+        'total_expected_revenue': round(float(expected.sum())),
+        'later_expected_revenue': round(float((amount * weights)[later].sum())),
+        'conversion_rates': {key: round(value, 4) for key, value in rates.items()},
+        'sample_size': samples
+    }
+
+
+class RevenueForecaster:
+    """ユーザー別予測結果のLRUキャッシュ"""
+
+    def __init__(self, max_entries=1024):
+        self._cache = VersionedLRUCache(max_entries)  # user_id -> ((projects_version, today, months), result)
+
+    def init_app(self, app):
+        """Flaskアプリ登録（設定読み込み）"""
+        self._cache.max_entries = app.config['FORECAST_CACHE_SIZE']
+        self._cache.invalidate()
+
+    def get(self, user, months=6, today=None):
+        """
+        月別売上予測（案件が変わるか日付が変わるまでキャッシュ）
+
+        Returns:
+            dict: months / total_expected_revenue / later_expected_revenue / conversion_rates / sample_size
+        """
+        today = today or date.today()
+        return self._cache.get_or_create(
+            user.id, (user.projects_version or 0, today, months),
+            lambda: dict(self._compute(user.id, months, today), generated_at=datetime.utcnow().isoformat())
+        )
+
+    @staticmethod
+    def _compute(user_id, months, today):
+        """案件の列を1クエリで取得して配列化（成約率の実績にはアーカイブ済みの完了案件も含める）"""
+        import numpy as np
+
+        from app import db
+        from app.utils.archival import archiver
+
+        source = archiver.project_source(user_id)
+        rows = db.session.execute(
+            select(source.status, source.amount, source.deadline).where(source.user_id == user_id)
+        ).all()
+        if rows:
+            statuses, amounts, deadlines = zip(*rows)
+        else:
+            statuses, amounts, deadlines = (), (), ()
+        return forecast(
+            np.array(statuses, dtype=str),
+            np.array(amounts, dtype=np.float64),
+            np.array(deadlines, dtype='datetime64[D]'),
+            today,
+            months
+        )
+
+
+def _bump_projects_version(mapper, connection, target):
+    """案件の変更時に同一トランザクションで版数を加算（各ワーカーの予測キャッシュを無効化）"""
+    from app.models.user import User
+
+    users = User.__table__
+    connection.execute(
+        update(users)
+        .where(users.c.id == target.user_id)
+        .values(projects_version=users.c.projects_version + 1, updated_at=users.c.updated_at)
+    )
+
+
+def register_forecast_invalidation(model):
+    """案件モデルへ版数更新リスナーを登録"""
+    for identifier in ('after_insert', 'after_update', 'after_delete'):
+        if not event.contains(model, identifier, _bump_projects_version):
+            event.listen(model, identifier, _bump_projects_version)
+
+
+# グローバル売上予測
+revenue_forecaster = RevenueForecaster()
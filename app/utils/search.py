@@ -0,0 +1,300 @@
+"""
+全文検索（案件・請求書）
+日本語は分かち書きせず文字n-gram（1文字 + 2文字）で索引し、英数字は単語単位で索引する
+- SQLite（開発）: FTS5仮想テーブル <table>_fts（rowid = 元テーブルのid・user_id列も索引して所有者で絞る）
+- PostgreSQL（本番）: 元テーブルの search_vector（tsvector）列 + GINインデックス
+関連度で並べるのは一致した行のうち新しい順に SEARCH_MAX_RESULTS 件まで（頻出語でも全件を順位付けしない）
+トークン化はPython側で行い、DBのパーサー・ロケールに依存しない（tsvector/tsqueryは文字列から直接キャスト）
+索引はORMの書き込みと同じトランザクションで更新する（一括投入後は `flask search reindex`）
+"""
+
+import re
+import unicodedata
+
+import click
+from sqlalchemy import DDL, event, inspect, text
+
+# 日本語（ひらがな・カタカナ・CJK統合漢字・半角カナ）
+_CJK = '\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uff66-\uff9f'
+_TOKEN_PATTERN = re.compile(f'[{_CJK}]+|[^\\W_{_CJK}]+')
+_CJK_PATTERN = re.compile(f'[{_CJK}]')
+
+# tsvectorの位置情報上限
+_MAX_POSITION = 16383
+
+# 検索対象（テーブル名 → 見出し列（重み大）・本文列）
+SEARCH_SPECS = {
+    'projects': {
+        'title': ('company_name', 'project_name'),
+        'body': ('description', 'notes')
+    },
+    'invoices': {
+        'title': ('invoice_number', 'client_company', 'project_name', 'client_contact'),
+        'body': ('description', 'notes')
+    }
+}
+
+MAX_QUERY_TOKENS = 32
+
+
+def tokenize(value, for_query=False):
+    """
+    検索用トークン列
+
+    日本語の連続部分は索引時に1文字・2文字、検索時は2文字（1文字だけの語は1文字）のn-gramにする
+    （2文字語も1文字語も部分一致で見つかる）
+    """
+    if not value:
+        return []
+    normalized = unicodedata.normalize('NFKC', str(value)).lower()
+    tokens = []
+    for run in _TOKEN_PATTERN.findall(normalized):
+        if len(run) == 1 or not _CJK_PATTERN.match(run):
+            tokens.append(run)
+            continue
+        bigrams = [run[i:i + 2] for i in range(len(run) - 1)]
+        if for_query:
+            tokens.extend(bigrams)
+        else:
+            tokens.extend(run)
+            tokens.extend(bigrams)
+    return tokens
+
+
+def _field_tokens(target, columns):
+    tokens = []
+    for column in columns:
+        tokens.extend(tokenize(getattr(target, column, None)))
+    return tokens
+
+
+def _tsvector_literal(title_tokens, body_tokens):
+    """位置・重み付きtsvector文字列（例: "'東京':1A 'pr':2B"）"""
+    parts = []
+    position = 0
+    for weight, tokens in (('A', title_tokens), ('B', body_tokens)):
+        for token in tokens:
+            position = min(position + 1, _MAX_POSITION)
+            parts.append(f"'{token}':{position}{weight}")
+    return ' '.join(parts)
+
+
+def write_index(connection, table_name, targets):
+    """索引の書き込み（rowsはモデルまたは行オブジェクト・複数行はexecutemany）"""
+    spec = SEARCH_SPECS[table_name]
+    rows = []
+    for target in targets:
+        title = _field_tokens(target, spec['title'])
+        body = _field_tokens(target, spec['body'])
+        if connection.dialect.name == 'postgresql':
+            rows.append({'id': target.id, 'document': _tsvector_literal(title, body)})
+        else:
+            rows.append({'id': target.id, 'user_id': target.user_id,
+                         'title': ' '.join(title), 'body': ' '.join(body)})
+    if not rows:
+        return
+
+    if connection.dialect.name == 'postgresql':
+        connection.execute(
+            text(f'UPDATE {table_name} SET search_vector = CAST(:document AS tsvector) WHERE id = :id'), rows
+        )
+    elif connection.dialect.name == 'sqlite':
+        connection.execute(text(f'DELETE FROM {table_name}_fts WHERE rowid = :id'), [{'id': r['id']} for r in rows])
+        connection.execute(
+            text(f'INSERT INTO {table_name}_fts (rowid, user_id, title, body) VALUES (:id, :user_id, :title, :body)'),
+            rows
+        )
+
+
+def _index_after_insert(mapper, connection, target):
+    write_index(connection, mapper.local_table.name, [target])
+
+
+def _index_after_update(mapper, connection, target):
+    """検索対象列が変わった場合のみ再索引（ステータス更新等では何もしない）"""
+    spec = SEARCH_SPECS[mapper.local_table.name]
+    state = inspect(target)
+    if any(state.attrs[column].history.has_changes() for column in spec['title'] + spec['body']):
+        write_index(connection, mapper.local_table.name, [target])
+
+
+def _index_after_delete(mapper, connection, target):
+    # PostgreSQLは行と一緒に消える
+    if connection.dialect.name == 'sqlite':
+        connection.execute(
+            text(f'DELETE FROM {mapper.local_table.name}_fts WHERE rowid = :id'), {'id': target.id}
+        )
+
+
+def create_index_ddl(table_name):
+    """索引作成DDL（create_all用）"""
+    return {
+        'sqlite': [
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {table_name}_fts USING fts5('
+            f"user_id, title, body, tokenize = 'unicode61')"
+        ],
+        'postgresql': [
+            f'ALTER TABLE {table_name} ADD COLUMN IF NOT EXISTS search_vector tsvector',
+            f'CREATE INDEX IF NOT EXISTS ix_{table_name}_search_vector ON {table_name} USING gin (search_vector)'
+        ]
+    }
+
+
+def is_managed_table(name):
+    """検索索引のテーブル（SQLiteのFTS5仮想テーブルとその内部テーブル・モデル定義外）"""
+    return any(name == f'{table_name}_fts' or name.startswith(f'{table_name}_fts_') for table_name in SEARCH_SPECS)
+
+
+def is_managed_column(table_name, name):
+    """検索索引の列（PostgreSQLの search_vector・モデル定義外）"""
+    return table_name in SEARCH_SPECS and name == 'search_vector'
+
+
+def is_managed_index(name):
+    return any(name == f'ix_{table_name}_search_vector' for table_name in SEARCH_SPECS)
+
+
+def register_search_indexing(*models):
+    """対象モデルへ索引更新リスナー・create_all時の索引作成を登録"""
+    for model in models:
+        for name, listener in (('after_insert', _index_after_insert),
+                               ('after_update', _index_after_update),
+                               ('after_delete', _index_after_delete)):
+            if not event.contains(model, name, listener):
+                event.listen(model, name, listener)
+
+        table = model.__table__
+        for dialect, statements in create_index_ddl(table.name).items():
+            for statement in statements:
+                event.listen(table, 'after_create', DDL(statement).execute_if(dialect=dialect))
+
+
+def search(model, user_id, query, page=1, per_page=20, filters=None, max_results=None):
+    """
+    ユーザーのレコードを全文検索（関連度順・ページネーション）
+
+    Args:
+        model: Project / Invoice
+        query (str): 検索語（空白区切りはAND）
+        filters (dict): 元テーブルの列による絞り込み（例: {'status': 'completed'}）
+        max_results (int): 順位付けする件数の上限（一致した行の新しい順。既定: SEARCH_MAX_RESULTS）
+
+    Returns:
+        tuple: (モデルのリスト, 総件数（max_results 件で頭打ち）)。検索語からトークンが得られない場合は ValueError
+    """
+    from flask import current_app
+    from app import db
+
+    table_name = model.__tablename__
+    tokens = list(dict.fromkeys(tokenize(query, for_query=True)))[:MAX_QUERY_TOKENS]
+    if not tokens:
+        raise ValueError('検索キーワードを入力してください')
+
+    params = {
+        'user_id': user_id, 'limit': per_page, 'offset': (page - 1) * per_page,
+        'max_results': max_results or current_app.config['SEARCH_MAX_RESULTS']
+    }
+    conditions = []
+    for i, (column, value) in enumerate((filters or {}).items()):
+        if column not in model.__table__.c:
+            raise ValueError(f'不正な絞り込み条件: {column}')
+        conditions.append(f't.{column} = :filter_{i}')
+        params[f'filter_{i}'] = value
+    extra = ''.join(f' AND {condition}' for condition in conditions)
+
+    # 候補（一致した行の新しい順に max_results 件）だけを順位付けし、総件数も候補から数える
+    # （頻出語で一致が数万件あっても (user_id, id) 索引を逆順にたどって打ち切れる）
+    if db.session.get_bind().dialect.name == 'postgresql':
+        params['query'] = ' & '.join(f"'{token}'" for token in tokens)
+        # user_id を等号にすると定数扱いで並び順から外れ、主キー索引を逆順に全ユーザー分たどる計画が
+        # 選ばれうる（ユーザーの行が古い範囲に偏っていると遅い）ため、範囲条件 + (user_id, id) 順で書く
+        candidates_sql = (
+            f'SELECT t.id, t.search_vector FROM {table_name} t '
+            f'WHERE t.user_id BETWEEN :user_id AND :user_id '
+            f'AND t.search_vector @@ CAST(:query AS tsquery){extra} '
+            f'ORDER BY t.user_id DESC, t.id DESC LIMIT :max_results'
+        )
+        order_by = 'ts_rank(search_vector, CAST(:query AS tsquery)) DESC, id DESC'
+    else:
+        # user_id列も索引しているため、所有者の絞り込みもFTS5の索引で行う（他ユーザーの一致行を読まない）
+        phrases = ' '.join(f'"{token}"' for token in tokens)
+        params['query'] = f'user_id : "{int(user_id)}" AND {{title body}} : ({phrases})'
+        join = f' JOIN {table_name} t ON t.id = {table_name}_fts.rowid' if conditions else ''
+        candidates_sql = (
+            f'SELECT {table_name}_fts.rowid AS id, bm25({table_name}_fts, 0.0, 10.0, 1.0) AS rank '
+            f'FROM {table_name}_fts{join} WHERE {table_name}_fts MATCH :query{extra} '
+            f'ORDER BY {table_name}_fts.rowid DESC LIMIT :max_results'
+        )
+        order_by = 'rank, id DESC'
+
+    rows = db.session.execute(text(
+        f'SELECT id, COUNT(*) OVER () FROM ({candidates_sql}) candidates '
+        f'ORDER BY {order_by} LIMIT :limit OFFSET :offset'
+    ), params).all()
+    ids = [row[0] for row in rows]
+    if rows:
+        total = rows[0][1]
+    elif page == 1:
+        total = 0
+    else:
+        total = db.session.execute(text(f'SELECT COUNT(*) FROM ({candidates_sql}) candidates'), params).scalar()
+
+    if not ids:
+        return [], total
+    records = {record.id: record for record in model.query.filter(model.id.in_(ids))}
+    return [records[record_id] for record_id in ids if record_id in records], total
+
+
+def rebuild_index(model, user_id=None, batch_size=1000):
+    """
+    索引の再構築（移行スクリプト・差分同期などORMを通さない一括投入の後に実行）
+
+    Returns:
+        int: 索引した件数
+    """
+    from app import db
+
+    table_name = model.__tablename__
+    connection = db.session.connection()
+    if connection.dialect.name == 'sqlite':
+        if user_id is None:
+            connection.execute(text(f'DELETE FROM {table_name}_fts'))
+        else:
+            connection.execute(
+                text(f'DELETE FROM {table_name}_fts WHERE {table_name}_fts MATCH :query'),
+                {'query': f'user_id : "{int(user_id)}"'}
+            )
+
+    query = model.query.order_by(model.id)
+    if user_id is not None:
+        query = query.filter_by(user_id=user_id)
+
+    count = 0
+    last_id = 0
+    while True:
+        batch = query.filter(model.id > last_id).limit(batch_size).all()
+        if not batch:
+            break
+        write_index(connection, table_name, batch)
+        count += len(batch)
+        last_id = batch[-1].id
+        db.session.expunge_all()
+    db.session.commit()
+    return count
+
+
+@click.group('search', help='全文検索の索引管理')
+def search_cli():
+    pass
+
+
+@search_cli.command('reindex')
+@click.option('--user-id', type=int, default=None, help='対象ユーザー（既定: 全ユーザー）')
+def reindex_command(user_id):
+    """案件・請求書の検索索引を再構築"""
+    from app.models.invoice import Invoice
+    from app.models.project import Project
+
+    for model in (Project, Invoice):
+        count = rebuild_index(model, user_id=user_id)
+        click.echo(f'{model.__tablename__}: {count}件を索引しました')
@@ -6,6 +6,9 @@
 
 import re
 import html
+import threading
+import time
+from collections import deque
 from datetime import datetime, date
 from decimal import Decimal, InvalidOperation
 from flask import request, jsonify
@@ -162,37 +165,45 @@ class SecurityDecorator:
     @staticmethod
     def rate_limit_basic(max_requests=60, window_seconds=60):
         """
-        基本的なレート制限デコレータ（メモリベース）
+        基本的なレート制限デコレータ（メモリベース・ワーカー単位）
+        gthread/geventワーカーでは同一プロセス内の複数リクエストが requests_log を共有するためロックで保護
         """
-        requests_log = {}
+        requests_log = {}  # client_ip -> deque[リクエスト時刻]
+        lock = threading.Lock()
         
         def decorator(f):
             @wraps(f)
             def decorated_function(*args, **kwargs):
                 # 簡易的なレート制限（本番環境ではRedis推奨）
-                client_ip = request.environ.get('HTTP_X_FORWARDED_FOR', request.remote_addr)
-                current_time = datetime.now().timestamp()
+                client_ip = request.remote_addr  # ProxyFixで解決済み
+                current_time = time.monotonic()
                 
-                if client_ip not in requests_log:
-                    requests_log[client_ip] = []
+                with lock:
+                    # 期限切れのIPを削除（長時間稼働でのメモリ増加防止）
+                    if len(requests_log) > 10000:
+                        for ip in [ip for ip, log in requests_log.items()
+                                   if not log or current_time - log[-1] >= window_seconds]:
+                            del requests_log[ip]
+                    
+                    log = requests_log.setdefault(client_ip, deque())
+                    
+                    # 古いリクエストを削除
+                    while log and current_time - log[0] >= window_seconds:
+                        log.popleft()
+                    
+                    # レート制限チェック
+                    limited = len(log) >= max_requests
+                    if not limited:
+                        # リクエスト記録
+                        log.append(current_time)
                 
-                # 古いリクエストを削除
-                requests_log[client_ip] = [
-                    req_time for req_time in requests_log[client_ip]
-                    if current_time - req_time < window_seconds
-                ]
-                
-                # レート制限チェック
-                if len(requests_log[client_ip]) >= max_requests:
+                if limited:
                     return jsonify({
                         'error': 'レート制限に達しました',
                         'message': f'{window_seconds}秒間に{max_requests}回まで',
                         'status': 429
                     }), 429
                 
-                # リクエスト記録
-                requests_log[client_ip].append(current_time)
-                
                 return f(*args, **kwargs)
             return decorated_function
         return decorator
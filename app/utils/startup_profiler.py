@@ -0,0 +1,88 @@
+"""
+起動プロファイラー
+create_app のフェーズ別所要時間・import数を計測し、ログ出力・JSONエクスポートする
+コールドスタート（Renderスリープ復帰時の初回リクエスト）短縮のための計測基盤
+"""
+
+import json
+import os
+import sys
+import time
+
+
+def seconds_since_process_start():
+    """
+    プロセス起動からの経過秒数（Linuxの/procから算出）
+
+    Returns:
+        Optional[float]: 経過秒数（取得不可の環境ではNone）
+    """
+    try:
+        with open('/proc/self/stat') as f:
+            # comm（2番目）に空白・括弧が含まれる場合があるため末尾の ')' 以降を分割
+            fields = f.read().rsplit(')', 1)[1].split()
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        start_ticks = int(fields[19])
+        return uptime - start_ticks / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class StartupProfiler:
+    """起動フェーズ別の所要時間計測"""
+
+    def __init__(self, started_at=None):
+        self.started_at = started_at if started_at is not None else time.perf_counter()
+        self.phases = []
+        self._last_mark = time.perf_counter()
+        self._last_module_count = len(sys.modules)
+
+    def record(self, name, seconds, modules_loaded=0):
+        """計測済みフェーズの記録"""
+        self.phases.append({
+            'phase': name,
+            'seconds': seconds,
+            'modules_loaded': modules_loaded
+        })
+
+    def checkpoint(self, name):
+        """前回チェックポイントからの所要時間・新規import数をフェーズとして記録"""
+        now = time.perf_counter()
+        module_count = len(sys.modules)
+        self.record(name, now - self._last_mark, module_count - self._last_module_count)
+        self._last_mark = now
+        self._last_module_count = module_count
+
+    def total_seconds(self):
+        """計測開始からの経過秒数"""
+        return time.perf_counter() - self.started_at
+
+    def to_dict(self):
+        """辞書形式で計測結果を返す"""
+        return {
+            'total_seconds': round(self.total_seconds(), 4),
+            'since_process_start': seconds_since_process_start(),
+            'phases': [
+                dict(phase, seconds=round(phase['seconds'], 4))
+                for phase in self.phases
+            ]
+        }
+
+    def report(self, logger):
+        """計測結果のログ出力"""
+        result = self.to_dict()
+        logger.info(
+            f"Startup profile: {result['total_seconds'] * 1000:.1f}ms "
+            f"(since process start: {result['since_process_start'] or 0:.3f}s)"
+        )
+        for phase in self.phases:
+            logger.info(
+                f"  {phase['phase']:<20} {phase['seconds'] * 1000:8.1f}ms "
+                f"({phase['modules_loaded']} modules)"
+            )
+
+    def export(self, path):
+        """計測結果のJSONエクスポート"""
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
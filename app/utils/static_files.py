@@ -0,0 +1,280 @@
+"""
+静的ファイル配信レイヤー
+Vue.jsビルド成果物（app/static）を起動時にマニフェスト化し、
+事前圧縮ファイル（.br / .gz）のネゴシエーション配信・長期キャッシュヘッダー付与を行う
+"""
+
+import gzip
+import mimetypes
+import os
+from email.utils import formatdate, parsedate_to_datetime
+
+# 圧縮対象のMIMEタイプ（画像等の圧縮済みバイナリは対象外）
+COMPRESSIBLE_TYPES = (
+    'text/',
+    'application/javascript',
+    'application/json',
+    'image/svg+xml',
+    'image/vnd.microsoft.icon',
+    'image/x-icon',
+)
+
+# 事前圧縮ファイルの拡張子 → Content-Encoding（優先順）
+ENCODING_SUFFIXES = (('br', '.br'), ('gzip', '.gz'))
+
+# Viteのハッシュ付きファイル（内容が変われば名前も変わる）は永続キャッシュ
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+DEFAULT_CACHE_CONTROL = 'public, max-age=3600'
+INDEX_CACHE_CONTROL = 'no-cache'
+
+# 圧縮の効果が薄い小さなファイルは非圧縮のまま配信
+MIN_COMPRESS_SIZE = 1024
+
+INDEX_FILE = 'index.html'
+
+
+def is_compressible(mimetype):
+    """圧縮対象のMIMEタイプかチェック"""
+    return bool(mimetype) and mimetype.startswith(COMPRESSIBLE_TYPES)
+
+
+def parse_accept_encoding(header):
+    """
+    Accept-Encodingヘッダーから受け入れ可能なエンコーディング集合を取得
+    """
+    accepted = set()
+    if not header:
+        return accepted
+
+    for part in header.split(','):
+        token, _, params = part.strip().partition(';')
+        token = token.strip().lower()
+        if not token:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if quality > 0:
+            accepted.add(token)
+    return accepted
+
+
+class StaticAsset:
+    """マニフェスト内の静的ファイル1件"""
+
+    __slots__ = (
+        'path', 'mimetype', 'etag', 'last_modified',
+        'cache_control', 'variants'
+    )
+
+    def __init__(self, path, mimetype, etag, last_modified, cache_control):
+        self.path = path
+        self.mimetype = mimetype
+        self.etag = etag
+        self.last_modified = last_modified
+        self.cache_control = cache_control
+        # encoding（'identity' / 'br' / 'gzip'）→ (ファイルパス or bytes, サイズ)
+        self.variants = {}
+
+    def etag_for(self, encoding):
+        """エンコーディングごとのETag（本文のバイト列が異なるため表現ごとに別の値）"""
+        if encoding == 'identity':
+            return self.etag
+        return f'{self.etag[:-1]}-{encoding}"'
+
+    def select_variant(self, accept_encoding):
+        """クライアントが受け入れ可能な最適なエンコーディングを選択"""
+        if len(self.variants) > 1:
+            accepted = parse_accept_encoding(accept_encoding)
+            for encoding, _ in ENCODING_SUFFIXES:
+                if encoding in self.variants and encoding in accepted:
+                    return encoding
+        return 'identity'
+
+
+class StaticManifest:
+    """
+    app/static の起動時マニフェスト
+    リクエスト時のファイルシステムアクセス（stat・例外処理）を排除する
+    """
+
+    def __init__(self, static_folder):
+        self.static_folder = static_folder
+        self.assets = {}
+        self.index = None
+
+    def build(self):
+        """静的ディレクトリを走査してマニフェストを構築"""
+        self.assets = {}
+        self.index = None
+
+        if not self.static_folder or not os.path.isdir(self.static_folder):
+            return self
+
+        for root, _, files in os.walk(self.static_folder):
+            names = set(files)
+            for name in files:
+                # 事前圧縮ファイルは元ファイルのバリアントとして登録
+                if name.endswith(('.br', '.gz')) and name[:-3] in names:
+                    continue
+
+                full_path = os.path.join(root, name)
+                rel_path = os.path.relpath(full_path, self.static_folder).replace(os.sep, '/')
+                self.assets['/' + rel_path] = self._load_asset(rel_path, full_path, names)
+
+        self.index = self.assets.get('/' + INDEX_FILE)
+        if self.index:
+            # SPAエントリーポイントはルートパスでも配信
+            self.assets['/'] = self.index
+        return self
+
+    def _load_asset(self, rel_path, full_path, sibling_names):
+        """静的ファイル1件のメタデータ・バリアント読み込み"""
+        stat = os.stat(full_path)
+        mimetype = mimetypes.guess_type(rel_path)[0] or 'application/octet-stream'
+        if mimetype.startswith('text/') or mimetype == 'application/javascript':
+            mimetype += '; charset=utf-8'
+
+        if rel_path == INDEX_FILE:
+            cache_control = INDEX_CACHE_CONTROL
+        elif rel_path.startswith('assets/'):
+            cache_control = IMMUTABLE_CACHE_CONTROL
+        else:
+            cache_control = DEFAULT_CACHE_CONTROL
+
+        asset = StaticAsset(
+            path=rel_path,
+            mimetype=mimetype,
+            etag=f'"{stat.st_size:x}-{int(stat.st_mtime):x}"',
+            last_modified=formatdate(stat.st_mtime, usegmt=True),
+            cache_control=cache_control
+        )
+
+        if rel_path == INDEX_FILE:
+            # index.htmlは全SPAディープリンクで返すためメモリ常駐
+            with open(full_path, 'rb') as f:
+                asset.variants['identity'] = (f.read(), stat.st_size)
+        else:
+            asset.variants['identity'] = (full_path, stat.st_size)
+
+        if not is_compressible(mimetype) or stat.st_size < MIN_COMPRESS_SIZE:
+            return asset
+
+        name = os.path.basename(full_path)
+        for encoding, suffix in ENCODING_SUFFIXES:
+            if name + suffix in sibling_names:
+                variant_path = full_path + suffix
+                asset.variants[encoding] = (variant_path, os.path.getsize(variant_path))
+
+        # ビルド時に事前圧縮されていない場合はgzipのみ初回リクエスト時に生成
+        # （起動時に圧縮するとコールドスタートが遅くなるため）
+        if 'gzip' not in asset.variants:
+            asset.variants['gzip'] = None
+
+        return asset
+
+    def get(self, path):
+        """パスに対応する静的ファイル取得"""
+        return self.assets.get(path)
+
+    def build_response(self, asset, environ):
+        """
+        静的ファイルのレスポンス生成
+
+        Returns:
+            tuple: (ステータス, ヘッダー一覧, ボディiterable)
+        """
+        encoding = asset.select_variant(environ.get('HTTP_ACCEPT_ENCODING'))
+        # 別スレッドがバリアントを生成・破棄していても、ここで得た値だけを使う
+        variant = asset.variants.get(encoding)
+        if variant is None:
+            encoding, variant = self._compress_variant(asset, encoding)
+        source, size = variant
+
+        etag = asset.etag_for(encoding)
+        headers = [
+            ('Cache-Control', asset.cache_control),
+            ('ETag', etag),
+            ('Last-Modified', asset.last_modified),
+        ]
+        if len(asset.variants) > 1:
+            headers.append(('Vary', 'Accept-Encoding'))
+
+        if self._is_not_modified(asset, etag, environ):
+            return '304 Not Modified', headers, []
+
+        headers.append(('Content-Type', asset.mimetype))
+        headers.append(('Content-Length', str(size)))
+        if encoding != 'identity':
+            headers.append(('Content-Encoding', encoding))
+
+        if environ.get('REQUEST_METHOD') == 'HEAD':
+            return '200 OK', headers, []
+
+        if isinstance(source, bytes):
+            return '200 OK', headers, [source]
+
+        f = open(source, 'rb')
+        file_wrapper = environ.get('wsgi.file_wrapper')
+        if file_wrapper:
+            return '200 OK', headers, file_wrapper(f, 65536)
+        return '200 OK', headers, _iter_file(f)
+
+    @staticmethod
+    def _compress_variant(asset, encoding):
+        """
+        未生成のgzipバリアントをメモリ上に生成
+        圧縮効果がない場合はバリアントを破棄して非圧縮で配信
+
+        Returns:
+            tuple: (エンコーディング, (本文, サイズ))
+        """
+        identity = asset.variants['identity']
+        source, size = identity
+        if not isinstance(source, bytes):
+            with open(source, 'rb') as f:
+                source = f.read()
+        compressed = gzip.compress(source, compresslevel=9, mtime=0)
+
+        if len(compressed) < size:
+            variant = (compressed, len(compressed))
+            asset.variants[encoding] = variant
+            return encoding, variant
+
+        asset.variants.pop(encoding, None)
+        return 'identity', identity
+
+    @staticmethod
+    def _is_not_modified(asset, etag, environ):
+        """条件付きリクエスト（If-None-Match は弱い比較 / If-Modified-Since）判定"""
+        if_none_match = environ.get('HTTP_IF_NONE_MATCH')
+        if if_none_match:
+            tags = [tag.strip() for tag in if_none_match.split(',')]
+            tags = [tag[2:] if tag.startswith('W/') else tag for tag in tags]
+            return etag in tags or '*' in tags
+
+        if_modified_since = environ.get('HTTP_IF_MODIFIED_SINCE')
+        if if_modified_since:
+            try:
+                return (parsedate_to_datetime(if_modified_since)
+                        >= parsedate_to_datetime(asset.last_modified))
+            except (TypeError, ValueError):
+                return False
+        return False
+
+
+def _iter_file(f, chunk_size=65536):
+    """wsgi.file_wrapper非対応サーバー用のファイル読み出し"""
+    try:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        f.close()
+
@@ -0,0 +1,158 @@
+"""
+プラグイン使用イベントのバッファリング書き込み
+ワーカー内でイベントを溜め、一定件数または一定間隔でまとめてINSERT・月別カウンターをUPSERTする
+"""
+
+import atexit
+import os
+import threading
+from collections import Counter
+from datetime import datetime
+
+from sqlalchemy import insert
+
+
+class UsageTracker:
+    """プラグイン使用イベントのワーカー内バッファ"""
+
+    def __init__(self):
+        self.app = None
+        self.batch_size = 200
+        self.flush_interval = 30
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._flusher_pid = None
+
+    def init_app(self, app):
+        """Flaskアプリ登録（設定読み込み・終了時フラッシュ登録）"""
+        if self.app is None:
+            atexit.register(self.flush)
+        self.app = app
+        self.batch_size = app.config['USAGE_FLUSH_BATCH_SIZE']
+        self.flush_interval = app.config['USAGE_FLUSH_INTERVAL_SECONDS']
+
+    def record(self, user_id, plugin_name, action, occurred_at=None):
+        """
+        使用イベント記録（バッファへ追加のみ・DBアクセスなし）
+        """
+        event = {
+            'user_id': user_id,
+            'plugin_name': plugin_name,
+            'action': action,
+            'created_at': occurred_at or datetime.utcnow()
+        }
+        with self._lock:
+            self._buffer.append(event)
+            buffered = len(self._buffer)
+
+        self._ensure_flusher()
+        if buffered >= self.batch_size:
+            self._wakeup.set()
+
+    def pending_events(self, user_id, plugin_name):
+        """
+        未フラッシュのイベント取得（同一ワーカー内のread-your-writes用）
+        """
+        with self._lock:
+            return [
+                e for e in self._buffer
+                if e['user_id'] == user_id and e['plugin_name'] == plugin_name
+            ]
+
+    def flush(self):
+        """バッファ内イベントの一括書き込み"""
+        with self._lock:
+            events, self._buffer = self._buffer, []
+        if not events or self.app is None:
+            return 0
+
+        try:
+            with self.app.app_context():
+                self._write(events)
+        except Exception as e:
+            # 書き込み失敗時はバッファへ戻して次回再試行（DB障害時のメモリ肥大化防止に上限あり）
+            kept = events[-self.batch_size * 10:]
+            with self._lock:
+                self._buffer[:0] = kept
+            self.app.logger.error(f'Usage event flush error: {e}')
+            if len(events) > len(kept):
+                self.app.logger.warning(
+                    f'Usage events dropped: {len(events) - len(kept)} (retry buffer limit {self.batch_size * 10})'
+                )
+            return 0
+        return len(events)
+
+    def _write(self, events):
+        """イベントINSERT + 月別カウンターUPSERT（1トランザクション）"""
+        from app import db
+        from app.models.plugin_usage import PluginUsageEvent, PluginUsageCounter
+
+        counts = Counter()
+        last_used = {}
+        for event in events:
+            key = (
+                event['user_id'],
+                event['plugin_name'],
+                event['created_at'].strftime('%Y-%m'),
+                event['action']
+            )
+            counts[key] += 1
+            if key not in last_used or event['created_at'] > last_used[key]:
+                last_used[key] = event['created_at']
+
+        counter_rows = [
+            {
+                'user_id': user_id,
+                'plugin_name': plugin_name,
+                'month': month,
+                'action': action,
+                'count': count,
+                'last_used_at': last_used[(user_id, plugin_name, month, action)]
+            }
+            for (user_id, plugin_name, month, action), count in counts.items()
+        ]
+
+        with db.engine.begin() as conn:
+            conn.execute(insert(PluginUsageEvent.__table__), events)
+            conn.execute(self._counter_upsert(conn, PluginUsageCounter.__table__), counter_rows)
+
+    @staticmethod
+    def _counter_upsert(conn, table):
+        """カウンターUPSERT文（PostgreSQL / SQLite の ON CONFLICT DO UPDATE）"""
+        if conn.dialect.name == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+
+        stmt = dialect_insert(table)
+        return stmt.on_conflict_do_update(
+            index_elements=['user_id', 'plugin_name', 'month', 'action'],
+            set_={
+                'count': table.c.count + stmt.excluded.count,
+                'last_used_at': stmt.excluded.last_used_at
+            }
+        )
+
+    def _ensure_flusher(self):
+        """定期フラッシュスレッド起動（fork後のワーカーごとに1本）"""
+        pid = os.getpid()
+        if self._flusher_pid == pid:
+            return
+        with self._lock:
+            if self._flusher_pid == pid:
+                return
+            self._flusher_pid = pid
+            thread = threading.Thread(target=self._flush_loop, name='usage-tracker-flush', daemon=True)
+            thread.start()
+
+    def _flush_loop(self):
+        """flush_interval毎、またはバッチサイズ到達時にフラッシュ"""
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+
+# グローバル使用イベントトラッカー
+usage_tracker = UsageTracker()
@@ -0,0 +1,75 @@
+"""
+版数付きLRUキャッシュ
+InfluBerry v2 - ワーカー内のユーザー別キャッシュ（プラグイン設定・取引先補完・カレンダーフィード・売上予測）で共通
+キーごとに版数（users.*_version・ETag等）を保持し、呼び出し側の版数と一致する間だけ値を返す
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class VersionedLRUCache:
+    """キー → (版数, 値) のスレッドセーフなLRUキャッシュ（値に None は格納しない）"""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (version, value)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, version):
+        """版数が一致する値（なければ None）"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def get_many(self, versions):
+        """
+        複数キーの一括取得
+
+        Args:
+            versions (dict): {key: version}
+
+        Returns:
+            dict: 版数が一致したキーのみ {key: value}
+        """
+        hits = {}
+        with self._lock:
+            for key, version in versions.items():
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] == version:
+                    self._entries.move_to_end(key)
+                    hits[key] = entry[1]
+        return hits
+
+    def put(self, key, version, value):
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_create(self, key, version, factory):
+        """
+        版数が一致すればキャッシュ、なければ factory() の結果を格納して返す
+
+        factory はロック外で実行する（同時に外れた場合は重複して生成し、後勝ち）
+        """
+        value = self.get(key, version)
+        if value is None:
+            value = factory()
+            self.put(key, version, value)
+        return value
+
+    def invalidate(self, key=None):
+        """キャッシュ破棄（key省略時は全件）"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
@@ -20,6 +20,23 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///instance/influberry_dev.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # 接続プール（ワーカープロセス単位）
+    # gunicorn.conf.py はスレッド数・ワーカー数をこの値（DB_POOL_SIZE + DB_MAX_OVERFLOW）から決める
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 5))
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': DB_POOL_SIZE,
+        'max_overflow': DB_MAX_OVERFLOW,
+        'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 10)),
+        'pool_pre_ping': True
+    }
+    
+    # 読み取りレプリカ（任意）: @use_read_replica のGETエンドポイントのみ使用
+    # 本人の書き込み後 DB_REPLICA_PIN_SECONDS 秒はプライマリ、障害検知後 DB_REPLICA_RETRY_SECONDS 秒はプライマリ
+    SQLALCHEMY_REPLICA_URI = os.environ.get('DATABASE_REPLICA_URL')
+    DB_REPLICA_PIN_SECONDS = int(os.environ.get('DB_REPLICA_PIN_SECONDS', 5))
+    DB_REPLICA_RETRY_SECONDS = int(os.environ.get('DB_REPLICA_RETRY_SECONDS', 30))
+    
     # Flask-Login Configuration  
     REMEMBER_COOKIE_DURATION = timedelta(days=30)
     SESSION_PROTECTION = 'basic'
@@ -35,11 +52,113 @@ class Config:
     'http://127.0.0.1:5173',
     'http://127.0.0.1:5001'
     ]
-    
+
+    # 旧ドメイン → 新ドメイン 301リダイレクト
+    LEGACY_DOMAIN_REDIRECTS = {
+        'influberry-app.onrender.com': 'influberry.jp'
+    }
+
+    # アプリ前段の信頼できるプロキシ数（Render: 1・0で無効）
+    # クライアントIPはプロキシが付加した X-Forwarded-For の末尾から数えて決める（先頭はクライアントが偽装できる）
+    PROXY_FIX_X_FOR = int(os.environ.get('PROXY_FIX_X_FOR', 1))
+
     # Development Configuration
     DEBUG = os.environ.get('FLASK_DEBUG', '0').lower() in ['1', 'true', 'on']
     TESTING = False
     
+    # Flask-Migrate即時初期化（無効時も `flask db` 実行時に遅延初期化）
+    # Web起動時はalembicのimportを省略してコールドスタート短縮
+    ENABLE_MIGRATE = os.environ.get('ENABLE_MIGRATE', '0').lower() in ['1', 'true', 'on']
+    
+    # 起動プロファイル（create_appのフェーズ別所要時間）出力
+    STARTUP_PROFILE = os.environ.get('STARTUP_PROFILE', '0').lower() in ['1', 'true', 'on']
+    STARTUP_PROFILE_PATH = os.environ.get('STARTUP_PROFILE_PATH')
+    
+    # プラグイン探索（レジストリファイル + 任意でパッケージentry points）
+    # entry points走査はパッケージメタデータ読み込みのコストがあるため設定時のみ
+    PLUGIN_REGISTRY_PATH = os.environ.get('PLUGIN_REGISTRY_PATH')
+    PLUGIN_ENTRY_POINT_GROUP = os.environ.get('PLUGIN_ENTRY_POINT_GROUP')  # 例: 'influberry.plugins'
+    
+    # プラグイン使用イベントのバッファ書き込み（ワーカー単位）
+    USAGE_FLUSH_BATCH_SIZE = int(os.environ.get('USAGE_FLUSH_BATCH_SIZE', 200))
+    USAGE_FLUSH_INTERVAL_SECONDS = int(os.environ.get('USAGE_FLUSH_INTERVAL_SECONDS', 30))
+    
+    # プラグイン設定キャッシュ（ワーカー内・保持ユーザー数上限）
+    PLUGIN_SETTINGS_CACHE_SIZE = int(os.environ.get('PLUGIN_SETTINGS_CACHE_SIZE', 1024))
+    
+    # 取引先名補完の索引キャッシュ（ワーカー内・保持ユーザー数上限）
+    CLIENT_AUTOCOMPLETE_CACHE_SIZE = int(os.environ.get('CLIENT_AUTOCOMPLETE_CACHE_SIZE', 1024))
+    
+    # 全文検索で関連度順に並べる件数の上限（一致した行の新しい順・総件数もこの件数で頭打ち）
+    SEARCH_MAX_RESULTS = int(os.environ.get('SEARCH_MAX_RESULTS', 1000))
+    
+    # パスワードハッシュ（werkzeug形式のmethod文字列・専用スレッドで実行）
+    # methodと異なる形式の既存ハッシュはログイン成功時に再ハッシュされる
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+    PASSWORD_HASH_MAX_PENDING = int(os.environ.get('PASSWORD_HASH_MAX_PENDING', 8))
+    PASSWORD_HASH_TIMEOUT_SECONDS = float(os.environ.get('PASSWORD_HASH_TIMEOUT_SECONDS', 10))
+    
+    # ログイン失敗スロットリング（アカウント・IP単位の指数バックオフ）
+    # 失敗カウンター・メトリクスのストア。複数ワーカー・複数インスタンスでは redis://... を指定
+    LOGIN_THROTTLE_ENABLED = os.environ.get('LOGIN_THROTTLE_ENABLED', 'true').lower() == 'true'
+    LOGIN_THROTTLE_STORAGE_URI = os.environ.get('LOGIN_THROTTLE_STORAGE_URI', 'memory://')
+    LOGIN_THROTTLE_ACCOUNT_ATTEMPTS = int(os.environ.get('LOGIN_THROTTLE_ACCOUNT_ATTEMPTS', 5))
+    LOGIN_THROTTLE_IP_ATTEMPTS = int(os.environ.get('LOGIN_THROTTLE_IP_ATTEMPTS', 20))
+    LOGIN_THROTTLE_BASE_DELAY_SECONDS = float(os.environ.get('LOGIN_THROTTLE_BASE_DELAY_SECONDS', 1))
+    LOGIN_THROTTLE_MAX_DELAY_SECONDS = float(os.environ.get('LOGIN_THROTTLE_MAX_DELAY_SECONDS', 900))
+    LOGIN_THROTTLE_WINDOW_SECONDS = int(os.environ.get('LOGIN_THROTTLE_WINDOW_SECONDS', 3600))
+    # メトリクス（/api/auth/throttle-metrics）を参照できる管理者のメールアドレス（カンマ区切り）
+    ADMIN_EMAILS = [email.strip().lower() for email in os.environ.get('ADMIN_EMAILS', '').split(',') if email.strip()]
+    
+    # 請求書PDF（請求書ID + updated_at 単位でファイルキャッシュ・複数ワーカーで共有）
+    # 未生成時は INVOICE_PDF_WAIT_SECONDS 秒まで待ち、間に合わなければ202で再取得を促す
+    # キャッシュ先の既定はアプリのinstanceディレクトリ配下（起動時のカレントディレクトリに依存しない）
+    INVOICE_PDF_CACHE_DIR = os.environ.get('INVOICE_PDF_CACHE_DIR')
+    INVOICE_PDF_RENDER_WORKERS = int(os.environ.get('INVOICE_PDF_RENDER_WORKERS', 2))
+    INVOICE_PDF_WAIT_SECONDS = float(os.environ.get('INVOICE_PDF_WAIT_SECONDS', 3))
+    INVOICE_PDF_PROCESS_WORKERS = int(os.environ.get('INVOICE_PDF_PROCESS_WORKERS', 2))  # 月次一括出力用（0でプロセスプール不使用）
+    INVOICE_PDF_ARCHIVE_MAX_INVOICES = int(os.environ.get('INVOICE_PDF_ARCHIVE_MAX_INVOICES', 500))
+    
+    # メール送信（Flask-Mail）: 締切リマインダーのダイジェスト
+    # ローカル確認は scripts/smtp_sink.py を起動して MAIL_SERVER=localhost MAIL_PORT=1025
+    MAIL_SERVER = os.environ.get('MAIL_SERVER', 'localhost')
+    MAIL_PORT = int(os.environ.get('MAIL_PORT', 25))
+    MAIL_USE_TLS = os.environ.get('MAIL_USE_TLS', 'false').lower() == 'true'
+    MAIL_USE_SSL = os.environ.get('MAIL_USE_SSL', 'false').lower() == 'true'
+    MAIL_USERNAME = os.environ.get('MAIL_USERNAME')
+    MAIL_PASSWORD = os.environ.get('MAIL_PASSWORD')
+    MAIL_DEFAULT_SENDER = os.environ.get('MAIL_DEFAULT_SENDER', 'InfluBerry <noreply@influberry.jp>')
+    
+    # 締切リマインダー（`flask reminders send` を定期実行）
+    REMINDER_APP_URL = os.environ.get('FRONTEND_URL', 'https://influberry.jp')
+    
+    # カレンダーフィード（生成済みフィードのワーカー内キャッシュ・保持ユーザー数上限）
+    CALENDAR_FEED_CACHE_SIZE = int(os.environ.get('CALENDAR_FEED_CACHE_SIZE', 256))
+    CALENDAR_FEED_MAX_AGE = int(os.environ.get('CALENDAR_FEED_MAX_AGE', 900))  # 秒
+    
+    # 売上予測キャッシュ（ワーカー内・保持ユーザー数上限）
+    FORECAST_CACHE_SIZE = int(os.environ.get('FORECAST_CACHE_SIZE', 1024))
+    
+    # /api/batch（1回のバッチで実行するGET数・合計実行時間の上限）
+    BATCH_MAX_REQUESTS = int(os.environ.get('BATCH_MAX_REQUESTS', 10))
+    BATCH_TIMEOUT_SECONDS = float(os.environ.get('BATCH_TIMEOUT_SECONDS', 5))
+    
+    # アーカイブ（`flask archive run` を定期実行・完了/支払済みから経過日数・1トランザクションの移動案件数）
+    ARCHIVE_AFTER_DAYS = int(os.environ.get('ARCHIVE_AFTER_DAYS', 365))
+    ARCHIVE_BATCH_SIZE = int(os.environ.get('ARCHIVE_BATCH_SIZE', 500))
+    
+    # 請求書の年パーティション（PostgreSQL・`flask partitions ensure` で今年から何年先まで作成するか）
+    INVOICE_PARTITION_YEARS_AHEAD = int(os.environ.get('INVOICE_PARTITION_YEARS_AHEAD', 2))
+    
+    # APIレスポンスの動的圧縮（COMPRESS_MIN_SIZE バイト以上のJSON等・brotli優先）
+    # 圧縮レベルは scripts/benchmark_json_compression.py の計測結果から選定
+    # （一覧20件で brotli 5 / gzip 5 以上は削減量5%未満に対し圧縮時間が3〜5割増、brotli 9以上は10倍）
+    COMPRESS_ENABLED = os.environ.get('COMPRESS_ENABLED', 'true').lower() == 'true'
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 1024))
+    COMPRESS_GZIP_LEVEL = int(os.environ.get('COMPRESS_GZIP_LEVEL', 5))
+    COMPRESS_BROTLI_QUALITY = int(os.environ.get('COMPRESS_BROTLI_QUALITY', 5))
+    
     # Rate Limiting (Flask-Limiter)
     RATELIMIT_STORAGE_URI = 'memory://'
     RATELIMIT_DEFAULT = '100 per hour'
@@ -68,7 +187,9 @@ class TestConfig(Config):
     """Test configuration"""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    SQLALCHEMY_ENGINE_OPTIONS = {}  # インメモリDBは単一接続プールのためプール設定なし
     WTF_CSRF_ENABLED = False
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'
 
 class StagingConfig(Config):
     """Staging configuration"""
@@ -0,0 +1,149 @@
+"""
+gunicorn設定 - InfluBerry v2
+使い方: gunicorn wsgi:app（カレントディレクトリの gunicorn.conf.py を自動で読み込む）
+
+ワーカー方式は GUNICORN_WORKER_CLASS で切り替え
+- gthread（既定）: 1プロセスで複数スレッド。DB待ちの間も他のリクエストを処理
+  （DBが別ホストで往復の待ちがある構成向け。同一ホストのDBではsyncと同程度でp99は悪化:
+   scripts/benchmark_worker_modes.py --db-latency-ms で確認）
+- gevent: グリーンレット（gevent パッケージが必要。psycopg2は psycogreen があれば協調化）
+- sync: 1プロセス1リクエスト（従来動作）
+
+ワーカー数・スレッド数は未指定ならCPUコア数とDB接続プール（DB_POOL_SIZE + DB_MAX_OVERFLOW）から決める
+CPUコア数はcgroupのCPU上限を考慮し、ワーカー数 × プール上限 は DB_MAX_CONNECTIONS（既定80）を超えない
+"""
+
+import math
+import os
+import sys
+
+# PostgreSQL既定の max_connections=100 から、cron・マイグレーション・管理接続の分を残した値
+DEFAULT_MAX_CONNECTIONS = 80
+
+
+def _env_int(name, default=None):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def cgroup_cpu_limit():
+    """
+    cgroupのCPU上限（コア数・切り上げ）。上限なし・取得できない場合はNone
+    コンテナではCPUアフィニティがホスト全体のコアを返し、割り当て（quota）を反映しないため
+    """
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:  # cgroup v2: "<quota> <period>" または "max <period>"
+            quota, period = f.read().split()[:2]
+        if quota == 'max':
+            return None
+        quota, period = int(quota), int(period)
+    except (OSError, ValueError):
+        try:
+            with open('/sys/fs/cgroup/cpu/cpu.cfs_quota_us') as f:  # cgroup v1（上限なしは -1）
+                quota = int(f.read())
+            with open('/sys/fs/cgroup/cpu/cpu.cfs_period_us') as f:
+                period = int(f.read())
+        except (OSError, ValueError):
+            return None
+    if quota <= 0 or period <= 0:
+        return None
+    return max(1, math.ceil(quota / period))
+
+
+def cpu_count():
+    """利用可能なCPUコア数（コンテナのCPUアフィニティ・cgroupのCPU上限を考慮）"""
+    try:
+        cores = max(1, len(os.sched_getaffinity(0)))
+    except (AttributeError, OSError):
+        cores = os.cpu_count() or 1
+    limit = cgroup_cpu_limit()
+    return min(cores, limit) if limit else cores
+
+
+def pool_capacity():
+    """1ワーカープロセスが同時に持てるDB接続数（config.py と同じ環境変数・既定値）"""
+    return _env_int('DB_POOL_SIZE', 5) + _env_int('DB_MAX_OVERFLOW', 5)
+
+
+def default_workers(mode, cores, capacity, max_connections=None):
+    """
+    ワーカー数
+    sync はリクエスト並列数 = プロセス数のため 2×コア+1、スレッド/グリーンレット方式はコア数（最低2）
+    ワーカー数 × プール上限 が max_connections（DB_MAX_CONNECTIONS）を超えないよう制限
+    """
+    workers = cores * 2 + 1 if mode == 'sync' else max(2, cores)
+    if max_connections:
+        workers = min(workers, max(1, max_connections // capacity))
+    return workers
+
+
+def default_threads(capacity):
+    """
+    gthreadのスレッド数 = プール上限
+    接続を持てないスレッドはプール待ちになるだけなので、それ以上増やしてもスループットは上がらない
+    """
+    return capacity
+
+
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+if worker_class not in ('sync', 'gthread', 'gevent'):
+    raise RuntimeError(f'未対応のGUNICORN_WORKER_CLASSです: {worker_class}')
+
+_cores = cpu_count()
+_capacity = pool_capacity()
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '5001')}"
+workers = _env_int('GUNICORN_WORKERS') or default_workers(
+    worker_class, _cores, _capacity, _env_int('DB_MAX_CONNECTIONS', DEFAULT_MAX_CONNECTIONS)
+)
+if worker_class == 'gthread':
+    threads = _env_int('GUNICORN_THREADS') or default_threads(_capacity)
+if worker_class == 'gevent':
+    # プール上限を超えた分はプール待ち（DB_POOL_TIMEOUT）になる。DB不要のリクエスト用に余裕を持たせる
+    worker_connections = _env_int('GUNICORN_WORKER_CONNECTIONS') or _capacity * 10
+
+timeout = _env_int('GUNICORN_TIMEOUT', 30)
+graceful_timeout = _env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+keepalive = _env_int('GUNICORN_KEEPALIVE', 5)
+max_requests = _env_int('GUNICORN_MAX_REQUESTS', 0)
+max_requests_jitter = _env_int('GUNICORN_MAX_REQUESTS_JITTER', 0)
+
+# マスターでアプリを1回だけ読み込んでforkする（起動短縮・メモリ共有）
+# geventはモンキーパッチ前にアプリをimportすると協調化されないためプリロードしない
+preload_app = os.environ.get(
+    'GUNICORN_PRELOAD', '0' if worker_class == 'gevent' else '1'
+).lower() in ['1', 'true', 'on']
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG')
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def when_ready(server):
+    server.log.info(
+        f'InfluBerry gunicorn: worker_class={worker_class} workers={workers} '
+        f'threads={globals().get("threads", 1)} cores={_cores} pool_capacity={_capacity} preload={preload_app}'
+    )
+
+
+def post_fork(server, worker):
+    """
+    fork直後の初期化
+    プリロード時にマスターで作られた接続プールはソケットを子プロセスと共有してしまうため、
+    接続を閉じずに（親の接続を壊さずに）破棄し、各ワーカーで新しく接続させる
+    使用イベントのフラッシュ・パスワードハッシュのスレッドはPIDで判定して各ワーカーで再作成される
+    """
+    if worker_class == 'gevent':
+        try:
+            from psycogreen.gevent import patch_psycopg
+            patch_psycopg()
+        except ImportError:
+            server.log.warning('psycogreen が未インストールのため psycopg2 のクエリはグリーンレットを切り替えません')
+
+    wsgi = sys.modules.get('wsgi')
+    if wsgi is None:
+        return
+    from app import db
+    with wsgi.app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
@@ -90,9 +90,23 @@ def run_migrations_online():
                 directives[:] = []
                 logger.info('No changes in schema detected.')
 
+    # 検索索引・パーティション・請求書番号台帳はモデル外で管理するため自動生成の比較対象から外す
+    def include_object(object, name, type_, reflected, compare_to):
+        from app.utils import partitioning, search
+        if type_ == 'table':
+            managed = search.is_managed_table(name) or partitioning.is_managed_table(name)
+            return not (reflected and compare_to is None and managed)
+        if type_ == 'column':
+            return not (reflected and compare_to is None and search.is_managed_column(object.table.name, name))
+        if type_ == 'index':
+            return not (search.is_managed_index(name) or partitioning.is_managed_index(name))
+        return True
+
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    if conf_args.get("include_object") is None:
+        conf_args["include_object"] = include_object
 
     connectable = get_engine()
 
@@ -0,0 +1,63 @@
+"""Add plugin usage events and monthly counters
+
+Revision ID: a3f7c2e91b40
+Revises: d1ca214cfb05
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3f7c2e91b40'
+down_revision = 'd1ca214cfb05'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('plugin_usage_events',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('plugin_name', sa.String(length=50), nullable=False),
+    sa.Column('action', sa.String(length=50), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_plugin_usage_events_user_plugin_created', 'plugin_usage_events',
+                    ['user_id', 'plugin_name', 'created_at'], unique=False)
+
+    op.create_table('plugin_usage_counters',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('plugin_name', sa.String(length=50), nullable=False),
+    sa.Column('month', sa.String(length=7), nullable=False),
+    sa.Column('action', sa.String(length=50), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('last_used_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'plugin_name', 'month', 'action', name='uq_plugin_usage_counters_key')
+    )
+
+    # 既存の案件・請求書を sponsor_management の project_creation / invoice_creation として月別カウンターへ初期投入
+    # （作成日時から再構成できない機能（ダッシュボード・分析・ステータス変更）はこのマイグレーション以降の計数）
+    if op.get_bind().dialect.name == 'postgresql':
+        month_expr = "to_char(created_at, 'YYYY-MM')"
+    else:
+        month_expr = "strftime('%Y-%m', created_at)"
+    for table_name, action in (('projects', 'project_creation'), ('invoices', 'invoice_creation')):
+        op.execute(
+            "INSERT INTO plugin_usage_counters (user_id, plugin_name, month, action, count, last_used_at) "
+            f"SELECT user_id, 'sponsor_management', {month_expr}, '{action}', COUNT(*), MAX(created_at) "
+            f"FROM {table_name} WHERE created_at IS NOT NULL "
+            f"GROUP BY user_id, {month_expr}"
+        )
+
+
+def downgrade():
+    op.drop_table('plugin_usage_counters')
+    op.drop_index('ix_plugin_usage_events_user_plugin_created', table_name='plugin_usage_events')
+    op.drop_table('plugin_usage_events')
@@ -0,0 +1,50 @@
+"""Index full-text search by owner (FTS5 user_id column, (user_id, id) indexes)
+
+Revision ID: a7c4e2d9b815
+Revises: f6d3b9a2c457
+Create Date: 2026-10-20 02:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c4e2d9b815'
+down_revision = 'f6d3b9a2c457'
+branch_labels = None
+depends_on = None
+
+TABLES = ('projects', 'invoices')
+
+
+def _recreate_fts(table_name, user_id_column):
+    """FTS5仮想テーブルを列定義を変えて作り直す（索引済みの内容はそのまま移す）"""
+    op.execute(f'ALTER TABLE {table_name}_fts RENAME TO {table_name}_fts_old')
+    op.execute(
+        f'CREATE VIRTUAL TABLE {table_name}_fts USING fts5('
+        f"{user_id_column}, title, body, tokenize = 'unicode61')"
+    )
+    op.execute(
+        f'INSERT INTO {table_name}_fts (rowid, user_id, title, body) '
+        f'SELECT rowid, user_id, title, body FROM {table_name}_fts_old'
+    )
+    op.execute(f'DROP TABLE {table_name}_fts_old')
+
+
+def upgrade():
+    bind = op.get_bind()
+    for table_name in TABLES:
+        # 検索候補（ユーザーの一致行を新しい順）を索引順にたどるため
+        op.create_index(f'ix_{table_name}_user_id_id', table_name, ['user_id', 'id'], unique=False)
+        if bind.dialect.name == 'sqlite':
+            # user_id を索引対象にし、所有者の絞り込みもFTS5の索引で行う
+            _recreate_fts(table_name, 'user_id')
+
+
+def downgrade():
+    bind = op.get_bind()
+    for table_name in TABLES:
+        if bind.dialect.name == 'sqlite':
+            _recreate_fts(table_name, 'user_id UNINDEXED')
+        op.drop_index(f'ix_{table_name}_user_id_id', table_name=table_name)
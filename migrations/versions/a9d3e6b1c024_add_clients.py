@@ -0,0 +1,141 @@
+"""Add clients table and client_id on projects / invoices
+
+Revision ID: a9d3e6b1c024
+Revises: e7b2f4a8c391
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+import re
+import unicodedata
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9d3e6b1c024'
+down_revision = 'e7b2f4a8c391'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+# このリビジョン時点の照合キー（app.models.client の変更がマイグレーションに影響しないよう固定）
+_SPACES = re.compile(r'\s+')
+
+
+def normalize_client_name(name):
+    """取引先名の照合キー（NFKC・小文字化・空白除去・ひらがな→カタカナ）"""
+    normalized = unicodedata.normalize('NFKC', str(name or '')).lower()
+    normalized = _SPACES.sub('', normalized)
+    return ''.join(
+        chr(ord(ch) + 0x60) if 'ぁ' <= ch <= 'ゖ' else ch
+        for ch in normalized
+    )
+
+
+def upgrade():
+    op.create_table('clients',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('normalized_name', sa.String(length=255), nullable=False),
+    sa.Column('address', sa.Text(), nullable=True),
+    sa.Column('contact', sa.String(length=255), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'normalized_name', name='uq_clients_user_normalized_name')
+    )
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('clients_version', sa.Integer(), server_default='0', nullable=False))
+
+    for table_name in ('projects', 'invoices'):
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.add_column(sa.Column('client_id', sa.Integer(), nullable=True))
+            batch_op.create_index(batch_op.f(f'ix_{table_name}_client_id'), ['client_id'], unique=False)
+            batch_op.create_foreign_key(
+                f'fk_{table_name}_client_id_clients', 'clients', ['client_id'], ['id'], ondelete='SET NULL'
+            )
+
+    _backfill_clients(op.get_bind())
+
+
+def _backfill_clients(bind):
+    """既存の企業名・請求先から取引先を作成し client_id を設定"""
+    clients = {}  # (user_id, normalized_name) -> {name, address, contact}
+
+    def collect(user_id, name, address=None, contact=None):
+        normalized = normalize_client_name(name)
+        if not normalized:
+            return
+        client = clients.setdefault(
+            (user_id, normalized), {'name': str(name).strip(), 'address': None, 'contact': None}
+        )
+        client['address'] = client['address'] or address
+        client['contact'] = client['contact'] or contact
+
+    # 表示名は最初に登録された表記
+    for row in bind.execute(sa.text('SELECT user_id, company_name FROM projects ORDER BY id')):
+        collect(row.user_id, row.company_name)
+    for row in bind.execute(sa.text(
+        'SELECT user_id, client_company, client_address, client_contact FROM invoices ORDER BY id'
+    )):
+        collect(row.user_id, row.client_company, row.client_address, row.client_contact)
+
+    if not clients:
+        return
+
+    now = datetime.utcnow()
+    bind.execute(
+        sa.text(
+            'INSERT INTO clients (user_id, name, normalized_name, address, contact, created_at, updated_at) '
+            'VALUES (:user_id, :name, :normalized_name, :address, :contact, :now, :now)'
+        ),
+        [
+            {'user_id': user_id, 'normalized_name': normalized, 'now': now, **client}
+            for (user_id, normalized), client in clients.items()
+        ]
+    )
+    client_ids = {
+        (row.user_id, row.normalized_name): row.id
+        for row in bind.execute(sa.text('SELECT id, user_id, normalized_name FROM clients'))
+    }
+    bind.execute(sa.text('UPDATE users SET clients_version = 1'))
+
+    for table_name, name_column in (('projects', 'company_name'), ('invoices', 'client_company')):
+        last_id = 0
+        while True:
+            rows = bind.execute(
+                sa.text(
+                    f'SELECT id, user_id, {name_column} AS name FROM {table_name} '
+                    'WHERE id > :last_id ORDER BY id LIMIT :limit'
+                ),
+                {'last_id': last_id, 'limit': BATCH_SIZE}
+            ).all()
+            if not rows:
+                break
+            updates = [
+                {'id': row.id, 'client_id': client_ids[(row.user_id, normalize_client_name(row.name))]}
+                for row in rows
+                if (row.user_id, normalize_client_name(row.name)) in client_ids
+            ]
+            if updates:
+                bind.execute(sa.text(f'UPDATE {table_name} SET client_id = :client_id WHERE id = :id'), updates)
+            last_id = rows[-1].id
+
+
+def downgrade():
+    for table_name in ('invoices', 'projects'):
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.drop_constraint(f'fk_{table_name}_client_id_clients', type_='foreignkey')
+            batch_op.drop_index(batch_op.f(f'ix_{table_name}_client_id'))
+            batch_op.drop_column('client_id')
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('clients_version')
+
+    op.drop_table('clients')
@@ -0,0 +1,39 @@
+"""Add deadline_reminders sent-record table
+
+Revision ID: b2e8f5c7d913
+Revises: a9d3e6b1c024
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b2e8f5c7d913'
+down_revision = 'a9d3e6b1c024'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('deadline_reminders',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('deadline', sa.Date(), nullable=False),
+    sa.Column('sent_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('project_id', 'deadline', name='uq_deadline_reminders_project_deadline')
+    )
+    with op.batch_alter_table('deadline_reminders', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_deadline_reminders_user_id'), ['user_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('deadline_reminders', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_deadline_reminders_user_id'))
+
+    op.drop_table('deadline_reminders')
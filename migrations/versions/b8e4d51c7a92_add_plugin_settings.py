@@ -0,0 +1,40 @@
+"""Add plugin settings table and users.settings_version
+
+Revision ID: b8e4d51c7a92
+Revises: a3f7c2e91b40
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8e4d51c7a92'
+down_revision = 'a3f7c2e91b40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('plugin_settings',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('plugin_name', sa.String(length=50), nullable=False),
+    sa.Column('settings', sa.JSON(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'plugin_name', name='uq_plugin_settings_user_plugin')
+    )
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('settings_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('settings_version')
+
+    op.drop_table('plugin_settings')
@@ -0,0 +1,28 @@
+"""Add users.calendar_token for iCalendar feed
+
+Revision ID: c3f9a6d8e124
+Revises: b2e8f5c7d913
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f9a6d8e124'
+down_revision = 'b2e8f5c7d913'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('calendar_token', sa.String(length=64), nullable=True))
+        batch_op.create_index(batch_op.f('ix_users_calendar_token'), ['calendar_token'], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_calendar_token'))
+        batch_op.drop_column('calendar_token')
@@ -0,0 +1,35 @@
+"""Add deleted_records tombstone table for incremental sync
+
+Revision ID: c5a9e03d6f17
+Revises: b8e4d51c7a92
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5a9e03d6f17'
+down_revision = 'b8e4d51c7a92'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('deleted_records',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('table_name', sa.String(length=50), nullable=False),
+    sa.Column('record_id', sa.Integer(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('deleted_records', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_deleted_records_deleted_at'), ['deleted_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('deleted_records', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_deleted_records_deleted_at'))
+
+    op.drop_table('deleted_records')
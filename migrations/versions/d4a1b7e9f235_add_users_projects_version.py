@@ -0,0 +1,26 @@
+"""Add users.projects_version for revenue forecast cache
+
+Revision ID: d4a1b7e9f235
+Revises: c3f9a6d8e124
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4a1b7e9f235'
+down_revision = 'c3f9a6d8e124'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('projects_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('projects_version')
@@ -0,0 +1,88 @@
+"""Add projects_archive / invoices_archive for hot/cold archival
+
+Revision ID: e5c2a8f1b346
+Revises: d4a1b7e9f235
+Create Date: 2026-10-19 23:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5c2a8f1b346'
+down_revision = 'd4a1b7e9f235'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('projects_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('client_id', sa.Integer(), nullable=True),
+    sa.Column('company_name', sa.String(length=255), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('deadline', sa.Date(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('project_name', sa.String(length=255), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['client_id'], ['clients.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('projects_archive', schema=None) as batch_op:
+        batch_op.create_index('ix_projects_archive_user_deadline', ['user_id', 'deadline'], unique=False)
+
+    op.create_table('invoices_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('client_id', sa.Integer(), nullable=True),
+    sa.Column('invoice_number', sa.String(length=50), nullable=False),
+    sa.Column('invoice_date', sa.Date(), nullable=False),
+    sa.Column('due_date', sa.Date(), nullable=False),
+    sa.Column('subtotal', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('tax_rate', sa.Numeric(precision=5, scale=2), nullable=False),
+    sa.Column('tax_amount', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('total_amount', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('project_name', sa.String(length=255), nullable=True),
+    sa.Column('client_company', sa.String(length=255), nullable=False),
+    sa.Column('client_address', sa.Text(), nullable=True),
+    sa.Column('client_contact', sa.String(length=255), nullable=True),
+    sa.Column('influencer_name', sa.String(length=100), nullable=False),
+    sa.Column('influencer_address', sa.Text(), nullable=True),
+    sa.Column('influencer_email', sa.String(length=255), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('payment_date', sa.Date(), nullable=True),
+    sa.Column('payment_method', sa.String(length=50), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['client_id'], ['clients.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['project_id'], ['projects_archive.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('invoice_number')
+    )
+    with op.batch_alter_table('invoices_archive', schema=None) as batch_op:
+        batch_op.create_index('ix_invoices_archive_user_invoice_date', ['user_id', 'invoice_date'], unique=False)
+        batch_op.create_index('ix_invoices_archive_project_id', ['project_id'], unique=False)
+
+
+def downgrade():
+    # 戻す前に `flask archive restore` で必要な案件を元テーブルへ戻すこと（アーカイブの内容は失われる）
+    with op.batch_alter_table('invoices_archive', schema=None) as batch_op:
+        batch_op.drop_index('ix_invoices_archive_project_id')
+        batch_op.drop_index('ix_invoices_archive_user_invoice_date')
+    op.drop_table('invoices_archive')
+
+    with op.batch_alter_table('projects_archive', schema=None) as batch_op:
+        batch_op.drop_index('ix_projects_archive_user_deadline')
+    op.drop_table('projects_archive')
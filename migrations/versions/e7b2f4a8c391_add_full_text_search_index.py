@@ -0,0 +1,125 @@
+"""Add full-text search index for projects and invoices
+
+Revision ID: e7b2f4a8c391
+Revises: c5a9e03d6f17
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+import re
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7b2f4a8c391'
+down_revision = 'c5a9e03d6f17'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+
+# このリビジョン時点の索引対象・トークン化（app.utils.search の変更がマイグレーションに影響しないよう固定）
+SEARCH_SPECS = {
+    'projects': {
+        'title': ('company_name', 'project_name'),
+        'body': ('description', 'notes')
+    },
+    'invoices': {
+        'title': ('invoice_number', 'client_company', 'project_name', 'client_contact'),
+        'body': ('description', 'notes')
+    }
+}
+
+_CJK = '\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uff66-\uff9f'
+_TOKEN_PATTERN = re.compile(f'[{_CJK}]+|[^\\W_{_CJK}]+')
+_CJK_PATTERN = re.compile(f'[{_CJK}]')
+_MAX_POSITION = 16383
+
+
+def _tokenize(value):
+    """索引用トークン列（日本語の連続部分は1文字・2文字のn-gram、英数字は単語単位）"""
+    if not value:
+        return []
+    normalized = unicodedata.normalize('NFKC', str(value)).lower()
+    tokens = []
+    for run in _TOKEN_PATTERN.findall(normalized):
+        if len(run) == 1 or not _CJK_PATTERN.match(run):
+            tokens.append(run)
+            continue
+        tokens.extend(run)
+        tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def _field_tokens(row, columns):
+    tokens = []
+    for column in columns:
+        tokens.extend(_tokenize(getattr(row, column)))
+    return tokens
+
+
+def _tsvector_literal(title_tokens, body_tokens):
+    parts = []
+    position = 0
+    for weight, tokens in (('A', title_tokens), ('B', body_tokens)):
+        for token in tokens:
+            position = min(position + 1, _MAX_POSITION)
+            parts.append(f"'{token}':{position}{weight}")
+    return ' '.join(parts)
+
+
+def _write_index(bind, table_name, rows):
+    spec = SEARCH_SPECS[table_name]
+    if bind.dialect.name == 'postgresql':
+        bind.execute(
+            sa.text(f'UPDATE {table_name} SET search_vector = CAST(:document AS tsvector) WHERE id = :id'),
+            [{'id': row.id, 'document': _tsvector_literal(_field_tokens(row, spec['title']),
+                                                          _field_tokens(row, spec['body']))} for row in rows]
+        )
+    elif bind.dialect.name == 'sqlite':
+        bind.execute(
+            sa.text(f'INSERT INTO {table_name}_fts (rowid, user_id, title, body) VALUES (:id, :user_id, :title, :body)'),
+            [{'id': row.id, 'user_id': row.user_id,
+              'title': ' '.join(_field_tokens(row, spec['title'])),
+              'body': ' '.join(_field_tokens(row, spec['body']))} for row in rows]
+        )
+
+
+def upgrade():
+    bind = op.get_bind()
+    for table_name, spec in SEARCH_SPECS.items():
+        if bind.dialect.name == 'sqlite':
+            op.execute(
+                f'CREATE VIRTUAL TABLE IF NOT EXISTS {table_name}_fts USING fts5('
+                f"user_id UNINDEXED, title, body, tokenize = 'unicode61')"
+            )
+        elif bind.dialect.name == 'postgresql':
+            op.execute(f'ALTER TABLE {table_name} ADD COLUMN IF NOT EXISTS search_vector tsvector')
+            op.execute(
+                f'CREATE INDEX IF NOT EXISTS ix_{table_name}_search_vector ON {table_name} USING gin (search_vector)'
+            )
+
+        # 既存行の索引作成
+        columns = ', '.join(('id', 'user_id') + spec['title'] + spec['body'])
+        last_id = 0
+        while True:
+            rows = bind.execute(
+                sa.text(f'SELECT {columns} FROM {table_name} WHERE id > :last_id ORDER BY id LIMIT :limit'),
+                {'last_id': last_id, 'limit': BATCH_SIZE}
+            ).all()
+            if not rows:
+                break
+            _write_index(bind, table_name, rows)
+            last_id = rows[-1].id
+
+
+def downgrade():
+    bind = op.get_bind()
+    for table_name in SEARCH_SPECS:
+        if bind.dialect.name == 'sqlite':
+            op.execute(f'DROP TABLE IF EXISTS {table_name}_fts')
+        elif bind.dialect.name == 'postgresql':
+            op.execute(f'DROP INDEX IF EXISTS ix_{table_name}_search_vector')
+            op.execute(f'ALTER TABLE {table_name} DROP COLUMN IF EXISTS search_vector')
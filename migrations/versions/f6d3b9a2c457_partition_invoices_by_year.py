@@ -0,0 +1,215 @@
+"""Partition invoices by invoice_date year (PostgreSQL only)
+
+Revision ID: f6d3b9a2c457
+Revises: e5c2a8f1b346
+Create Date: 2026-10-20 01:00:00.000000
+
+"""
+from datetime import date
+
+from alembic import op
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision = 'f6d3b9a2c457'
+down_revision = 'e5c2a8f1b346'
+branch_labels = None
+depends_on = None
+
+# このリビジョン時点の変換SQL（app.utils.partitioning の変更がマイグレーションに影響しないよう固定）
+PARTITIONED_TABLE = 'invoices'
+PARTITION_COLUMN = 'invoice_date'
+DEFAULT_PARTITION = 'invoices_default'
+NUMBER_REGISTRY = 'invoice_numbers'
+NUMBER_COLUMN = 'invoice_number'
+DEFAULT_YEARS_AHEAD = 2
+
+
+def partition_name(year):
+    return f'{PARTITIONED_TABLE}_y{year}'
+
+
+def is_partitioned(connection, table_name=PARTITIONED_TABLE):
+    if connection.dialect.name != 'postgresql':
+        return False
+    return connection.execute(
+        text('SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:name))'),
+        {'name': table_name}
+    ).scalar()
+
+
+def _table_definition(connection, table_name):
+    """索引（主キー以外）・外部キー・idシーケンス"""
+    indexes = connection.execute(text(
+        'SELECT pg_get_indexdef(ix.indexrelid), ix.indisunique FROM pg_index ix '
+        'WHERE ix.indrelid = to_regclass(:name) AND NOT ix.indisprimary'
+    ), {'name': table_name}).all()
+    foreign_keys = connection.execute(text(
+        "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint "
+        "WHERE conrelid = to_regclass(:name) AND contype = 'f'"
+    ), {'name': table_name}).all()
+    sequence = connection.execute(
+        text("SELECT pg_get_serial_sequence(:name, 'id')"), {'name': table_name}
+    ).scalar()
+    return indexes, foreign_keys, sequence
+
+
+def _index_columns(definition):
+    return definition.split(' USING ', 1)[1]
+
+
+def _recreate(connection, table_name, indexes, foreign_keys, sequence):
+    for name, definition in foreign_keys:
+        connection.execute(text(f'ALTER TABLE {table_name} ADD CONSTRAINT {name} {definition}'))
+    for definition, _ in indexes:
+        connection.execute(text(definition))
+    if sequence:
+        connection.execute(text(f'ALTER SEQUENCE {sequence} OWNED BY {table_name}.id'))
+
+
+def _create_partition(connection, year):
+    """
+    年パーティションの作成（invoices_default に該当年の行があれば移してから接続）
+
+    Returns:
+        int: invoices_default から移した行数
+    """
+    name = partition_name(year)
+    start, end = date(year, 1, 1).isoformat(), date(year + 1, 1, 1).isoformat()
+    bounds = f"FOR VALUES FROM ('{start}') TO ('{end}')"
+    in_range = f"{PARTITION_COLUMN} >= '{start}' AND {PARTITION_COLUMN} < '{end}'"
+
+    # 既定パーティションへの書き込みを止めてから確認（確認後に入った行で接続が失敗しないように）
+    connection.execute(text(f'LOCK TABLE {DEFAULT_PARTITION} IN EXCLUSIVE MODE'))
+    if not connection.execute(text(f'SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE {in_range})')).scalar():
+        connection.execute(text(f'CREATE TABLE {name} PARTITION OF {PARTITIONED_TABLE} {bounds}'))
+        return 0
+
+    connection.execute(text(
+        f'CREATE TABLE {name} (LIKE {PARTITIONED_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+    ))
+    moved = connection.execute(text(
+        f'WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE {in_range} RETURNING *) '
+        f'INSERT INTO {name} SELECT * FROM moved'
+    )).rowcount
+    connection.execute(text(f'ALTER TABLE {PARTITIONED_TABLE} ATTACH PARTITION {name} {bounds}'))
+    # 既定パーティションからの削除で台帳から外れた番号を戻す（接続前の挿入はトリガー対象外）
+    connection.execute(text(
+        f'INSERT INTO {NUMBER_REGISTRY} ({NUMBER_COLUMN}) SELECT {NUMBER_COLUMN} FROM {name} '
+        f'ON CONFLICT DO NOTHING'
+    ))
+    return moved
+
+
+def _create_number_registry(connection):
+    connection.execute(text(
+        f'CREATE TABLE {NUMBER_REGISTRY} ({NUMBER_COLUMN} VARCHAR(50) PRIMARY KEY)'
+    ))
+    connection.execute(text(
+        f'INSERT INTO {NUMBER_REGISTRY} ({NUMBER_COLUMN}) SELECT {NUMBER_COLUMN} FROM {PARTITIONED_TABLE}'
+    ))
+    connection.execute(text(f"""
+        CREATE OR REPLACE FUNCTION {NUMBER_REGISTRY}_sync() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('DELETE', 'UPDATE') THEN
+                DELETE FROM {NUMBER_REGISTRY} WHERE {NUMBER_COLUMN} = OLD.{NUMBER_COLUMN};
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO {NUMBER_REGISTRY} ({NUMBER_COLUMN}) VALUES (NEW.{NUMBER_COLUMN});
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """))
+    # パーティション間を移動するUPDATEはDELETE + INSERTとして発火する
+    connection.execute(text(
+        f'CREATE TRIGGER {NUMBER_REGISTRY}_sync AFTER INSERT OR DELETE OR UPDATE OF {NUMBER_COLUMN} '
+        f'ON {PARTITIONED_TABLE} FOR EACH ROW EXECUTE FUNCTION {NUMBER_REGISTRY}_sync()'
+    ))
+
+
+def partition_invoices(connection, years_ahead=DEFAULT_YEARS_AHEAD, today=None):
+    """
+    invoices をパーティションテーブルへ変換（既存行は請求日の年のパーティションへ移す）
+
+    Returns:
+        bool: 変換した場合True（PostgreSQL以外・変換済みなら何もしない）
+    """
+    if connection.dialect.name != 'postgresql' or is_partitioned(connection):
+        return False
+
+    today = today or date.today()
+    indexes, foreign_keys, sequence = _table_definition(connection, PARTITIONED_TABLE)
+    years = set(connection.execute(text(
+        f'SELECT DISTINCT CAST(EXTRACT(YEAR FROM {PARTITION_COLUMN}) AS INTEGER) FROM {PARTITIONED_TABLE}'
+    )).scalars())
+    years |= set(range(today.year, today.year + years_ahead + 1))
+
+    if sequence:
+        connection.execute(text(f'ALTER SEQUENCE {sequence} OWNED BY NONE'))
+    connection.execute(text(f'ALTER TABLE {PARTITIONED_TABLE} RENAME TO {PARTITIONED_TABLE}_unpartitioned'))
+    connection.execute(text(
+        f'CREATE TABLE {PARTITIONED_TABLE} (LIKE {PARTITIONED_TABLE}_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+        f'PARTITION BY RANGE ({PARTITION_COLUMN})'
+    ))
+    connection.execute(text(f'CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {PARTITIONED_TABLE} DEFAULT'))
+    for year in sorted(years):
+        _create_partition(connection, year)
+
+    # 索引は行を移した後に作成（名前は旧テーブルの削除で空く）
+    connection.execute(text(f'INSERT INTO {PARTITIONED_TABLE} SELECT * FROM {PARTITIONED_TABLE}_unpartitioned'))
+    connection.execute(text(f'DROP TABLE {PARTITIONED_TABLE}_unpartitioned'))
+    connection.execute(text(
+        f'ALTER TABLE {PARTITIONED_TABLE} ADD CONSTRAINT {PARTITIONED_TABLE}_pkey PRIMARY KEY (id, {PARTITION_COLUMN})'
+    ))
+    indexes = [
+        (definition.replace('CREATE UNIQUE INDEX', 'CREATE INDEX', 1), False)
+        if unique and PARTITION_COLUMN not in _index_columns(definition) else (definition, unique)
+        for definition, unique in indexes
+    ]
+    _recreate(connection, PARTITIONED_TABLE, indexes, foreign_keys, sequence)
+    _create_number_registry(connection)
+    return True
+
+
+def unpartition_invoices(connection):
+    """パーティションテーブルを単一テーブルへ戻す（請求書番号の一意索引を復元）"""
+    if not is_partitioned(connection):
+        return False
+
+    indexes, foreign_keys, sequence = _table_definition(connection, PARTITIONED_TABLE)
+    connection.execute(text(f'DROP TRIGGER {NUMBER_REGISTRY}_sync ON {PARTITIONED_TABLE}'))
+    connection.execute(text(f'DROP FUNCTION {NUMBER_REGISTRY}_sync()'))
+    connection.execute(text(f'DROP TABLE {NUMBER_REGISTRY}'))
+
+    if sequence:
+        connection.execute(text(f'ALTER SEQUENCE {sequence} OWNED BY NONE'))
+    connection.execute(text(f'ALTER TABLE {PARTITIONED_TABLE} RENAME TO {PARTITIONED_TABLE}_partitioned'))
+    connection.execute(text(
+        f'CREATE TABLE {PARTITIONED_TABLE} (LIKE {PARTITIONED_TABLE}_partitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+    ))
+    connection.execute(text(f'INSERT INTO {PARTITIONED_TABLE} SELECT * FROM {PARTITIONED_TABLE}_partitioned'))
+    connection.execute(text(f'DROP TABLE {PARTITIONED_TABLE}_partitioned'))
+    connection.execute(text(f'ALTER TABLE {PARTITIONED_TABLE} ADD CONSTRAINT {PARTITIONED_TABLE}_pkey PRIMARY KEY (id)'))
+    indexes = [
+        (
+            definition.replace(' ON ONLY ', ' ON ', 1).replace('CREATE INDEX', 'CREATE UNIQUE INDEX', 1)
+            if _index_columns(definition).strip() == f'btree ({NUMBER_COLUMN})'
+            else definition.replace(' ON ONLY ', ' ON ', 1),
+            unique
+        )
+        for definition, unique in indexes
+    ]
+    _recreate(connection, PARTITIONED_TABLE, indexes, foreign_keys, sequence)
+    return True
+
+
+def upgrade():
+    # SQLiteは単一テーブルのまま（PostgreSQL以外では何もしない）
+    # 既存行は同じトランザクション内で各年のパーティションへ移す（行数に比例した時間、invoicesへの書き込みは待機）
+    partition_invoices(op.get_bind())
+
+
+def downgrade():
+    unpartition_invoices(op.get_bind())
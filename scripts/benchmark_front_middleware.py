@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+InfluBerry v2 - フロントWSGIミドルウェア ベンチマーク
+目的: FrontMiddlewareで短絡応答するリクエストとFlask全処理を通るリクエストの1件あたり処理時間比較
+使い方: python scripts/benchmark_front_middleware.py [リクエスト数]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from werkzeug.test import EnvironBuilder
+from app import create_app
+
+# (ラベル, パス, Host) — 上段: ミドルウェア応答 / 下段: Flask全処理
+SCENARIOS = [
+    ('health (middleware)', '/health', 'influberry.jp'),
+    ('index.html (middleware)', '/', 'influberry.jp'),
+    ('legacy redirect (middleware)', '/projects', 'influberry-app.onrender.com'),
+    ('index.html (Flask SPA fallback)', '/projects', 'influberry.jp'),
+    ('/api (Flask)', '/api', 'influberry.jp'),
+]
+
+
+def run_request(app, environ):
+    """WSGIアプリを直接呼び出してレスポンスを読み切る"""
+    def start_response(status, headers, exc_info=None):
+        return None
+
+    body = app(dict(environ), start_response)
+    try:
+        for _ in body:
+            pass
+    finally:
+        if hasattr(body, 'close'):
+            body.close()
+
+
+def benchmark(iterations):
+    """シナリオ別の平均処理時間を計測"""
+    app = create_app('testing')
+
+    print(f"=== FrontMiddleware ベンチマーク ({iterations}回/シナリオ) ===")
+    for label, path, host in SCENARIOS:
+        environ = EnvironBuilder(path=path, headers={'Host': host}).get_environ()
+
+        # ウォームアップ
+        for _ in range(50):
+            run_request(app, environ)
+
+        start = time.perf_counter()
+        for _ in range(iterations):
+            run_request(app, environ)
+        elapsed = time.perf_counter() - start
+
+        print(f"{label:<34} {elapsed / iterations * 1e6:8.1f} µs/req")
+
+
+if __name__ == '__main__':
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+InfluBerry v2 - 請求書テーブルの年単位パーティションのベンチマーク（PostgreSQL）
+目的: 数百万件の請求書で、単一テーブルとパーティション化後（マイグレーション f6d3b9a2c457 の変換）の
+      請求日で範囲を絞るクエリの実行時間・読み取りブロック数・走査したテーブルを比較する
+使い方: python scripts/benchmark_invoice_partitioning.py --database-url postgresql://... [--rows 2000000]
+      （作業用スキーマ bench_partitioning を作成し、終了時に削除する）
+"""
+
+import argparse
+import importlib.util
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date
+
+from sqlalchemy import create_engine, text
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app import db
+from app.models.client import Client
+from app.models.invoice import Invoice
+from app.models.project import Project
+from app.models.user import User
+
+SCHEMA = 'bench_partitioning'
+REVISION_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'migrations', 'versions', 'f6d3b9a2c457_partition_invoices_by_year.py'
+)
+
+
+def load_revision():
+    """パーティション化マイグレーション（変換・復元の関数をそのまま使う）"""
+    spec = importlib.util.spec_from_file_location('partition_invoices_revision', REVISION_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def month_range(year, month):
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return date(year, month, 1), end
+
+
+def seed(engine, revision, rows, users, years, today):
+    """ユーザー・案件・請求書（請求日は years 年前から今日まで一様）を作成"""
+    first_day = date(today.year - years + 1, 1, 1)
+    with engine.begin() as connection:
+        tables = [User.__table__, Client.__table__, Project.__table__, Invoice.__table__]
+        db.metadata.create_all(connection, tables=tables)
+        # create_all ではパーティション化されるため、マイグレーション前と同じ単一テーブルに戻す
+        revision.unpartition_invoices(connection)
+
+        connection.execute(text(
+            "INSERT INTO users (username, email, password_hash, is_active, plan_type, "
+            "settings_version, clients_version, projects_version, created_at, updated_at) "
+            "SELECT 'bench' || g, 'bench' || g || '@example.com', 'x', true, 'free', 0, 0, 0, now(), now() "
+            "FROM generate_series(1, :users) g"
+        ), {'users': users})
+        connection.execute(text(
+            "INSERT INTO projects (user_id, company_name, amount, deadline, description, status, created_at, updated_at) "
+            "SELECT (g % :users) + 1, '株式会社サンプル', 100000, :today, 'ベンチマーク案件', 'completed', now(), now() "
+            "FROM generate_series(1, :users * 5) g"
+        ), {'users': users, 'today': today})
+        connection.execute(text(
+            "INSERT INTO invoices (user_id, project_id, invoice_number, invoice_date, due_date, subtotal, tax_rate, "
+            "tax_amount, total_amount, client_company, influencer_name, status, description, created_at, updated_at) "
+            "SELECT d.user_id, d.user_id + :users * (g % 5), 'INV-B-' || g, d.invoice_date, d.invoice_date + 30, "
+            "100000, 10, 10000, 110000, '株式会社サンプル', 'ベンチ', "
+            "(ARRAY['draft', 'sent', 'paid', 'paid'])[1 + g % 4], 'ベンチマーク請求', d.invoice_date, d.invoice_date "
+            "FROM generate_series(1, :rows) g, LATERAL (SELECT "
+            "  1 + floor(random() * :users)::int AS user_id, "
+            "  CAST(:first_day AS date) + floor(random() * (CAST(:today AS date) - CAST(:first_day AS date) + 1))::int AS invoice_date "
+            "  WHERE g > 0) d"
+        ), {'rows': rows, 'users': users, 'first_day': first_day, 'today': today})
+        connection.execute(text('ANALYZE'))
+
+
+def scenarios(today):
+    """計測するクエリ（アプリの請求日で範囲を絞るクエリと同じ条件）"""
+    month_start, next_month = month_range(today.year, today.month)
+    report_start, report_end = month_range(today.year - 2, today.month)
+    return [
+        ('今月の件数 /api/invoices/stats',
+         'SELECT count(*) FROM invoices WHERE user_id = :user_id '
+         'AND invoice_date >= :start AND invoice_date < :end',
+         {'start': month_start, 'end': next_month}),
+        ('月次一括出力 /api/invoices/pdf-archive（2年前の同月）',
+         'SELECT * FROM invoices WHERE user_id = :user_id AND invoice_date >= :start AND invoice_date < :end '
+         'ORDER BY invoice_date, id LIMIT 101',
+         {'start': report_start, 'end': report_end}),
+        ('期間指定一覧 /api/invoices/?date_from&date_to（前年の四半期）',
+         'SELECT * FROM invoices WHERE user_id = :user_id AND invoice_date >= :start AND invoice_date <= :end '
+         'ORDER BY created_at DESC LIMIT 10',
+         {'start': date(today.year - 1, 1, 1), 'end': date(today.year - 1, 3, 31)}),
+        ('月次集計（全ユーザー・今月）',
+         'SELECT status, count(*), sum(total_amount) FROM invoices '
+         'WHERE invoice_date >= :start AND invoice_date < :end GROUP BY status',
+         {'start': month_start, 'end': next_month}),
+    ]
+
+
+def relations(plan):
+    names = {plan['Relation Name']} if 'Relation Name' in plan else set()
+    for child in plan.get('Plans', []):
+        names |= relations(child)
+    return names
+
+
+def measure(engine, sql, params, user_ids):
+    """実行時間（中央値）と、1回分の読み取りブロック数・走査テーブル"""
+    with engine.connect() as connection:
+        for user_id in user_ids[:3]:  # ウォームアップ
+            connection.execute(text(sql), {**params, 'user_id': user_id}).all()
+        timings = []
+        for user_id in user_ids:
+            start = time.perf_counter()
+            connection.execute(text(sql), {**params, 'user_id': user_id}).all()
+            timings.append((time.perf_counter() - start) * 1000)
+        plan = connection.execute(
+            text(f'EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}'), {**params, 'user_id': user_ids[0]}
+        ).scalar()[0]['Plan']
+    blocks = plan.get('Shared Hit Blocks', 0) + plan.get('Shared Read Blocks', 0)
+    return statistics.median(timings), blocks, sorted(relations(plan))
+
+
+def report(engine, today, user_ids):
+    results = []
+    for label, sql, params in scenarios(today):
+        millis, blocks, scanned = measure(engine, sql, params, user_ids)
+        results.append((label, millis, blocks))
+        print(f'  {label}')
+        print(f"    {millis:8.2f} ms  {blocks:>8,} blocks  走査: {', '.join(scanned)}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='請求書テーブルのパーティションベンチマーク')
+    parser.add_argument('--database-url', default=os.environ.get('DATABASE_URL'), help='PostgreSQL（既定: DATABASE_URL）')
+    parser.add_argument('--rows', type=int, default=2_000_000, help='請求書の件数 (既定: 2000000)')
+    parser.add_argument('--users', type=int, default=1000, help='ユーザー数 (既定: 1000)')
+    parser.add_argument('--years', type=int, default=8, help='請求日の年数（今年まで） (既定: 8)')
+    parser.add_argument('--queries', type=int, default=50, help='クエリごとの計測回数 (既定: 50)')
+    args = parser.parse_args()
+
+    database_url = (args.database_url or '').replace('postgres://', 'postgresql://', 1)
+    if not database_url.startswith('postgresql'):
+        parser.error('PostgreSQLの --database-url を指定してください')
+
+    admin = create_engine(database_url)
+    with admin.begin() as connection:
+        connection.execute(text(f'DROP SCHEMA IF EXISTS {SCHEMA} CASCADE'))
+        connection.execute(text(f'CREATE SCHEMA {SCHEMA}'))
+    engine = create_engine(database_url, connect_args={'options': f'-csearch_path={SCHEMA}'})
+
+    try:
+        today = date.today()
+        start = time.perf_counter()
+        revision = load_revision()
+        seed(engine, revision, args.rows, args.users, args.years, today)
+        print(f'請求書 {args.rows:,}件 / ユーザー {args.users:,} / {args.years}年分 '
+              f'（投入 {time.perf_counter() - start:.1f}秒）')
+        user_ids = random.Random(42).sample(range(1, args.users + 1), min(args.queries, args.users))
+
+        print('\n[単一テーブル]')
+        flat = report(engine, today, user_ids)
+
+        start = time.perf_counter()
+        with engine.begin() as connection:
+            revision.partition_invoices(connection, today=today)
+            connection.execute(text('ANALYZE'))
+        print(f'\n[パーティション化]（変換 {time.perf_counter() - start:.1f}秒）')
+        partitioned = report(engine, today, user_ids)
+
+        print('\n[比較]')
+        for (label, flat_ms, flat_blocks), (_, part_ms, part_blocks) in zip(flat, partitioned):
+            print(f'  {label}: {flat_ms / part_ms:.1f}倍速 / 読み取りブロック {part_blocks / max(flat_blocks, 1):.0%}')
+    finally:
+        engine.dispose()
+        with admin.begin() as connection:
+            connection.execute(text(f'DROP SCHEMA IF EXISTS {SCHEMA} CASCADE'))
+        admin.dispose()
+
+
+if __name__ == '__main__':
+    main()
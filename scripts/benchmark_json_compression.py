@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+InfluBerry v2 - APIレスポンス圧縮レベルのベンチマーク
+目的: 案件・請求書一覧など典型的なJSONレスポンスについて、gzipレベル・brotli品質ごとの
+      圧縮率と圧縮時間を計測し、COMPRESS_GZIP_LEVEL / COMPRESS_BROTLI_QUALITY を選定する
+使い方: python scripts/benchmark_json_compression.py [案件数（既定: 100）]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+# スレッド間で共有できるファイルDBを使用（テスト設定のインメモリDBは使わない）
+_db_dir = tempfile.mkdtemp(prefix='influberry-compress-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_db_dir, 'bench.db')}"
+os.environ['COMPRESS_ENABLED'] = 'false'  # 非圧縮のレスポンス本文を取得する
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app import create_app, db
+from app.models.invoice import Invoice
+from app.models.project import Project
+from app.models.user import User
+from app.utils.response_compression import brotli, compress_bytes
+
+EMAIL = 'bench@example.com'
+PASSWORD = 'benchmark-password'
+
+COMPANIES = ['株式会社サンプル', 'ACME Japan合同会社', '有限会社テスト商事', '株式会社ビューティーラボ', 'Fooコスメ株式会社']
+PHRASES = [
+    '新商品のスキンケアラインをInstagramのフィード投稿とストーリーズで紹介。',
+    'YouTubeで使用感レビュー動画（10分程度）を制作し、概要欄に購入リンクを掲載。',
+    '撮影はブランド指定のスタジオで実施、衣装・ヘアメイクは先方手配。',
+    '投稿前に構成案と下書きを提出し、先方確認後に公開する。',
+    'PR表記を必ず入れること。二次利用は3ヶ月まで可。',
+    'キャンペーン期間中はハッシュタグ #新作コスメ を付与。',
+]
+
+
+def text(rng, sentences):
+    return ''.join(rng.choice(PHRASES) for _ in range(sentences))
+
+
+def seed(app, count):
+    """典型的な文字量の案件・請求書を作成"""
+    rng = random.Random(42)
+    with app.app_context():
+        db.create_all(bind_key=None)
+        user = User(username='bench', email=EMAIL, password=PASSWORD, influencer_name='ベンチ')
+        db.session.add(user)
+        db.session.commit()
+        for i in range(count):
+            project = Project(
+                user.id, rng.choice(COMPANIES), rng.randint(1, 50) * 10000,
+                date.today() + timedelta(days=rng.randint(-60, 90)), text(rng, rng.randint(2, 6)),
+                project_name=f'{rng.choice(["春", "夏", "秋", "冬"])}の新作PR 第{i + 1}弾',
+                notes=text(rng, rng.randint(0, 3)), status=rng.choice(['proposed', 'contracted', 'completed'])
+            )
+            db.session.add(project)
+            db.session.flush()
+            if i % 2 == 0:
+                db.session.add(Invoice.create_from_project(project))
+                db.session.flush()
+        db.session.commit()
+
+
+def payloads(app):
+    """計測対象のレスポンス本文（非圧縮）"""
+    client = app.test_client()
+    client.post('/api/auth/login', json={'email': EMAIL, 'password': PASSWORD})
+    paths = [
+        '/api/projects/?per_page=20',
+        '/api/projects/?per_page=100',
+        '/api/invoices/?per_page=20',
+        '/api/dashboard/summary',
+        '/api/users/stats',
+    ]
+    return [(path, client.get(path).get_data()) for path in paths]
+
+
+def measure(data, encoding, level, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        compressed = compress_bytes(data, encoding, level)
+    return len(compressed), (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    app = create_app('staging')
+    app.config['SESSION_COOKIE_SECURE'] = False
+    seed(app, count)
+
+    candidates = [('gzip', level) for level in range(1, 10)]
+    if brotli is not None:
+        candidates += [('br', quality) for quality in range(0, 12)]
+    else:
+        print('WARNING: brotli未インストールのためgzipのみ計測します')
+
+    for path, data in payloads(app):
+        print(f'\n{path}  {len(data):,} bytes')
+        if len(data) < 1024:
+            print('  （1KB未満: 圧縮対象外）')
+            continue
+        print(f"  {'encoding':<8} {'level':>5} {'size':>9} {'ratio':>7} {'time(us)':>10}")
+        repeat = max(3, 2_000_000 // len(data))
+        for encoding, level in candidates:
+            size, micros = measure(data, encoding, level, repeat)
+            print(f'  {encoding:<8} {level:>5} {size:>9,} {size / len(data):>7.1%} {micros:>10.0f}')
+
+
+if __name__ == '__main__':
+    main()
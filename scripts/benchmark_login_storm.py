@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+InfluBerry v2 - ログイン集中時のレイテンシ ベンチマーク
+目的: ログインが集中している間も、認証以外のAPI（/api/auth/test）の応答時間が保たれるか確認
+      パスワードハッシュ専用スレッドを上限付き（設定値）と実質無制限で比較する
+使い方: python scripts/benchmark_login_storm.py [ログイン同時数] [計測秒数]
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+# スレッド間で共有できるファイルDBを使用（テスト設定のインメモリDBは使わない）
+_db_dir = tempfile.mkdtemp(prefix='influberry-bench-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_db_dir, 'bench.db')}"
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app import create_app, db
+from app.models.user import User
+from app.utils.password_hashing import password_hasher
+
+EMAIL = 'bench@example.com'
+PASSWORD = 'benchmark-password'
+
+
+def percentile(values, pct):
+    """パーセンタイル（ms）"""
+    if not values:
+        return float('nan')
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(len(ordered) * pct / 100))
+    return ordered[index] * 1000
+
+
+def probe(app, stop, samples):
+    """認証以外のAPIを逐次呼び出して応答時間を記録"""
+    client = app.test_client()
+    while not stop.is_set():
+        start = time.perf_counter()
+        client.get('/api/auth/test')
+        samples.append(time.perf_counter() - start)
+        time.sleep(0.005)
+
+
+def login_storm(app, stop, results):
+    """ログインを連続実行してステータス別件数を記録"""
+    client = app.test_client()
+    while not stop.is_set():
+        response = client.post('/api/auth/login', json={'email': EMAIL, 'password': PASSWORD})
+        results[response.status_code] = results.get(response.status_code, 0) + 1
+        if response.status_code == 503:
+            # 混雑時はクライアント側で少し待ってから再試行する想定
+            time.sleep(0.05)
+
+
+def run(app, concurrency, seconds, storm):
+    """probe + （任意で）ログイン集中を一定時間実行"""
+    stop = threading.Event()
+    samples, results = [], {}
+    threads = [threading.Thread(target=probe, args=(app, stop, samples))]
+    if storm:
+        threads += [
+            threading.Thread(target=login_storm, args=(app, stop, results))
+            for _ in range(concurrency)
+        ]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return samples, results
+
+
+def report(label, samples, results, seconds):
+    logins = results.get(200, 0)
+    print(f"{label:<28} probe p50 {percentile(samples, 50):7.1f} ms  "
+          f"p95 {percentile(samples, 95):7.1f} ms  "
+          f"mean {statistics.mean(samples) * 1000 if samples else float('nan'):7.1f} ms  "
+          f"login {logins / seconds:6.1f}/s  503 {results.get(503, 0)}")
+
+
+def benchmark(concurrency, seconds):
+    app = create_app('staging')
+    with app.app_context():
+        db.create_all()
+        if not User.query.filter_by(email=EMAIL).first():
+            User.create('bench', EMAIL, PASSWORD)
+
+    configured = (password_hasher.workers, password_hasher.max_pending)
+    print(f"=== ログイン集中ベンチマーク (method={password_hasher.method}, "
+          f"同時ログイン={concurrency}, {seconds}秒, CPU={os.cpu_count()}) ===")
+
+    samples, results = run(app, concurrency, seconds, storm=False)
+    report('baseline (no logins)', samples, results, seconds)
+
+    for label, workers, max_pending in (
+        (f'bounded ({configured[0]}+{configured[1]})', configured[0], configured[1]),
+        (f'unbounded ({concurrency})', concurrency, concurrency),
+    ):
+        password_hasher.workers, password_hasher.max_pending = workers, max_pending
+        password_hasher._slots = threading.BoundedSemaphore(workers + max_pending)
+        password_hasher._executor_pid = None
+        samples, results = run(app, concurrency, seconds, storm=True)
+        report(label, samples, results, seconds)
+
+
+if __name__ == '__main__':
+    benchmark(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 16,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 5
+    )
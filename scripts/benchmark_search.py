@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+InfluBerry v2 - 全文検索（/api/projects/search と同じ search()）のベンチマーク
+目的: 1ユーザーあたり10万件以上の案件があっても、頻出語・中頻度語・稀な語・複数語AND・深いページの
+      検索が一定時間内に返るか確認する（他ユーザーの案件も同じ索引に入った状態で計測。
+      計測対象ユーザーの後に小規模ユーザーの案件を投入し、計測対象の行が古い範囲に偏った状態にする）
+使い方: python scripts/benchmark_search.py --database-url postgresql://... [--users 5] [--rows-per-user 100000]
+      [--other-users 200] [--other-rows-per-user 500]
+      （PostgreSQLは作業用スキーマ bench_search を作成し、終了時に削除する。
+        --database-url 省略時は一時ファイルのSQLite（FTS5）で計測）
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections import namedtuple
+from datetime import date, datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SCHEMA = 'bench_search'
+BATCH_SIZE = 5000
+
+COMPANIES = ['株式会社サンプル', '東京コスメ', 'グリーンフーズ', 'ABCアパレル', 'スマイル旅行', 'Nova Tech']
+# 頻度の偏った語彙（先頭ほど頻出: 頻出語はユーザーの案件の大半に、末尾の語はごく一部に現れる）
+WORDS = (
+    ['PR', '投稿', 'インスタ', '動画', 'キャンペーン', '新商品', 'レビュー', 'YouTube', 'ストーリーズ', '撮影']
+    + [f'{prefix}{suffix}' for prefix in ('春', '夏', '秋', '冬', '限定', '公式', '店舗', '海外')
+       for suffix in ('コラボ', 'ライブ', 'イベント', 'セール', '企画', '特集', 'ギフト', '体験')]
+    + [f'item{i}' for i in range(400)]
+)
+Row = namedtuple('Row', 'id user_id company_name project_name description notes')
+
+# (表示名, 検索語, ページ)
+SCENARIOS = [
+    ('頻出語（大半の案件に一致）', 'PR', 1),
+    ('頻出語・10ページ目', 'PR', 10),
+    ('中頻度語', '夏コラボ', 1),
+    ('稀な語', 'item399', 1),
+    ('複数語AND（頻出×中頻度）', 'インスタ 限定セール', 1),
+    ('日本語の部分一致（1文字）', '夏', 1),
+]
+
+
+def text_of(rng, count):
+    return ' '.join(rng.choices(WORDS, weights=[1 / (i + 1) for i in range(len(WORDS))], k=count))
+
+
+def seed(app, users, rows_per_user, other_users, other_rows_per_user):
+    """
+    ユーザー・案件を投入し、検索索引を作成
+    （計測対象ユーザーに rows_per_user 件ずつ、その後に他ユーザーに other_rows_per_user 件ずつ）
+    """
+    from sqlalchemy import text
+
+    from app import db
+    from app.models.project import Project
+    from app.models.user import User
+    from app.utils.search import write_index
+
+    rng = random.Random(42)
+    with app.app_context():
+        db.create_all()
+        connection = db.session.connection()
+        connection.execute(text(
+            "INSERT INTO users (id, username, email, password_hash, is_active, plan_type, "
+            "settings_version, clients_version, projects_version, created_at, updated_at) "
+            "VALUES (:id, :username, :email, 'x', true, 'free', 0, 0, 0, :now, :now)"
+        ), [{'id': user_id, 'username': f'bench{user_id}', 'email': f'bench{user_id}@example.com',
+             'now': datetime.utcnow()} for user_id in range(1, users + other_users + 1)])
+
+        insert = Project.__table__.insert()
+        owners = [1 + i % users for i in range(users * rows_per_user)]
+        owners += [users + 1 + i % other_users for i in range(other_users * other_rows_per_user)]
+        next_id = 1
+        for start in range(0, len(owners), BATCH_SIZE):
+            rows = []
+            for user_id in owners[start:start + BATCH_SIZE]:
+                rows.append(Row(
+                    next_id, user_id, rng.choice(COMPANIES), text_of(rng, 3),
+                    text_of(rng, 12), text_of(rng, 4) if rng.random() < 0.3 else None
+                ))
+                next_id += 1
+            connection.execute(insert, [{
+                **row._asdict(), 'amount': 100000, 'deadline': date.today(), 'status': 'completed',
+                'created_at': datetime.utcnow(), 'updated_at': datetime.utcnow()
+            } for row in rows])
+            write_index(connection, 'projects', rows)
+        if connection.dialect.name == 'postgresql':
+            connection.execute(text("SELECT setval('projects_id_seq', :id)"), {'id': next_id})
+        db.session.commit()
+        if connection.dialect.name == 'postgresql':
+            with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as autocommit:
+                autocommit.execute(text('VACUUM ANALYZE'))
+
+
+def measure(app, user_ids, keyword, page):
+    """ユーザーごとの検索時間（中央値・最大）と総件数"""
+    from app.models.project import Project
+    from app.utils.search import search
+
+    with app.app_context():
+        search(Project, user_ids[0], keyword, page=page)  # ウォームアップ
+        timings, totals = [], []
+        for user_id in user_ids:
+            start = time.perf_counter()
+            _, total = search(Project, user_id, keyword, page=page)
+            timings.append((time.perf_counter() - start) * 1000)
+            totals.append(total)
+    return statistics.median(timings), max(timings), statistics.median(totals)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='全文検索のベンチマーク')
+    parser.add_argument('--database-url', default=None, help='PostgreSQL（既定: 一時ファイルのSQLite）')
+    parser.add_argument('--users', type=int, default=5, help='ユーザー数 (既定: 5)')
+    parser.add_argument('--rows-per-user', type=int, default=100_000, help='ユーザーあたりの案件数 (既定: 100000)')
+    parser.add_argument('--other-users', type=int, default=200, help='計測対象外の小規模ユーザー数 (既定: 200)')
+    parser.add_argument('--other-rows-per-user', type=int, default=500, help='小規模ユーザーあたりの案件数 (既定: 500)')
+    args = parser.parse_args()
+
+    database_url = (args.database_url or '').replace('postgres://', 'postgresql://', 1)
+    admin = None
+    if database_url.startswith('postgresql'):
+        from sqlalchemy import create_engine, text
+        admin = create_engine(database_url)
+        with admin.begin() as connection:
+            connection.execute(text(f'DROP SCHEMA IF EXISTS {SCHEMA} CASCADE'))
+            connection.execute(text(f'CREATE SCHEMA {SCHEMA}'))
+        separator = '&' if '?' in database_url else '?'
+        os.environ['DATABASE_URL'] = f'{database_url}{separator}options=-csearch_path%3D{SCHEMA}'
+    elif database_url:
+        parser.error('--database-url にはPostgreSQLを指定してください（省略時はSQLite）')
+    else:
+        os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='influberry-bench-'), 'bench.db')}"
+
+    # 環境変数を設定してから読み込む（Configはimport時にDATABASE_URLを読む）
+    from app import create_app, db
+
+    app = create_app('staging')
+    try:
+        start = time.perf_counter()
+        seed(app, args.users, args.rows_per_user, args.other_users, args.other_rows_per_user)
+        with app.app_context():
+            dialect = db.engine.dialect.name
+        print(f'案件 {args.users * args.rows_per_user:,}件（{args.users}ユーザー × {args.rows_per_user:,}件）'
+              f' + {args.other_users * args.other_rows_per_user:,}件（他 {args.other_users}ユーザー）'
+              f' / {dialect}（投入・索引 {time.perf_counter() - start:.1f}秒）')
+
+        user_ids = list(range(1, args.users + 1))
+        for label, keyword, page in SCENARIOS:
+            median, worst, total = measure(app, user_ids, keyword, page)
+            print(f'  {label:<24} q={keyword!r:<16} page={page:<3} '
+                  f'{median:8.2f} ms（最大 {worst:8.2f} ms）  総件数 {total:>9,.0f}')
+    finally:
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+        if admin is not None:
+            with admin.begin() as connection:
+                connection.execute(text(f'DROP SCHEMA IF EXISTS {SCHEMA} CASCADE'))
+            admin.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+InfluBerry v2 - gunicornワーカー方式 ベンチマーク
+目的: sync / gthread / gevent で、同時接続時のスループットと応答時間を比較する
+      gunicorn.conf.py を使って実際にサーバーを起動し、ログイン済みクライアントからGETを並列実行
+使い方: python scripts/benchmark_worker_modes.py [--modes sync gthread gevent] [--concurrency 32] [--seconds 10]
+        [--database-url postgresql://...]  # DB待ちの効果を見る場合はネットワーク越しのDBを指定
+        [--db-latency-ms 0.5]  # 同一ホストのDBでも、往復の遅延を入れてネットワーク越しの応答待ちを再現
+必要: gunicorn（gevent を比較する場合は gevent）
+"""
+
+import argparse
+import http.client
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+EMAIL = 'bench-workers@example.com'
+PASSWORD = 'benchmark-password'
+PATHS = ['/api/projects', '/api/projects/stats', '/api/auth/me']
+
+
+def seed(database_url, projects):
+    """ベンチマーク用ユーザー・案件作成（既存なら再利用）"""
+    os.environ['DATABASE_URL'] = database_url
+    from app import create_app, db
+    from app.models.project import Project
+    from app.models.user import User
+
+    app = create_app('staging')
+    with app.app_context():
+        db.create_all(bind_key=None)
+        user = User.query.filter_by(email=EMAIL).first()
+        if user is None:
+            user = User('bench_workers', EMAIL, PASSWORD)
+            db.session.add(user)
+            db.session.flush()
+            for i in range(projects):
+                db.session.add(Project(
+                    user.id, f'クライアント{i % 20}', 10000 + i, date.today() + timedelta(days=i % 60),
+                    f'ベンチマーク案件{i}', status=('proposed', 'contracted', 'completed')[i % 3]
+                ))
+            db.session.commit()
+
+
+def start_server(mode, port, database_url, workers):
+    env = dict(
+        os.environ, DATABASE_URL=database_url, FLASK_ENV='staging', PORT=str(port),
+        GUNICORN_WORKER_CLASS=mode, GUNICORN_LOG_LEVEL='warning', LOGIN_THROTTLE_ENABLED='false'
+    )
+    if workers:
+        env['GUNICORN_WORKERS'] = str(workers)
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', 'wsgi:app'], cwd=ROOT, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'{mode}: gunicorn起動失敗\n{process.stderr.read().decode()}')
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            conn.request('GET', '/health')
+            conn.getresponse().read()
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f'{mode}: gunicornが起動しません')
+
+
+def start_latency_proxy(database_url, latency_ms, port):
+    """
+    DBとの間に往復 latency_ms の遅延を入れるTCPプロキシ（バックグラウンドスレッド）
+
+    Returns:
+        str: プロキシ経由の接続URL
+    """
+    import asyncio
+    from sqlalchemy.engine import make_url
+
+    url = make_url(database_url)
+    delay = latency_ms / 2000  # 片道
+
+    async def pipe(reader, writer):
+        try:
+            while data := await reader.read(65536):
+                await asyncio.sleep(delay)
+                writer.write(data)
+                await writer.drain()
+        except OSError:
+            pass
+        finally:
+            writer.close()
+
+    async def handle(client_reader, client_writer):
+        server_reader, server_writer = await asyncio.open_connection(url.host or '127.0.0.1', url.port or 5432)
+        await asyncio.gather(pipe(client_reader, server_writer), pipe(server_reader, client_writer))
+
+    async def serve():
+        server = await asyncio.start_server(handle, '127.0.0.1', port)
+        async with server:
+            await server.serve_forever()
+
+    threading.Thread(target=asyncio.run, args=(serve(),), daemon=True).start()
+    return url.set(host='127.0.0.1', port=port).render_as_string(hide_password=False)
+
+
+def login(port):
+    """ログインしてセッションCookieを取得（Secure属性付きCookieのためヘッダーを直接扱う）"""
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    conn.request('POST', '/api/auth/login', body=json.dumps({'email': EMAIL, 'password': PASSWORD}),
+                 headers={'Content-Type': 'application/json'})
+    response = conn.getresponse()
+    response.read()
+    if response.status != 200:
+        raise RuntimeError(f'ログイン失敗: {response.status}')
+    cookies = [header.split(';', 1)[0] for name, header in response.getheaders() if name.lower() == 'set-cookie']
+    return '; '.join(cookies)
+
+
+def client(port, cookie, stop, samples, errors):
+    """keep-alive接続でGETを繰り返し、応答時間を記録"""
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    i = 0
+    while not stop.is_set():
+        path = PATHS[i % len(PATHS)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            conn.request('GET', path, headers={'Cookie': cookie})
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+                continue
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(type(e).__name__)
+            conn.close()
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+            continue
+        samples.append(time.perf_counter() - start)
+    conn.close()
+
+
+def percentile(values, pct):
+    """パーセンタイル（ms）"""
+    if not values:
+        return float('nan')
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] * 1000
+
+
+def run_mode(mode, port, args):
+    process = start_server(mode, port, args.server_database_url, args.workers)
+    try:
+        cookie = login(port)
+        stop = threading.Event()
+        samples, errors = [], []
+        threads = [
+            threading.Thread(target=client, args=(port, cookie, stop, samples, errors))
+            for _ in range(args.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(args.seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+    print(f"{mode:<8} {len(samples) / args.seconds:8.1f} req/s  "
+          f"p50 {percentile(samples, 50):7.1f} ms  p95 {percentile(samples, 95):7.1f} ms  "
+          f"p99 {percentile(samples, 99):7.1f} ms  "
+          f"mean {statistics.mean(samples) * 1000 if samples else float('nan'):7.1f} ms  "
+          f"errors {len(errors)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='gunicornワーカー方式ベンチマーク')
+    parser.add_argument('--modes', nargs='+', default=['sync', 'gthread', 'gevent'],
+                        choices=['sync', 'gthread', 'gevent'])
+    parser.add_argument('--concurrency', type=int, default=32, help='同時接続数 (既定: 32)')
+    parser.add_argument('--seconds', type=int, default=10, help='方式ごとの計測秒数 (既定: 10)')
+    parser.add_argument('--workers', type=int, help='ワーカー数を固定（既定: gunicorn.conf.py の自動算出）')
+    parser.add_argument('--projects', type=int, default=200, help='作成する案件数 (既定: 200)')
+    parser.add_argument('--port', type=int, default=5099)
+    parser.add_argument('--database-url', help='既定は一時SQLiteファイル')
+    parser.add_argument('--db-latency-ms', type=float, default=0,
+                        help='サーバーとPostgreSQLの間に入れる往復の遅延 (既定: 0・プロキシなし)')
+    args = parser.parse_args()
+    if args.db_latency_ms and not (args.database_url or '').startswith('postgresql'):
+        parser.error('--db-latency-ms には PostgreSQL の --database-url が必要です')
+
+    temp_dir = None
+    if not args.database_url:
+        temp_dir = tempfile.mkdtemp(prefix='influberry-workers-')
+        args.database_url = f"sqlite:///{os.path.join(temp_dir, 'bench.db')}"
+
+    try:
+        seed(args.database_url, args.projects)
+        args.server_database_url = args.database_url
+        if args.db_latency_ms:
+            args.server_database_url = start_latency_proxy(args.database_url, args.db_latency_ms, args.port + 1)
+        print(f"同時接続 {args.concurrency} / 計測 {args.seconds}秒 / ワーカー数 {args.workers or '自動'}"
+              f" / DB往復遅延 +{args.db_latency_ms:g} ms")
+        for mode in args.modes:
+            if mode == 'gevent':
+                try:
+                    import gevent  # noqa: F401
+                except ImportError:
+                    print('gevent   スキップ（gevent 未インストール）')
+                    continue
+            run_mode(mode, args.port, args)
+    finally:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+InfluBerry v2 - 同時新規登録の重複チェック
+目的: 同じメールアドレス・ユーザー名での登録が同時に行われても、
+      作成されるアカウントは1件のみで残りは409になることを確認
+使い方: python scripts/check_concurrent_registration.py [同時リクエスト数]
+"""
+
+import os
+import sys
+import tempfile
+import threading
+from collections import Counter
+
+# スレッド間で共有できるファイルDBを使用（テスト設定のインメモリDBは使わない）
+_db_dir = tempfile.mkdtemp(prefix='influberry-register-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_db_dir, 'register.db')}"
+os.environ.setdefault('PASSWORD_HASH_METHOD', 'pbkdf2:sha256:1000')
+os.environ.setdefault('PASSWORD_HASH_MAX_PENDING', '64')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app import create_app, db
+from app.models.user import User
+
+
+def register(app, payload, barrier, results):
+    """バリアで揃えてから登録リクエスト送信"""
+    client = app.test_client()
+    barrier.wait()
+    response = client.post('/api/auth/register', json=payload)
+    results.append((response.status_code, (response.get_json() or {}).get('error')))
+
+
+def run_case(app, label, payloads):
+    barrier = threading.Barrier(len(payloads))
+    results = []
+    threads = [
+        threading.Thread(target=register, args=(app, payload, barrier, results))
+        for payload in payloads
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    statuses = Counter(status for status, _ in results)
+    errors = Counter(error for _, error in results if error)
+    print(f"{label}: {dict(statuses)}")
+    for error, count in errors.items():
+        print(f"    {count} x {error}")
+    return statuses
+
+
+def check(concurrency):
+    app = create_app('staging')
+    ok = True
+    with app.app_context():
+        db.create_all()
+
+        print(f"=== 同時新規登録チェック ({concurrency}並列) ===")
+        statuses = run_case(app, 'same email + username', [
+            {'username': 'race', 'email': 'race@example.com', 'password': 'password123'}
+            for _ in range(concurrency)
+        ])
+        ok &= statuses.get(201) == 1 and statuses.get(409) == concurrency - 1
+
+        statuses = run_case(app, 'same email only', [
+            {'username': f'race{i}', 'email': 'race2@example.com', 'password': 'password123'}
+            for i in range(concurrency)
+        ])
+        ok &= statuses.get(201) == 1 and statuses.get(409) == concurrency - 1
+
+        statuses = run_case(app, 'same username only', [
+            {'username': 'race3', 'email': f'race3-{i}@example.com', 'password': 'password123'}
+            for i in range(concurrency)
+        ])
+        ok &= statuses.get(201) == 1 and statuses.get(409) == concurrency - 1
+
+        db.session.remove()
+        emails = [email for (email,) in db.session.query(User.email)]
+        duplicated = [email for email, count in Counter(emails).items() if count > 1]
+        print(f"users: {len(emails)} 件, 重複: {duplicated or 'なし'}")
+        ok &= len(emails) == 3 and not duplicated
+
+    print('OK' if ok else 'NG')
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(check(int(sys.argv[1]) if len(sys.argv) > 1 else 16))
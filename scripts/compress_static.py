@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+InfluBerry v2 - 静的ファイル事前圧縮スクリプト
+目的: ビルド時に app/static 配下の .br / .gz を生成し、リクエスト時の圧縮処理を不要にする
+使い方: python scripts/compress_static.py [静的ディレクトリ]
+"""
+
+import gzip
+import mimetypes
+import os
+import sys
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from app.utils.static_files import is_compressible, MIN_COMPRESS_SIZE
+
+DEFAULT_STATIC_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app', 'static'
+)
+
+
+def write_if_smaller(path, original_size, data):
+    """圧縮結果が元ファイルより小さい場合のみ書き出し"""
+    if len(data) >= original_size:
+        return False
+    with open(path, 'wb') as f:
+        f.write(data)
+    return True
+
+
+def compress_static(static_dir):
+    """静的ディレクトリ配下の圧縮対象ファイルを事前圧縮"""
+    if brotli is None:
+        print("WARNING: brotli未インストールのため .br は生成しません")
+
+    generated = 0
+    for root, _, files in os.walk(static_dir):
+        for name in files:
+            if name.endswith(('.br', '.gz')):
+                continue
+
+            path = os.path.join(root, name)
+            mimetype = mimetypes.guess_type(name)[0]
+            if not is_compressible(mimetype):
+                continue
+
+            with open(path, 'rb') as f:
+                data = f.read()
+            if len(data) < MIN_COMPRESS_SIZE:
+                continue
+
+            if write_if_smaller(path + '.gz', len(data), gzip.compress(data, compresslevel=9, mtime=0)):
+                generated += 1
+            if brotli is not None:
+                if write_if_smaller(path + '.br', len(data), brotli.compress(data, quality=11)):
+                    generated += 1
+
+    print(f"事前圧縮完了: {generated}ファイル生成")
+
+
+if __name__ == '__main__':
+    compress_static(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_STATIC_DIR)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+InfluBerry v2 - ローカル確認用SMTPサーバー（受信したメールを表示するだけで配送しない）
+目的: 締切リマインダー等のメール送信を外部SMTPなしで確認
+使い方: python scripts/smtp_sink.py [ポート番号（既定: 1025）]
+        MAIL_SERVER=localhost MAIL_PORT=1025 flask reminders send
+"""
+
+import socketserver
+import sys
+from email import message_from_bytes, policy
+from itertools import count
+
+_connection_ids = count(1)
+
+
+class SMTPSinkHandler(socketserver.StreamRequestHandler):
+    """SMTPの最小限のコマンドのみ応答"""
+
+    def reply(self, line):
+        self.wfile.write(f'{line}\r\n'.encode('ascii'))
+
+    def handle(self):
+        connection_id = next(_connection_ids)
+        received = 0
+        self.reply('220 localhost smtp-sink')
+        sender, recipients = None, []
+        for raw in self.rfile:
+            command = raw.decode('utf-8', 'replace').strip()
+            verb = command.split(' ', 1)[0].upper()
+            if verb == 'EHLO':
+                self.reply('250-localhost')
+                self.reply('250 8BITMIME')
+            elif verb == 'HELO':
+                self.reply('250 localhost')
+            elif verb == 'MAIL':
+                sender, recipients = command.split(':', 1)[1].strip(), []
+                self.reply('250 OK')
+            elif verb == 'RCPT':
+                recipients.append(command.split(':', 1)[1].strip())
+                self.reply('250 OK')
+            elif verb == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                lines = []
+                for data_line in self.rfile:
+                    if data_line in (b'.\r\n', b'.\n'):
+                        break
+                    lines.append(data_line[1:] if data_line.startswith(b'..') else data_line)
+                received += 1
+                self.show(connection_id, received, sender, recipients, b''.join(lines))
+                self.reply('250 OK')
+            elif verb in ('RSET', 'NOOP'):
+                self.reply('250 OK')
+            elif verb == 'QUIT':
+                self.reply('221 Bye')
+                break
+            else:
+                self.reply('502 Command not implemented')
+        print(f'--- 接続#{connection_id} 終了（{received}通）', flush=True)
+
+    @staticmethod
+    def show(connection_id, number, sender, recipients, data):
+        message = message_from_bytes(data, policy=policy.default)
+        body = message.get_body(preferencelist=('plain',))
+        print(f'=== 接続#{connection_id} メール{number}: {sender} -> {", ".join(recipients)}')
+        print(f"Subject: {message['subject']}")
+        print(body.get_content() if body else '', flush=True)
+
+
+class SMTPSinkServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+def main():
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 1025
+    with SMTPSinkServer(('127.0.0.1', port), SMTPSinkHandler) as server:
+        print(f'SMTP sink listening on 127.0.0.1:{port}', flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+InfluBerry データベース差分同期スクリプト
+対象: 環境移行時の切り替え（staging → production / SQLiteスナップショット → PostgreSQL）
+
+初回は migrate_to_postgresql.py で全件コピーし、以降はこのスクリプトで
+updated_at の高水位線より新しい行だけをバッチでUPSERTし、deleted_records（tombstone）から削除を反映する
+アーカイブテーブル（projects_archive / invoices_archive）は元の updated_at を保持するため、移動日時 archived_at を高水位線に使う
+
+使い方:
+    python sync_databases.py --source sqlite:///instance/influberry_dev.db --target postgresql://...
+    python sync_databases.py --source ... --target ... --tables users projects
+
+接続先は引数または環境変数 SYNC_SOURCE_DATABASE_URL / SYNC_TARGET_DATABASE_URL で指定
+全文検索の索引はORMを通さないため移行されない。完了後に移行先で `flask search reindex` を実行する
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import timedelta
+
+from sqlalchemy import (
+    BigInteger, Column, DateTime, MetaData, String, Table, and_, create_engine, delete, insert, inspect, or_, select,
+    text
+)
+
+from migrate_to_postgresql import dependency_levels, load_metadata, log_message
+
+SYNC_STATE_TABLE = "_sync_state"
+
+sync_metadata = MetaData()
+sync_state = Table(
+    SYNC_STATE_TABLE, sync_metadata,
+    Column("table_name", String(100), primary_key=True),
+    Column("high_water_updated_at", DateTime, nullable=True),
+    Column("high_water_id", BigInteger, nullable=False, default=0),
+    Column("last_tombstone_id", BigInteger, nullable=False, default=0),
+)
+
+
+def normalize_url(url):
+    if url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql://", 1)
+    return url
+
+
+def upsert_statement(conn, table):
+    """主キー衝突時は全列を更新するINSERT（PostgreSQL / SQLite）"""
+    if conn.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+
+    stmt = dialect_insert(table)
+    pk_names = [c.name for c in table.primary_key.columns]
+    return stmt.on_conflict_do_update(
+        index_elements=pk_names,
+        set_={c.name: stmt.excluded[c.name] for c in table.columns if c.name not in pk_names}
+    )
+
+
+def load_state(target_conn, table_name):
+    row = target_conn.execute(
+        select(sync_state).where(sync_state.c.table_name == table_name)
+    ).first()
+    if row is None:
+        return None, 0, 0
+    return row.high_water_updated_at, row.high_water_id, row.last_tombstone_id
+
+
+def save_state(target_conn, table_name, **values):
+    stmt = upsert_statement(target_conn, sync_state)
+    target_conn.execute(stmt, [dict({"table_name": table_name}, **values)])
+
+
+class DatabaseSync:
+    """2つのInfluBerryデータベース間の差分同期"""
+
+    def __init__(self, source_url, target_url, tables, batch_size=1000, overlap_seconds=5):
+        self.source = create_engine(normalize_url(source_url))
+        self.target = create_engine(normalize_url(target_url))
+        self.metadata = load_metadata()
+        self.tables = [self.metadata.tables[name] for name in tables]
+        self.levels = dependency_levels(self.tables)
+        self.batch_size = batch_size
+        self.overlap = timedelta(seconds=overlap_seconds)
+        self.tombstones = self.metadata.tables["deleted_records"]
+        self._partitioned = {}
+        self._target_tables = None
+
+    def prepare(self):
+        """移行先のテーブル・同期状態テーブル作成（既存なら何もしない）"""
+        self.metadata.create_all(self.target, tables=self.tables)
+        sync_metadata.create_all(self.target)
+
+    def run(self):
+        """削除反映 → 変更行UPSERT の順に実行（削除後に同じIDで再作成された行も正しく同期）"""
+        started = time.perf_counter()
+        deleted = self.apply_tombstones()
+        upserted = {}
+        for level in self.levels:
+            for table in level:
+                upserted[table.name] = self.sync_table(table)
+        self.reset_sequences()
+        elapsed = time.perf_counter() - started
+        log_message(
+            f"同期完了 ({elapsed:.2f}秒): UPSERT "
+            + ", ".join(f"{name} {count}件" for name, count in upserted.items())
+            + f" / 削除 {deleted}件"
+        )
+        return upserted, deleted
+
+    def sync_table(self, table):
+        """updated_at（アーカイブは archived_at）の高水位線以降の行をバッチでUPSERT"""
+        changed = table.c.archived_at if "archived_at" in table.c else table.c.updated_at
+        with self.target.connect() as target_conn:
+            high_water, high_water_id, _ = load_state(target_conn, table.name)
+
+        # コミットが遅れた行を取りこぼさないよう、前回位置から overlap 分さかのぼって再走査
+        cursor_ts = high_water - self.overlap if high_water else None
+        cursor_id = 0
+        total = 0
+        while True:
+            query = select(table).order_by(changed, table.c.id).limit(self.batch_size)
+            if cursor_ts is not None:
+                query = query.where(or_(
+                    changed > cursor_ts,
+                    and_(changed == cursor_ts, table.c.id > cursor_id)
+                ))
+            with self.source.connect() as source_conn:
+                rows = [dict(row._mapping) for row in source_conn.execute(query)]
+            if not rows:
+                break
+
+            cursor_ts, cursor_id = rows[-1][changed.name], rows[-1]["id"]
+            with self.target.begin() as target_conn:
+                if self.is_partitioned(target_conn, table):
+                    # 主キーに分割キーを含むためidでのUPSERTができない。
+                    # 分割キー（請求日）が変わった行が旧パーティションに残らないよう、削除してから挿入する
+                    target_conn.execute(delete(table).where(table.c.id.in_([row["id"] for row in rows])))
+                    target_conn.execute(insert(table), rows)
+                else:
+                    target_conn.execute(upsert_statement(target_conn, table), rows)
+                if high_water is None or (cursor_ts, cursor_id) > (high_water, high_water_id):
+                    high_water, high_water_id = cursor_ts, cursor_id
+                save_state(
+                    target_conn, table.name,
+                    high_water_updated_at=high_water, high_water_id=high_water_id
+                )
+            total += len(rows)
+            log_message(f"{table.name}: {total}件 UPSERT (〜 {cursor_ts})")
+
+        return total
+
+    def is_partitioned(self, conn, table):
+        """移行先でパーティションテーブルになっているか（PostgreSQLの invoices）"""
+        if table.name not in self._partitioned:
+            from app.utils.partitioning import is_partitioned
+            self._partitioned[table.name] = is_partitioned(conn, table.name)
+        return self._partitioned[table.name]
+
+    def apply_tombstones(self):
+        """deleted_records から未反映の削除を移行先へ適用"""
+        if not inspect(self.source).has_table(self.tombstones.name):
+            log_message("同期元に deleted_records がないため削除の反映をスキップ")
+            return 0
+
+        names = [table.name for table in self.tables]
+        with self.target.connect() as target_conn:
+            _, _, last_id = load_state(target_conn, self.tombstones.name)
+
+        total = 0
+        while True:
+            with self.source.connect() as source_conn:
+                rows = source_conn.execute(
+                    select(self.tombstones.c.id, self.tombstones.c.table_name, self.tombstones.c.record_id)
+                    .where(self.tombstones.c.id > last_id, self.tombstones.c.table_name.in_(names))
+                    .order_by(self.tombstones.c.id)
+                    .limit(self.batch_size)
+                ).all()
+            if not rows:
+                break
+
+            by_table = {}
+            for row in rows:
+                by_table.setdefault(row.table_name, set()).add(row.record_id)
+
+            with self.target.begin() as target_conn:
+                # 子テーブルから順に削除（FK違反を避ける）
+                for level in reversed(self.levels):
+                    for table in level:
+                        if table.name in by_table:
+                            total += self._delete_with_children(target_conn, table, by_table[table.name])
+                last_id = rows[-1].id
+                save_state(target_conn, self.tombstones.name, last_tombstone_id=last_id)
+
+        if total:
+            log_message(f"削除反映: {total}件")
+        return total
+
+    def _delete_with_children(self, conn, table, ids):
+        """参照している子行も削除（移行先でON DELETE CASCADEが効かない場合に備える）"""
+        ids = list(ids)
+        if self._target_tables is None:
+            self._target_tables = set(inspect(conn).get_table_names())
+        for child in self.metadata.sorted_tables:
+            if child.name not in self._target_tables:  # 移行先に無い子テーブル（未同期の機能テーブル）
+                continue
+            for fk in child.foreign_keys:
+                if fk.column.table is table and child is not table:
+                    child_ids = [
+                        row[0] for row in conn.execute(
+                            select(child.c.id).where(fk.parent.in_(ids))
+                        )
+                    ] if "id" in child.c else []
+                    if child_ids:
+                        self._delete_with_children(conn, child, child_ids)
+        result = conn.execute(delete(table).where(table.c.id.in_(ids)))
+        return result.rowcount or 0
+
+    def reset_sequences(self):
+        """PostgreSQLの主キーシーケンスを最大値へ合わせる"""
+        if self.target.dialect.name != "postgresql":
+            return
+        with self.target.begin() as conn:
+            for table in self.tables:
+                conn.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('\"{table.name}\"', 'id'), "
+                    f'COALESCE(MAX(id), 1), MAX(id) IS NOT NULL) FROM "{table.name}"'
+                ))
+
+
+def parse_args(argv=None):
+    from app.models.deleted_record import TRACKED_TABLES
+
+    parser = argparse.ArgumentParser(description="InfluBerry データベース差分同期")
+    parser.add_argument("--source", default=os.environ.get("SYNC_SOURCE_DATABASE_URL"),
+                        help="同期元URL。環境変数 SYNC_SOURCE_DATABASE_URL でも指定可")
+    parser.add_argument("--target", default=os.environ.get("SYNC_TARGET_DATABASE_URL"),
+                        help="同期先URL。環境変数 SYNC_TARGET_DATABASE_URL でも指定可")
+    parser.add_argument("--tables", nargs="+", default=list(TRACKED_TABLES), choices=list(TRACKED_TABLES),
+                        help="同期対象テーブル (既定: users projects invoices projects_archive invoices_archive)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="1回にUPSERTする行数 (既定: 1000)")
+    parser.add_argument("--overlap-seconds", type=int, default=5,
+                        help="前回の高水位線からさかのぼって再走査する秒数 (既定: 5)")
+    args = parser.parse_args(argv)
+    if not args.source or not args.target:
+        parser.error("--source / --target（または環境変数）で同期元・同期先を指定してください")
+    return args
+
+
+def main(argv=None):
+    """メイン処理"""
+    args = parse_args(argv)
+    log_message("=== InfluBerry 差分同期開始 ===")
+    try:
+        sync = DatabaseSync(args.source, args.target, args.tables, args.batch_size, args.overlap_seconds)
+        sync.prepare()
+        sync.run()
+        return 0
+    except Exception as e:
+        log_message(f"同期失敗: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,16 +3,25 @@ WSGI Entry Point for InfluBerry v2
 Production and Development server entry point
 """
 
+import time
+_started_at = time.perf_counter()
+
 import os
+import sys
 from dotenv import load_dotenv
 from app import create_app
+from app.utils.startup_profiler import StartupProfiler
+
+# 起動プロファイル: パッケージimport時間を計測開始時点から記録
+profiler = StartupProfiler(started_at=_started_at)
+profiler.record('import_app', time.perf_counter() - _started_at, len(sys.modules))
 
 # Load environment variables
 load_dotenv()
 
 # Create Flask application
 config_name = os.environ.get('FLASK_ENV', 'development')
-app = create_app(config_name)
+app = create_app(config_name, profiler=profiler)
 
 if __name__ == '__main__':
     # Development server configuration